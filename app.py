@@ -4,18 +4,16 @@ Ana Streamlit Uygulaması
 """
 import streamlit as st
 import pandas as pd
-from modules.data_loader import DataLoader
-from modules.analytics_engine import AnalyticsEngine
-from modules.allocation_optimizer import AllocationOptimizer
-from modules.alert_manager import AlertManager
+from modules.analysis_pipeline import AnalysisPipeline
 from modules.visualizations import Visualizations
 from shipment_strategy_page import show_shipment_strategy_page
 from settings_page import show_settings_page
-from utils.helpers import (
-    format_number, format_currency, format_percentage,
-    show_success, show_error, show_info
+from utils.helpers import format_number, format_currency, format_percentage
+from utils.profiling import MemoryBudgetExceeded, frame_inventory
+from utils.ui import show_success, show_error, show_info, show_messages
+from utils.constants import (
+    KPI_TARGETS, SEGMENT_COLORS, SEGMENT_EMOJI, CSV_CHUNK_SIZE, MEMORY_BUDGET_MB
 )
-from utils.constants import KPI_TARGETS, SEGMENT_COLORS, SEGMENT_EMOJI
 
 # Sayfa konfigürasyonu
 st.set_page_config(
@@ -58,44 +56,54 @@ if 'df' not in st.session_state:
 if 'analyzed' not in st.session_state:
     st.session_state.analyzed = False
 
-def load_and_analyze_data():
-    """Veri yükle ve analiz et"""
+def load_and_analyze_data(uploaded_file=None):
+    """
+    Veri yükle ve analiz et
+    
+    Args:
+        uploaded_file: Sidebar'dan yüklenen katalog (None = örnek veri)
+    """
     
     with st.spinner('🔄 Veri yükleniyor ve analiz ediliyor...'):
-        # Data loader
-        loader = DataLoader()
-        df = loader.load_sample_data()
+        # Pipeline session boyunca saklanır: girdileri değişmeyen aşamalar tekrar çalışmaz
+        if 'pipeline' not in st.session_state:
+            st.session_state.pipeline = AnalysisPipeline()
+        pipeline = st.session_state.pipeline
         
-        if df is not None:
-            # Custom parametreleri al (varsa)
-            segment_params = st.session_state.get('custom_segment_params', None)
-            transfer_lead_time = st.session_state.get('custom_transfer_lead_time', 5)
-            
-            # Analytics engine (seasonal forecasting ile)
-            historical_path = 'data/historical_sales.csv'  # Opsiyonel
-            analytics = AnalyticsEngine(df, segment_params=segment_params, historical_data_path=historical_path)
-            df = analytics.calculate_all_metrics()
-            df = analytics.segment_products()
-            
-            # Allocation optimizer
-            optimizer = AllocationOptimizer(df, segment_params=segment_params, transfer_lead_time=transfer_lead_time)
-            allocation_df = optimizer.generate_allocation_strategy()
-            
-            # Alert manager
-            alert_mgr = AlertManager(df, allocation_df)
-            alerts_df = alert_mgr.generate_all_alerts()
-            
+        # Custom parametreleri al (varsa)
+        try:
+            result = pipeline.run(
+                uploaded_file,
+                segment_params=st.session_state.get('custom_segment_params', None),
+                metric_weights=st.session_state.get('custom_metric_weights', None),
+                transfer_lead_time=st.session_state.get('custom_transfer_lead_time', 5),
+                chunksize=CSV_CHUNK_SIZE,
+                capture_profile=st.session_state.get('capture_profile', False),
+                track_memory=st.session_state.get('track_memory', False),
+                memory_budget_mb=st.session_state.get('memory_budget_mb', MEMORY_BUDGET_MB)
+            )
+        except MemoryBudgetExceeded as e:
+            show_messages(pipeline.messages)
+            show_error(str(e))
+            return False
+        show_messages(pipeline.messages)
+        
+        if result is not None:
             # Session state'e kaydet
-            st.session_state.df = df
-            st.session_state.allocation_df = allocation_df
-            st.session_state.alerts_df = alerts_df
-            st.session_state.analytics = analytics
-            st.session_state.optimizer = optimizer
-            st.session_state.alert_mgr = alert_mgr
+            st.session_state.df = result['df']
+            st.session_state.allocation_df = result['allocation_df']
+            st.session_state.alerts_df = result['alerts_df']
+            st.session_state.analytics = result['analytics']
+            st.session_state.optimizer = result['optimizer']
+            st.session_state.alert_mgr = result['alert_mgr']
+            st.session_state.memory_report = result['loader'].memory_report
             st.session_state.data_loaded = True
             st.session_state.analyzed = True
             
-            show_success("Analiz tamamlandı!")
+            if pipeline.executed:
+                show_success("Analiz tamamlandı!")
+            else:
+                show_success("Analiz tamamlandı! (değişiklik yok, cache)")
             return True
         else:
             show_error("Veri yüklenemedi!")
@@ -112,9 +120,36 @@ def main():
         st.image("https://img.icons8.com/fluency/96/000000/rocket.png", width=80)
         st.title("📊 Menü")
         
+        # Katalog dosyası (boş bırakılırsa örnek veri kullanılır)
+        uploaded_file = st.file_uploader(
+            "Katalog dosyası",
+            type=['csv', 'parquet', 'pq', 'feather', 'arrow'],
+            help="Boş bırakılırsa örnek veri kullanılır"
+        )
+        
         # Veri yükleme butonu
         if st.button("🔄 Veriyi Yükle ve Analiz Et", use_container_width=True):
-            load_and_analyze_data()
+            load_and_analyze_data(uploaded_file)
+        
+        with st.expander("🩺 Tanılama seçenekleri"):
+            st.checkbox(
+                "🔬 cProfile ile profille",
+                key='capture_profile',
+                help="Çalışan aşamalar cProfile ile profillenir (analiz yavaşlar)"
+            )
+            st.checkbox(
+                "💾 Bellek takibi",
+                key='track_memory',
+                help="Aşamaların tepe / kalıcı belleği tracemalloc ile ölçülür (analiz yavaşlar)"
+            )
+            st.number_input(
+                "Bellek bütçesi (MB, 0 = sınırsız)",
+                min_value=0,
+                value=MEMORY_BUDGET_MB,
+                step=256,
+                key='memory_budget_mb',
+                help="Aşılacaksa analiz erken durdurulur (bellek takibini açar)"
+            )
         
         st.divider()
         
@@ -137,9 +172,18 @@ def main():
         if st.session_state.data_loaded:
             st.success("✅ Veri yüklü")
             st.caption(f"📦 {len(st.session_state.df)} ürün")
+            memory_report = st.session_state.get('memory_report')
+            if memory_report:
+                st.caption(
+                    f"💾 {memory_report['bytes_after'] / 1024 ** 2:.1f} MB "
+                    f"(%{memory_report['saved_pct']:.0f} tasarruf)"
+                )
         else:
             st.warning("⚠️ Veri yüklenmedi")
             st.caption("Yukarıdaki butona tıklayın")
+        
+        if 'pipeline' in st.session_state:
+            show_pipeline_diagnostics(st.session_state.pipeline)
     
     # Ana içerik
     if page == "🏠 Ana Sayfa":
@@ -345,9 +389,12 @@ def show_dashboard_page():
         )
         
         st.plotly_chart(
-            viz.category_performance_bar(df),
+            viz.category_performance_bar(analytics.get_category_performance()),
             use_container_width=True
         )
+        
+        st.markdown("### 🗂️ Hiyerarşi Kırılımı")
+        show_hierarchy_drilldown(analytics.get_rollup_cube())
     
     with tab2:
         segment_summary = analytics.get_segment_summary()
@@ -411,6 +458,85 @@ def show_dashboard_page():
                 format_number(df['stock_oms_total'].sum())
             )
 
+def show_pipeline_diagnostics(pipeline):
+    """Son analiz çalıştırmasının aşama süreleri, bellek kullanımı ve cProfile çıktısı"""
+    
+    with st.expander("🩺 Tanılama", expanded=False):
+        profiler = pipeline.profiler
+        if not profiler.records:
+            st.caption("Son çalıştırmada tüm aşamalar cache'ten geldi")
+        else:
+            summary = profiler.summary()
+            formats = {
+                'seconds': '{:.3f}',
+                'rows': '{:,.0f}',
+                'rows_per_sec': '{:,.0f}',
+                'share_pct': '{:.1f}',
+                'peak_mb': '{:.1f}',
+                'retained_mb': '{:.1f}'
+            }
+            st.dataframe(
+                summary.style.format(
+                    {col: fmt for col, fmt in formats.items() if col in summary.columns},
+                    na_rep='-'
+                ),
+                use_container_width=True,
+                hide_index=True
+            )
+            st.caption(f"⏱️ Toplam: {summary['seconds'].sum():.2f} sn")
+            
+            pstats_data = profiler.pstats_bytes()
+            if pstats_data is not None:
+                st.download_button(
+                    "📥 cProfile (.pstats)",
+                    pstats_data,
+                    "analiz_profili.pstats",
+                    "application/octet-stream",
+                    key='download-pstats'
+                )
+            else:
+                st.caption("cProfile için 'cProfile ile profille' seçeneğini açıp analizi tekrar çalıştırın")
+        
+        # Session'da tutulan DataFrame'ler (bellek takibi açıkken)
+        if st.session_state.get('track_memory'):
+            inventory = frame_inventory(st.session_state)
+            st.markdown("**💾 Session DataFrame'leri**")
+            st.dataframe(
+                inventory.style.format({'mb': '{:.1f}'}),
+                use_container_width=True,
+                hide_index=True
+            )
+            st.caption(f"Toplam: {inventory['mb'].sum():.1f} MB")
+
+def show_hierarchy_drilldown(cube):
+    """Kategori > ana grup > alt grup > segment kırılımı (rollup cube'dan)"""
+    
+    labels = {
+        'category': 'Kategori',
+        'maingroupcode': 'Ana Grup',
+        'SubGroupcode': 'Alt Grup',
+        'segment': 'Segment'
+    }
+    
+    # Seçimler hiyerarşi sırasıyla; "Tümü" seçilen seviyede durulur
+    path = {}
+    columns = st.columns(max(len(cube.dimensions) - 1, 1))
+    for col, dim in zip(columns, cube.dimensions[:-1]):
+        options = cube.query(by=[dim], filters=path)[dim].dropna().tolist()
+        with col:
+            selected = st.selectbox(
+                labels.get(dim, dim), ['Tümü'] + options, key=f'drilldown_{dim}'
+            )
+        if selected == 'Tümü':
+            break
+        path[dim] = selected
+    
+    st.dataframe(
+        cube.drill_down(path).rename(columns=labels),
+        use_container_width=True,
+        hide_index=True
+    )
+
 def show_product_analysis_page():
     """Ürün analizi sayfası (placeholder)"""
     st.markdown("## 🔍 Ürün Analizi")
@@ -0,0 +1,125 @@
+"""
+calculate_all_metrics benchmark: eski pandas (Series + safe_divide) akışı
+ile tek geçişli NumPy kernel'ini karşılaştırır
+
+Kullanım:
+    python -m benchmarks.bench_metrics_kernel [--rows 1000000] [--repeat 3]
+
+Her yöntem için en iyi süre ve tracemalloc ile ölçülen bellek raporlanır:
+kalıcı (eklenen metrik kolonları) ve geçici (hesaplama sırasında aynı anda
+yaşayan ara diziler, n-boyutlu float64 dizi cinsinden).
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from modules.metrics_kernel import compute_metrics, METRIC_NAMES
+from utils.constants import METRIC_WEIGHTS, METRIC_COLUMNS
+from utils.helpers import safe_divide
+
+
+def make_catalog(rows, seed=42):
+    """Kernel girdi kolonlarıyla sentetik katalog (preprocess sonrası dtype'lar)"""
+    rng = np.random.default_rng(seed)
+    sales_30d = rng.gamma(1.5, 4.0, rows).round(2)
+    sales_30d[rng.random(rows) < 0.05] = 0
+
+    return pd.DataFrame({
+        'daily_sales_avg_30d': sales_30d,
+        'daily_sales_avg_7d': (sales_30d * rng.uniform(0.3, 2.0, rows)).round(2),
+        'daily_sales_yesterday': (sales_30d * rng.uniform(0.0, 2.5, rows)).round(0),
+        'add_to_cart_7d': rng.integers(0, 200, rows).astype('int32'),
+        'view_count_7d': rng.integers(0, 5000, rows).astype('int32'),
+        'total_stock': rng.integers(0, 3000, rows).astype('int32'),
+        'avg_rating': rng.uniform(1, 5, rows).round(1).astype('float32'),
+        'review_count': rng.integers(0, 500, rows).astype('int32'),
+        'stock_out_days_last_30d': rng.integers(0, 30, rows).astype('int32'),
+        'campaign_flag': (rng.random(rows) < 0.2).astype('int32')
+    })
+
+
+def legacy_metrics(df):
+    """Kernel öncesi calculate_all_metrics (Series tabanlı) akışı"""
+    df['velocity_score'] = safe_divide(df['daily_sales_avg_7d'], df['daily_sales_avg_30d'], default=1.0)
+    df['trend_score'] = safe_divide(df['daily_sales_yesterday'], df['daily_sales_avg_7d'], default=1.0)
+    df['engagement_score'] = safe_divide(df['add_to_cart_7d'], df['view_count_7d'], default=0) * 100
+    df['conversion_rate'] = safe_divide(df['daily_sales_avg_7d'] * 7, df['add_to_cart_7d'], default=0) * 100
+    df['days_of_stock'] = safe_divide(df['total_stock'], df['daily_sales_avg_7d'], default=999)
+    df['quality_score'] = (df['avg_rating'] * 20 + np.minimum(df['review_count'] / 10, 10)) / 2
+    df['stockout_penalty'] = (100 - (df['stock_out_days_last_30d'] * 3)).clip(lower=0)
+    df['campaign_boost'] = df['campaign_flag'] * 1.3 + (1 - df['campaign_flag']) * 1.0
+    df['seasonal_factor'] = 1.0
+    df['final_score'] = (
+        df['velocity_score'] * METRIC_WEIGHTS['velocity_score'] +
+        df['trend_score'] * METRIC_WEIGHTS['trend_score'] +
+        df['engagement_score'] * METRIC_WEIGHTS['engagement_score'] +
+        df['conversion_rate'] * METRIC_WEIGHTS['conversion_rate'] +
+        df['quality_score'] * METRIC_WEIGHTS['quality_score'] +
+        df['stockout_penalty'] * METRIC_WEIGHTS['stockout_penalty']
+    ) * df['campaign_boost'] * df['seasonal_factor']
+    df[METRIC_COLUMNS] = df[METRIC_COLUMNS].astype('float32')
+    return df
+
+
+def kernel_metrics(df):
+    """Kernel ile hesaplayıp kolonları DataFrame'e ekle (AnalyticsEngine gibi)"""
+    return pd.concat([df, compute_metrics(df)], axis=1)
+
+
+def measure(func, catalog, repeat):
+    """
+    Returns:
+        tuple: (en iyi süre sn, kalıcı byte, geçici tepe byte, sonuç df)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        df = catalog.copy()
+        start = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - start)
+
+    df = catalog.copy()
+    tracemalloc.start()
+    result = func(df)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, retained, peak - retained, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    catalog = make_catalog(args.rows)
+    array_bytes = args.rows * 8
+
+    results = {}
+    for label, func in (('pandas', legacy_metrics), ('kernel', kernel_metrics)):
+        results[label] = measure(func, catalog, args.repeat)
+
+    # Sonuçlar birebir aynı olmalı
+    pd.testing.assert_frame_equal(
+        results['pandas'][3][METRIC_NAMES], results['kernel'][3][METRIC_NAMES],
+        check_exact=True
+    )
+
+    print(f"📊 calculate_all_metrics - {args.rows:,} ürün")
+    for label, (seconds, retained, transient, _) in results.items():
+        print(
+            f"  {label:<7} {seconds * 1000:8.1f} ms | kalıcı {retained / 1024 ** 2:6.1f} MB | "
+            f"geçici {transient / 1024 ** 2:6.1f} MB (~{transient / array_bytes:4.1f} n-boyutlu dizi)"
+        )
+
+    (legacy_s, _, legacy_tmp, _), (kernel_s, _, kernel_tmp, _) = results.values()
+    print(
+        f"✅ Hızlanma: {legacy_s / kernel_s:.1f}x | "
+        f"geçici bellek: %{100 * (1 - kernel_tmp / legacy_tmp):.0f} daha az"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+"""
+Ölçekleme benchmark'ı: public işlemlerin farklı katalog boyutlarındaki
+süreleri (10k -> 5M SKU)
+
+Kullanım:
+    python -m benchmarks.bench_scaling [--sizes 10000,100000,1000000] [--repeat 3]
+    python -m benchmarks.bench_scaling --sizes 10000,100000 --output sonuc.json
+    python -m benchmarks.bench_scaling --baseline benchmarks/baselines/scaling.json
+    python -m benchmarks.bench_scaling --save-baseline
+
+Her boyut için sentetik ham katalog (sample_data.csv şeması) ve haftalık
+historik satış üretilir (modules/data_generator.py); işlemler sırayla (validate -> preprocess ->
+seasonal -> metrics -> segment -> category -> allocation -> alerts)
+çalıştırılır ve her biri için en iyi süre ile satır/sn JSON'a yazılır.
+Girdi hazırlığı (kopyalar, nesne oluşturma) süreye dahil değildir.
+
+Baseline verilirse her (boyut, işlem) için süre oranı raporlanır;
+tolerans üzerindeki yavaşlamalar regresyon sayılır ve çıkış kodu 1 olur.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from modules.data_loader import DataLoader
+from modules.analytics_engine import AnalyticsEngine
+from modules.seasonal_forecaster import SeasonalForecaster
+from modules.allocation_optimizer import AllocationOptimizer
+from modules.alert_manager import AlertManager
+from modules.data_generator import FORECASTER_COLUMN_NAMES, generate_catalog, generate_history
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+DEFAULT_BASELINE_PATH = os.path.join('benchmarks', 'baselines', 'scaling.json')
+
+# Historik veri en fazla bu kadar SKU için üretilir (satır = SKU x 104 hafta)
+HISTORY_SKU_LIMIT = 50_000
+
+# Bu süreden kısa işlemlerde oran gürültülüdür; regresyon sayılmaz (saniye)
+MIN_COMPARABLE_SECONDS = 0.005
+
+
+def measure(setup, run, repeat):
+    """
+    setup() ile hazırlanan girdi üzerinde run() süresini ölç
+
+    Modüllerin print çıktıları ölçüm sırasında bastırılır.
+
+    Returns:
+        tuple: (en iyi süre sn, son çalıştırmanın (girdi, sonuç) çifti)
+    """
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            subject = setup()
+            start = time.perf_counter()
+            result = run(subject)
+            best = min(best, time.perf_counter() - start)
+
+    return best, (subject, result)
+
+
+def _loader(raw):
+    loader = DataLoader(cache_dir=None)
+    loader.df = raw.copy()
+    return loader
+
+
+def _history_forecaster(history):
+    forecaster = SeasonalForecaster(cache_dir=None)
+    forecaster.historical_df = history
+    return forecaster
+
+
+def _engine(df, forecaster=None):
+    analytics = AnalyticsEngine(df)
+    analytics.seasonal_forecaster = forecaster
+    return analytics
+
+
+def bench_size(rows, repeat, seed):
+    """
+    Tek katalog boyutunda tüm işlemleri ölç
+
+    Returns:
+        dict: İşlem -> {seconds, rows, rows_per_sec}
+    """
+    raw = generate_catalog(rows, seed)
+    history = generate_history(raw.iloc[:HISTORY_SKU_LIMIT], seed=seed).rename(
+        columns=FORECASTER_COLUMN_NAMES
+    )
+    results = {}
+
+    def record(name, seconds, count):
+        results[name] = {
+            'seconds': seconds,
+            'rows': count,
+            'rows_per_sec': count / seconds if seconds > 0 else None
+        }
+        print(f"   {name:<28} {seconds * 1000:10.1f} ms {count:>12,} satır")
+
+    seconds, (loader, valid) = measure(
+        lambda: _loader(raw), lambda loader: loader.validate_data(), repeat
+    )
+    if not valid:
+        raise RuntimeError(f"Sentetik katalog validasyondan geçmedi: {loader.validation_errors}")
+    record('validate_data', seconds, rows)
+    # Büyük boyutlarda bellek için ara tablolar kullanıldıktan sonra bırakılır
+    validated = loader.df
+    del raw, loader
+
+    seconds, (_, df) = measure(
+        lambda: _loader(validated), lambda loader: loader.preprocess_data(), repeat
+    )
+    record('preprocess_data', seconds, rows)
+    del validated
+
+    seconds, (forecaster, _) = measure(
+        lambda: _history_forecaster(history),
+        lambda forecaster: forecaster.calculate_all_seasonal_indices(), repeat
+    )
+    record('seasonal_index', seconds, len(history))
+    del history
+
+    # Metrikler seasonal lookup dahil (pipeline'daki gibi)
+    seconds, (_, metrics_df) = measure(
+        lambda: _engine(df, forecaster), lambda analytics: analytics.calculate_all_metrics(), repeat
+    )
+    record('calculate_all_metrics', seconds, rows)
+
+    seconds, (analytics, _) = measure(
+        lambda: _engine(metrics_df), lambda analytics: analytics.segment_products(), repeat
+    )
+    record('segment_products', seconds, rows)
+    segmented = analytics.df
+    del df, metrics_df, analytics
+
+    seconds, _ = measure(
+        lambda: _engine(segmented), lambda analytics: analytics.get_category_performance(), repeat
+    )
+    record('get_category_performance', seconds, rows)
+
+    seconds, (optimizer, _) = measure(
+        lambda: AllocationOptimizer(segmented),
+        lambda optimizer: optimizer.generate_allocation_strategy(), repeat
+    )
+    record('generate_allocation_strategy', seconds, rows)
+
+    seconds, _ = measure(
+        lambda: AlertManager(segmented, optimizer.allocation_plan),
+        lambda alert_mgr: alert_mgr.generate_all_alerts(), repeat
+    )
+    record('generate_all_alerts', seconds, rows)
+
+    return results
+
+
+def compare_with_baseline(current, baseline, tolerance):
+    """
+    Sonuçları baseline ile karşılaştır
+
+    Args:
+        current / baseline: {boyut: {işlem: {seconds, ...}}}
+        tolerance: İzin verilen yavaşlama oranı (0.25 = %25)
+
+    Returns:
+        list: Regresyon satırları (boyut, işlem, baseline sn, mevcut sn, oran)
+    """
+    regressions = []
+
+    print(f"\n📈 Baseline karşılaştırması (tolerans %{tolerance * 100:.0f}):")
+    for size, operations in current.items():
+        if size not in baseline:
+            print(f"   {int(size):>10,} satır: baseline'da yok")
+            continue
+        for name, result in operations.items():
+            reference = baseline[size].get(name)
+            if reference is None:
+                continue
+            ratio = result['seconds'] / reference['seconds'] if reference['seconds'] > 0 else 1.0
+            regressed = (
+                ratio > 1 + tolerance and
+                max(result['seconds'], reference['seconds']) >= MIN_COMPARABLE_SECONDS
+            )
+            mark = '❌' if regressed else ('✅' if ratio < 1 - tolerance else '  ')
+            print(
+                f"   {mark} {int(size):>10,} {name:<28} "
+                f"{reference['seconds'] * 1000:10.1f} ms -> {result['seconds'] * 1000:10.1f} ms "
+                f"({ratio:5.2f}x)"
+            )
+            if regressed:
+                regressions.append((size, name, reference['seconds'], result['seconds'], ratio))
+
+    return regressions
+
+
+def environment_info():
+    """Sonuçların hangi ortamda alındığı"""
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def parse_sizes(value):
+    """'10000,100k,1m' -> [10000, 100000, 1000000]"""
+    sizes = []
+    for part in value.split(','):
+        part = part.strip().lower().replace('_', '')
+        multiplier = {'k': 1_000, 'm': 1_000_000}.get(part[-1:], 1)
+        sizes.append(int(float(part.rstrip('km')) * multiplier))
+    return sizes
+
+
+def write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--sizes', type=parse_sizes, default=DEFAULT_SIZES,
+        help="Katalog boyutları (virgülle; 10k / 5m kısaltmaları geçerli)"
+    )
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help="Sonuç JSON dosyası")
+    parser.add_argument('--baseline', default=None, help="Karşılaştırılacak baseline JSON")
+    parser.add_argument(
+        '--save-baseline', nargs='?', const=DEFAULT_BASELINE_PATH, default=None, metavar='PATH',
+        help=f"Sonuçları baseline olarak kaydet (varsayılan: {DEFAULT_BASELINE_PATH})"
+    )
+    parser.add_argument(
+        '--tolerance', type=float, default=0.25,
+        help="Regresyon sayılmayan en fazla yavaşlama oranı (varsayılan: 0.25)"
+    )
+    args = parser.parse_args(argv)
+
+    results = {}
+    for rows in args.sizes:
+        print(f"📊 {rows:,} ürün")
+        results[str(rows)] = bench_size(rows, args.repeat, args.seed)
+
+    report = {
+        'environment': environment_info(),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'results': results
+    }
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            write_json(path, report)
+            print(f"💾 {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline['results'], args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} işlemde regresyon")
+            return 1
+        print("✅ Regresyon yok")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+🧪 Sentetik Veri Üretici
+Yük testi için sample_data.csv şemasında katalog ve historical_sales.csv
+düzeninde haftalık satış geçmişi üretir (bkz. modules/data_generator.py)
+
+Veri parça parça üretilip dosyaya akıtılır; bellek kullanımı parça
+boyutuyla sınırlıdır. Aynı seed ve parça boyutu aynı veriyi üretir.
+
+Kullanım:
+    python generate_data.py --rows 1000000 --catalog yuk/katalog.parquet --history yuk/gecmis.parquet
+    python generate_data.py --rows 200000 --history yuk/gecmis.csv --years 2022,2023,2024
+"""
+import argparse
+import os
+import sys
+import time
+from modules.data_generator import (
+    DEFAULT_HISTORY_YEARS, GENERATOR_CHUNK_ROWS, WEEKS_PER_YEAR, write_dataset
+)
+
+
+def parse_args(argv=None):
+    """Komut satırı argümanları"""
+    parser = argparse.ArgumentParser(
+        description="Sentetik katalog ve haftalık satış geçmişi (CSV / Parquet / Arrow)"
+    )
+    parser.add_argument('--rows', type=int, required=True, help="Ürün (SKU) sayısı")
+    parser.add_argument(
+        '--catalog', default=None,
+        help="Katalog çıktısı (.csv, .parquet, .feather, .arrow)"
+    )
+    parser.add_argument(
+        '--history', default=None,
+        help="Geçmiş çıktısı (.csv, .parquet, .feather, .arrow)"
+    )
+    parser.add_argument(
+        '--years', default=','.join(map(str, DEFAULT_HISTORY_YEARS)),
+        help="Geçmiş yılları (virgülle, varsayılan: %(default)s)"
+    )
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument(
+        '--chunk-rows', type=int, default=GENERATOR_CHUNK_ROWS,
+        help=f"Katalog parçası başına ürün (varsayılan: {GENERATOR_CHUNK_ROWS})"
+    )
+    parser.add_argument(
+        '--history-chunk-rows', type=int, default=GENERATOR_CHUNK_ROWS,
+        help=f"Geçmiş parçası başına satır (varsayılan: {GENERATOR_CHUNK_ROWS})"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.catalog and not args.history:
+        parser.error("--catalog veya --history verilmeli")
+    if min(args.rows, args.chunk_rows, args.history_chunk_rows) <= 0:
+        parser.error("--rows, --chunk-rows ve --history-chunk-rows pozitif olmalı")
+    try:
+        args.years = [int(year) for year in args.years.split(',')]
+    except ValueError:
+        parser.error(f"Geçersiz yıl listesi: {args.years}")
+
+    return args
+
+
+def main(argv=None):
+    """
+    Veriyi üret ve yaz
+
+    Returns:
+        int: Çıkış kodu (0 = başarılı)
+    """
+    args = parse_args(argv)
+
+    if args.history:
+        expected = args.rows * len(args.years) * WEEKS_PER_YEAR
+        print(f"🧪 {args.rows:,} ürün, {expected:,} haftalık geçmiş satırı üretiliyor...")
+    else:
+        print(f"🧪 {args.rows:,} ürün üretiliyor...")
+
+    start = time.perf_counter()
+    try:
+        catalog_rows, history_rows = write_dataset(
+            args.rows,
+            catalog_path=args.catalog,
+            history_path=args.history,
+            years=args.years,
+            seed=args.seed,
+            chunk_rows=args.chunk_rows,
+            history_chunk_rows=args.history_chunk_rows
+        )
+    except ImportError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    seconds = time.perf_counter() - start
+
+    for path, count in ((args.catalog, catalog_rows), (args.history, history_rows)):
+        if path:
+            size_mb = os.path.getsize(path) / 1024 ** 2
+            print(f"   {os.path.abspath(path)}: {count:,} satır, {size_mb:,.1f} MB")
+
+    total = (catalog_rows if args.catalog else 0) + history_rows
+    print(f"✅ {seconds:.1f} s ({total / seconds:,.0f} satır/sn)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,7 @@
 """
 Alert Manager - Kritik Uyarı Sistemi
 """
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
@@ -16,11 +17,14 @@ class AlertManager:
         self.df = df
         self.allocation_df = allocation_df
         self.alerts = []
+        self.alerts_df = None
+        self.created_at = None
     
     def generate_all_alerts(self):
         """Tüm uyarıları oluştur"""
         
         self.alerts = []
+        self.created_at = datetime.now()
         
         # 1. Kritik stok uyarıları
         self._generate_critical_stock_alerts()
@@ -39,8 +43,9 @@ class AlertManager:
         
         # DataFrame'e çevir ve önceliklendir
         if self.alerts:
-            alerts_df = pd.DataFrame(self.alerts)
+            alerts_df = self._collect_alerts()
             alerts_df = self._prioritize_alerts(alerts_df)
+            self.alerts_df = alerts_df
             return alerts_df
         else:
             return pd.DataFrame(columns=[
@@ -48,6 +53,42 @@ class AlertManager:
                 'message', 'action', 'created_at'
             ])
     
+    def _collect_alerts(self):
+        """Kural bazlı alert tablolarını tek DataFrame'de birleştir"""
+        return pd.concat(self.alerts, ignore_index=True)
+    
+    def _add_alerts(self, products, level, category, message, action,
+                    sales_column='forecasted_daily_sales'):
+        """
+        Bir kuralın eşleşen tüm ürünleri için alert satırlarını tek seferde ekle
+        
+        Args:
+            products: Kurala uyan ürünler
+            level, category: Alert seviyesi ve kategorisi
+            message, action: Ürün başına metinler (array-like) veya sabit metin
+            sales_column: forecasted_sales kolonunun kaynağı
+        """
+        if len(products) == 0:
+            return
+        
+        self.alerts.append(pd.DataFrame({
+            'level': level,
+            'category': category,
+            'sku': products['sku'].to_numpy(),
+            'product_name': products['product_name'].to_numpy(),
+            'segment': products['segment'].to_numpy(),
+            'message': np.asarray(message, dtype=object),
+            'action': np.asarray(action, dtype=object),
+            'created_at': self.created_at,
+            'days_of_stock': products['days_of_stock'].to_numpy(),
+            'forecasted_sales': products[sales_column].to_numpy()
+        }))
+    
+    @staticmethod
+    def _format(values, spec):
+        """Kolonu format spec ile string'e çevir (ör. '.1f', ',.0f')"""
+        return pd.Series(values).map(f"{{:{spec}}}".format).to_numpy(dtype=object)
+    
     def _generate_critical_stock_alerts(self):
         """🔴 Kritik stok seviyesi uyarıları"""
         
@@ -56,45 +97,48 @@ class AlertManager:
             (self.allocation_df['segment'].isin(['HOT', 'RISING_STAR']))
         ]
         
-        for idx, product in critical_products.iterrows():
-            self.alerts.append({
-                'level': 'CRITICAL',
-                'category': 'STOCK',
-                'sku': product['sku'],
-                'product_name': product['product_name'],
-                'segment': product['segment'],
-                'message': f"Kritik stok! Sadece {product['days_of_stock']:.1f} günlük stok kaldı. Günlük satış: {product['forecasted_daily_sales']:.0f}",
-                'action': f"ACİL: Ana depodan {product['transfer_from_ana_depo']:.0f} adet transfer başlat",
-                'created_at': datetime.now(),
-                'days_of_stock': product['days_of_stock'],
-                'forecasted_sales': product['forecasted_daily_sales']
-            })
+        self._add_alerts(
+            critical_products,
+            level='CRITICAL',
+            category='STOCK',
+            message=(
+                "Kritik stok! Sadece "
+                + self._format(critical_products['days_of_stock'], '.1f')
+                + " günlük stok kaldı. Günlük satış: "
+                + self._format(critical_products['forecasted_daily_sales'], '.0f')
+            ),
+            action=(
+                "ACİL: Ana depodan "
+                + self._format(critical_products['transfer_from_ana_depo'], '.0f')
+                + " adet transfer başlat"
+            )
+        )
     
     def _generate_trend_alerts(self):
         """🟡 Yüksek trend uyarıları"""
         
+        # Zaten critical alert olanlar (< 3 gün) hariç
         trending = self.allocation_df[
             (self.allocation_df['days_of_stock'] < 7) &
+            ~(self.allocation_df['days_of_stock'] < 3) &
             (self.allocation_df['segment'] == 'HOT')
         ]
         
-        for idx, product in trending.iterrows():
-            # Eğer zaten critical alert varsa skip et
-            if product['days_of_stock'] < 3:
-                continue
-                
-            self.alerts.append({
-                'level': 'WARNING',
-                'category': 'TREND',
-                'sku': product['sku'],
-                'product_name': product['product_name'],
-                'segment': product['segment'],
-                'message': f"HOT ürün, {product['days_of_stock']:.1f} günlük stok var",
-                'action': f"Transfer hazırla: {product['transfer_from_ana_depo']:.0f} adet",
-                'created_at': datetime.now(),
-                'days_of_stock': product['days_of_stock'],
-                'forecasted_sales': product['forecasted_daily_sales']
-            })
+        self._add_alerts(
+            trending,
+            level='WARNING',
+            category='TREND',
+            message=(
+                "HOT ürün, "
+                + self._format(trending['days_of_stock'], '.1f')
+                + " günlük stok var"
+            ),
+            action=(
+                "Transfer hazırla: "
+                + self._format(trending['transfer_from_ana_depo'], '.0f')
+                + " adet"
+            )
+        )
     
     def _generate_markdown_alerts(self):
         """🔵 Markdown önerileri"""
@@ -103,23 +147,29 @@ class AlertManager:
             self.allocation_df['markdown_recommendation'] == 'URGENT'
         ]
         
-        for idx, product in markdown_urgent.iterrows():
-            # Price bilgisini df'den al
-            price = self.df[self.df['sku'] == product['sku']]['price'].iloc[0]
-            potential_loss = price * product['current_stock'] * 0.3
-            
-            self.alerts.append({
-                'level': 'INFO',
-                'category': 'MARKDOWN',
-                'sku': product['sku'],
-                'product_name': product['product_name'],
-                'segment': product['segment'],
-                'message': f"Ürün ölüyor. {product['days_of_stock']:.0f} günlük stok fazlası var",
-                'action': f"MARKDOWN başlat: %30-50 indirim öner (Potansiyel kayıp: ₺{potential_loss:,.0f})",
-                'created_at': datetime.now(),
-                'days_of_stock': product['days_of_stock'],
-                'forecasted_sales': product['forecasted_daily_sales']
-            })
+        if len(markdown_urgent) == 0:
+            return
+        
+        # Price bilgisini df'den tek join ile al (SKU başına ilk kayıt)
+        prices = self.df.drop_duplicates('sku').set_index('sku')['price']
+        price = prices.reindex(markdown_urgent['sku']).to_numpy()
+        potential_loss = price * markdown_urgent['current_stock'].to_numpy() * 0.3
+        
+        self._add_alerts(
+            markdown_urgent,
+            level='INFO',
+            category='MARKDOWN',
+            message=(
+                "Ürün ölüyor. "
+                + self._format(markdown_urgent['days_of_stock'], '.0f')
+                + " günlük stok fazlası var"
+            ),
+            action=(
+                "MARKDOWN başlat: %30-50 indirim öner (Potansiyel kayıp: ₺"
+                + self._format(potential_loss, ',.0f')
+                + ")"
+            )
+        )
     
     def _generate_stockout_alerts(self):
         """🔴 Geçmiş stoksuzluk uyarıları"""
@@ -129,19 +179,18 @@ class AlertManager:
             (self.df['segment'].isin(['HOT', 'RISING_STAR', 'STEADY']))
         ]
         
-        for idx, product in frequent_stockouts.iterrows():
-            self.alerts.append({
-                'level': 'WARNING',
-                'category': 'STOCKOUT_HISTORY',
-                'sku': product['sku'],
-                'product_name': product['product_name'],
-                'segment': product['segment'],
-                'message': f"Son 30 günde {product['stock_out_days_last_30d']} gün stoksuzluk yaşandı",
-                'action': "Safety stock seviyesini yükselt, tedarikçi lead time'ı gözden geçir",
-                'created_at': datetime.now(),
-                'days_of_stock': product['days_of_stock'],
-                'forecasted_sales': product['daily_sales_avg_7d']
-            })
+        self._add_alerts(
+            frequent_stockouts,
+            level='WARNING',
+            category='STOCKOUT_HISTORY',
+            message=(
+                "Son 30 günde "
+                + frequent_stockouts['stock_out_days_last_30d'].astype(str).to_numpy(dtype=object)
+                + " gün stoksuzluk yaşandı"
+            ),
+            action="Safety stock seviyesini yükselt, tedarikçi lead time'ı gözden geçir",
+            sales_column='daily_sales_avg_7d'
+        )
     
     def _generate_transfer_alerts(self):
         """🟡 Büyük transfer ihtiyacı uyarıları"""
@@ -151,19 +200,20 @@ class AlertManager:
             (self.allocation_df['auto_transfer'] == True)
         ]
         
-        for idx, product in large_transfers.iterrows():
-            self.alerts.append({
-                'level': 'WARNING',
-                'category': 'TRANSFER',
-                'sku': product['sku'],
-                'product_name': product['product_name'],
-                'segment': product['segment'],
-                'message': f"Büyük transfer ihtiyacı: {product['transfer_from_ana_depo']:.0f} adet",
-                'action': f"Transfer planla (Ana Depo → Akyazı). Mevcut Akyazı: {product['stock_akyazi']:.0f}",
-                'created_at': datetime.now(),
-                'days_of_stock': product['days_of_stock'],
-                'forecasted_sales': product['forecasted_daily_sales']
-            })
+        self._add_alerts(
+            large_transfers,
+            level='WARNING',
+            category='TRANSFER',
+            message=(
+                "Büyük transfer ihtiyacı: "
+                + self._format(large_transfers['transfer_from_ana_depo'], '.0f')
+                + " adet"
+            ),
+            action=(
+                "Transfer planla (Ana Depo → Akyazı). Mevcut Akyazı: "
+                + self._format(large_transfers['stock_akyazi'], '.0f')
+            )
+        )
     
     def _prioritize_alerts(self, alerts_df):
         """Uyarıları önceliklendir"""
@@ -221,7 +271,7 @@ class AlertManager:
         if not self.alerts:
             alerts_df = self.generate_all_alerts()
         else:
-            alerts_df = pd.DataFrame(self.alerts)
+            alerts_df = self._collect_alerts()
         
         if len(alerts_df) == 0:
             return {
@@ -248,7 +298,7 @@ class AlertManager:
         if not self.alerts:
             alerts_df = self.generate_all_alerts()
         else:
-            alerts_df = pd.DataFrame(self.alerts)
+            alerts_df = self._collect_alerts()
         
         return alerts_df[[
             'level', 'category', 'sku', 'product_name', 'segment',
@@ -2,8 +2,27 @@
 Allocation Optimizer - Sevkiyat Stratejisi Modülü
 Transfer Lead Time ile Güncellenmiş Versiyon
 """
+import numpy as np
 import pandas as pd
 from utils.constants import DEFAULT_SEGMENT_PARAMS, TRANSFER_LEAD_TIME_DAYS
+from utils.helpers import round_values
+from modules.filter_engine import FilterEngine, between, is_true, isin
+
+# Allocation planında float32 tutulan hesaplanmış kolonlar
+# (days_of_stock alert önceliklendirmesinde df ile karşılaştırıldığı için float64 kalır;
+# toplamı alınan miktar kolonları - transfer, optimal stok, safety stock, reorder point,
+# günlük tahmin - float32 toplamda 2^24 üzerinde hassasiyet kaybettiği için float64 kalır)
+ALLOCATION_FLOAT_COLUMNS = [
+    'days_until_stockout_akyazi', 'stock_consumed_during_transfer'
+]
+
+# Transfer önerisi listelerinin kolonları
+TRANSFER_COLUMNS = [
+    'sku', 'product_name', 'segment', 'primary_depot',
+    'transfer_from_ana_depo', 'days_until_stockout_akyazi',
+    'stock_consumed_during_transfer', 'forecasted_daily_sales',
+    'is_urgent_transfer'
+]
 
 class AllocationOptimizer:
     """Sevkiyat ve transfer optimizasyonu"""
@@ -19,140 +38,180 @@ class AllocationOptimizer:
         self.segment_params = segment_params or DEFAULT_SEGMENT_PARAMS
         self.transfer_lead_time = transfer_lead_time
         self.allocation_plan = None
+        # Allocation planı üzerinde cache'li filtre maskeleri
+        self.filter_engine = None
+    
+    def _segment_param_table(self):
+        """
+        Segment parametrelerini segment x parametre tablosuna çevir
+        
+        Returns:
+            pd.DataFrame: index = segment adı
+        """
+        table = pd.DataFrame({
+            segment: {
+                'reorder_days': params['reorder_days'],
+                'safety_stock_days': params['safety_stock_days'],
+                'allocation_pct': params['allocation_pct'],
+                'markdown_day': params['markdown_day'],
+                'auto_transfer': params['auto_transfer'],
+                'depot_priority': ', '.join(params['depot_priority'])
+            }
+            for segment, params in self.segment_params.items()
+        }).T
+        
+        return table.astype({
+            'reorder_days': 'float64',
+            'safety_stock_days': 'float64',
+            'allocation_pct': 'float64',
+            'markdown_day': 'float64',
+            'auto_transfer': 'bool'
+        })
     
     def generate_allocation_strategy(self):
-        """Her ürün için sevkiyat stratejisi oluştur"""
+        """Her ürün için sevkiyat stratejisi oluştur (tüm kolonlar vektörel)"""
         
-        allocation_list = []
+        df = self.df
+        n = len(df)
         
-        for idx, row in self.df.iterrows():
-            segment = row.get('segment', 'UNCLASSIFIED')
-            params = self.segment_params.get(segment, self.segment_params['STEADY'])
-            
-            # Günlük satış tahmini (trend ile)
-            forecasted_daily_sales = row['daily_sales_avg_7d'] * row.get('trend_score', 1.0)
-            
-            # İhtiyaç hesaplamaları
-            safety_stock_needed = forecasted_daily_sales * params['safety_stock_days']
-            reorder_point = forecasted_daily_sales * params['reorder_days']
-            
-            # Mevcut stok
-            current_total = row['total_stock']
-            
-            # Optimal Akyazı stoğu
-            optimal_akyazi = current_total * params['allocation_pct']
-            
-            # 🚛 LEAD TIME HESABI
-            # Transfer sırasında tüketilecek stok (5 gün * günlük satış)
-            stock_consumed_during_transfer = forecasted_daily_sales * self.transfer_lead_time
-            
-            # Transfer ihtiyacı (lead time dahil)
-            # Transfer bittiğinde Akyazı'da olması gereken = optimal + lead time tüketimi
-            target_akyazi_after_transfer = optimal_akyazi
-            transfer_from_ana_depo = max(0, 
-                target_akyazi_after_transfer + stock_consumed_during_transfer - row['stock_akyazi']
-            )
-            
-            # Ana depoda yeterli stok var mı kontrol et
-            if transfer_from_ana_depo > row['stock_ana_depo']:
-                transfer_from_ana_depo = row['stock_ana_depo']  # Maksimum ne varsa
-            
-            transfer_from_oms = 0  # Şimdilik manuel
-            
-            # Kritik durum
-            is_critical = current_total < reorder_point
-            
-            # Lead time riskini değerlendir
-            # Eğer mevcut Akyazı stoğu lead time boyunca yeterli değilse -> URGENT
-            days_until_stockout_akyazi = row['stock_akyazi'] / (forecasted_daily_sales + 0.1)
-            is_urgent_transfer = days_until_stockout_akyazi < self.transfer_lead_time
-            
-            # Sevkiyat önceliği
-            if row['stock_akyazi'] > forecasted_daily_sales:
-                primary_depot = 'akyazi'
-            elif row['stock_ana_depo'] > 0:
-                primary_depot = 'ana_depo'
-            else:
-                primary_depot = 'oms'
-            
-            # Markdown önerisi
-            if segment == 'DYING':
-                markdown_rec = 'URGENT'
-            elif row['days_of_stock'] > params['markdown_day']:
-                markdown_rec = 'CONSIDER'
-            else:
-                markdown_rec = 'NO'
-            
-            allocation_list.append({
-                'sku': row['sku'],
-                'product_name': row['product_name'],
-                'category': row['category'],
-                'segment': segment,
-                'current_stock': current_total,
-                'stock_akyazi': row['stock_akyazi'],
-                'stock_ana_depo': row['stock_ana_depo'],
-                'stock_oms': row['stock_oms_total'],
-                'forecasted_daily_sales': round(forecasted_daily_sales, 2),
-                'days_of_stock': round(row['days_of_stock'], 1),
-                'days_until_stockout_akyazi': round(days_until_stockout_akyazi, 1),
-                'safety_stock_needed': round(safety_stock_needed, 0),
-                'reorder_point': round(reorder_point, 0),
-                'is_critical': is_critical,
-                'is_urgent_transfer': is_urgent_transfer,
-                'primary_depot': primary_depot,
-                'depot_priority': ', '.join(params['depot_priority']),
-                'transfer_from_ana_depo': round(transfer_from_ana_depo, 0),
-                'stock_consumed_during_transfer': round(stock_consumed_during_transfer, 1),
-                'transfer_from_oms': transfer_from_oms,
-                'auto_transfer': params['auto_transfer'],
-                'markdown_recommendation': markdown_rec,
-                'optimal_akyazi_stock': round(optimal_akyazi, 0)
-            })
+        if 'segment' in df.columns:
+            segment = df['segment'].to_numpy(dtype=object)
+        else:
+            segment = np.full(n, 'UNCLASSIFIED', dtype=object)
+        
+        # Segment parametrelerini satırlara yay (tanımsız segment -> STEADY)
+        param_table = self._segment_param_table()
+        param_rows = param_table.index.get_indexer(segment)
+        param_rows = np.where(param_rows >= 0, param_rows, param_table.index.get_loc('STEADY'))
+        params = {col: param_table[col].to_numpy()[param_rows] for col in param_table.columns}
+        
+        stock_akyazi = df['stock_akyazi'].to_numpy(dtype=np.float64)
+        stock_ana_depo = df['stock_ana_depo'].to_numpy(dtype=np.float64)
+        current_total = df['total_stock'].to_numpy(dtype=np.float64)
+        days_of_stock = df['days_of_stock'].to_numpy(dtype=np.float64)
+        
+        # Günlük satış tahmini (trend ile)
+        forecasted_daily_sales = df['daily_sales_avg_7d'].to_numpy(dtype=np.float64)
+        if 'trend_score' in df.columns:
+            forecasted_daily_sales = forecasted_daily_sales * df['trend_score'].to_numpy(dtype=np.float64)
+        
+        # İhtiyaç hesaplamaları
+        safety_stock_needed = forecasted_daily_sales * params['safety_stock_days']
+        reorder_point = forecasted_daily_sales * params['reorder_days']
+        
+        # Optimal Akyazı stoğu
+        optimal_akyazi = current_total * params['allocation_pct']
+        
+        # 🚛 LEAD TIME HESABI
+        # Transfer sırasında tüketilecek stok (5 gün * günlük satış)
+        stock_consumed_during_transfer = forecasted_daily_sales * self.transfer_lead_time
+        
+        # Transfer ihtiyacı (lead time dahil), ana depoda ne varsa o kadar
+        transfer_from_ana_depo = np.fmin(
+            np.fmax(0, optimal_akyazi + stock_consumed_during_transfer - stock_akyazi),
+            stock_ana_depo
+        )
+        
+        # Kritik durum
+        is_critical = current_total < reorder_point
         
-        self.allocation_plan = pd.DataFrame(allocation_list)
+        # Lead time riskini değerlendir
+        # Eğer mevcut Akyazı stoğu lead time boyunca yeterli değilse -> URGENT
+        days_until_stockout_akyazi = stock_akyazi / (forecasted_daily_sales + 0.1)
+        is_urgent_transfer = days_until_stockout_akyazi < self.transfer_lead_time
+        
+        # Sevkiyat önceliği
+        primary_depot = np.select(
+            [stock_akyazi > forecasted_daily_sales, stock_ana_depo > 0],
+            ['akyazi', 'ana_depo'],
+            default='oms'
+        )
+        
+        # Markdown önerisi
+        markdown_rec = np.select(
+            [segment == 'DYING', days_of_stock > params['markdown_day']],
+            ['URGENT', 'CONSIDER'],
+            default='NO'
+        )
+        
+        if 'segment' in df.columns:
+            segment = df['segment'].array  # categorical korunur
+        
+        self.allocation_plan = pd.DataFrame({
+            'sku': df['sku'].array,
+            'product_name': df['product_name'].array,
+            'category': df['category'].array,
+            'segment': segment,
+            'current_stock': df['total_stock'].to_numpy(),
+            'stock_akyazi': df['stock_akyazi'].to_numpy(),
+            'stock_ana_depo': df['stock_ana_depo'].to_numpy(),
+            'stock_oms': df['stock_oms_total'].to_numpy(),
+            'forecasted_daily_sales': round_values(forecasted_daily_sales, 2),
+            'days_of_stock': round_values(days_of_stock, 1),
+            'days_until_stockout_akyazi': round_values(days_until_stockout_akyazi, 1),
+            'safety_stock_needed': round_values(safety_stock_needed, 0),
+            'reorder_point': round_values(reorder_point, 0),
+            'is_critical': is_critical,
+            'is_urgent_transfer': is_urgent_transfer,
+            'primary_depot': primary_depot,
+            'depot_priority': params['depot_priority'],
+            'transfer_from_ana_depo': round_values(transfer_from_ana_depo, 0),
+            'stock_consumed_during_transfer': round_values(stock_consumed_during_transfer, 1),
+            'transfer_from_oms': np.zeros(n, dtype=np.int32),  # Şimdilik manuel
+            'auto_transfer': params['auto_transfer'],
+            'markdown_recommendation': markdown_rec,
+            'optimal_akyazi_stock': round_values(optimal_akyazi, 0)
+        })
+        
+        # Toplanmayan hesaplanmış gün/miktar kolonları float32 olarak tutulur
+        self.allocation_plan = self.allocation_plan.astype(
+            {col: 'float32' for col in ALLOCATION_FLOAT_COLUMNS}
+        )
+        self.filter_engine = FilterEngine(self.allocation_plan)
         return self.allocation_plan
     
-    def get_transfer_recommendations(self, min_transfer=10, priority='urgent'):
+    def get_filter_engine(self):
+        """Allocation planı filtre motoru (plan yoksa oluşturulur)"""
+        
+        if self.allocation_plan is None:
+            self.generate_allocation_strategy()
+        
+        return self.filter_engine
+    
+    def get_transfer_view(self, min_transfer=10, priority='urgent'):
         """
-        Transfer önerileri listesi
+        Transfer önerilerinin görünümü (öncelik sırasıyla, kopyasız)
         
         Args:
             min_transfer: Minimum transfer miktarı
             priority: 'urgent' (acil), 'auto' (otomatik), 'all' (hepsi)
+            
+        Returns:
+            FilterView: Allocation planı satır pozisyonları
         """
-        
-        if self.allocation_plan is None:
-            self.generate_allocation_strategy()
-        
-        # Filtreler
+        predicates = [between('transfer_from_ana_depo', low=min_transfer)]
         if priority == 'urgent':
-            transfers = self.allocation_plan[
-                (self.allocation_plan['is_urgent_transfer'] == True) &
-                (self.allocation_plan['transfer_from_ana_depo'] >= min_transfer)
-            ].copy()
+            predicates.append(is_true('is_urgent_transfer'))
         elif priority == 'auto':
-            transfers = self.allocation_plan[
-                (self.allocation_plan['auto_transfer'] == True) &
-                (self.allocation_plan['transfer_from_ana_depo'] >= min_transfer)
-            ].copy()
-        else:  # all
-            transfers = self.allocation_plan[
-                self.allocation_plan['transfer_from_ana_depo'] >= min_transfer
-            ].copy()
+            predicates.append(is_true('auto_transfer'))
         
         # Öncelik skoruna göre sırala
         # Urgency + segment priority + days until stockout
-        transfers = transfers.sort_values(
-            ['is_urgent_transfer', 'days_until_stockout_akyazi'], 
+        return self.get_filter_engine().filter(*predicates).sort_values(
+            ['is_urgent_transfer', 'days_until_stockout_akyazi'],
             ascending=[False, True]
         )
+    
+    def get_transfer_recommendations(self, min_transfer=10, priority='urgent'):
+        """
+        Transfer önerileri listesi
         
-        return transfers[[
-            'sku', 'product_name', 'segment', 'primary_depot',
-            'transfer_from_ana_depo', 'days_until_stockout_akyazi', 
-            'stock_consumed_during_transfer', 'forecasted_daily_sales',
-            'is_urgent_transfer'
-        ]]
+        Args:
+            min_transfer: Minimum transfer miktarı
+            priority: 'urgent' (acil), 'auto' (otomatik), 'all' (hepsi)
+        """
+        
+        return self.get_transfer_view(min_transfer, priority).materialize(TRANSFER_COLUMNS)
     
     def get_reorder_recommendations(self):
         """Sipariş önerileri"""
@@ -160,11 +219,9 @@ class AllocationOptimizer:
         if self.allocation_plan is None:
             self.generate_allocation_strategy()
         
-        reorders = self.allocation_plan[
-            self.allocation_plan['is_critical'] == True
-        ].copy()
-        
-        reorders = reorders.sort_values('days_of_stock')
+        reorders = self.get_filter_engine().filter(
+            is_true('is_critical')
+        ).sort_values('days_of_stock').materialize()
         
         # Sipariş miktarı önerisi
         reorders['suggested_order_qty'] = (
@@ -182,11 +239,9 @@ class AllocationOptimizer:
         if self.allocation_plan is None:
             self.generate_allocation_strategy()
         
-        markdown = self.allocation_plan[
-            self.allocation_plan['markdown_recommendation'].isin(['URGENT', 'CONSIDER'])
-        ].copy()
-        
-        markdown = markdown.sort_values('days_of_stock', ascending=False)
+        markdown = self.get_filter_engine().filter(
+            isin('markdown_recommendation', ['URGENT', 'CONSIDER'])
+        ).sort_values('days_of_stock', ascending=False).materialize()
         
         # Potansiyel kayıp hesapla
         markdown['potential_loss'] = self.df.set_index('sku').loc[
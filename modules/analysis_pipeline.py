@@ -0,0 +1,273 @@
+"""
+Analysis Pipeline - Yükleme -> metrikler -> segmentasyon -> allocation -> alert
+
+Her aşamanın sonucu, girdilerinin ve parametrelerinin parmak iziyle
+saklanır. Anahtarlar zincirlidir (her aşamanın anahtarı bir önceki
+aşamanın anahtarını içerir); bir parametre değişince
+sadece ona bağlı aşamalar ve sonrası yeniden çalışır. Aynı girdilerle
+tekrar çalıştırma hesap yapmadan döner.
+"""
+import copy
+import json
+import os
+from modules.data_loader import DataLoader
+from modules.analytics_engine import AnalyticsEngine
+from modules.allocation_optimizer import AllocationOptimizer
+from modules.alert_manager import AlertManager
+from utils.cache import file_fingerprint, params_fingerprint
+from utils.profiling import StageProfiler
+from utils.constants import (
+    DEFAULT_SEGMENT_PARAMS, HISTORICAL_DATA_PATHS, METRIC_WEIGHTS, SAMPLE_DATA_PATH,
+    TRANSFER_LEAD_TIME_DAYS
+)
+
+
+# Ayar profilinde (JSON) kabul edilen anahtarlar (risk_levels sadece arayüzde kullanılır)
+SETTINGS_PROFILE_KEYS = ['segment_params', 'metric_weights', 'transfer_lead_time', 'risk_levels']
+
+
+class AnalysisPipeline:
+    """Aşama sonuçlarını parmak iziyle saklayan analiz pipeline'ı"""
+
+    def __init__(self, search_index=False):
+        """
+        Args:
+            search_index: Katalog arama index'i yüklemede oluşturulsun mu
+                (sadece arama kutusu olan sayfa için; yoksa ilk aramada oluşur)
+        """
+        self.search_index = search_index
+        # Aşama -> (anahtar, sonuç); her aşamanın sadece son sonucu tutulur
+        self._stages = {}
+        # Son çalıştırmada yeniden hesaplanan aşamalar
+        self.executed = []
+        # Son çalıştırmanın aşama kayıtları (süre, satır, satır/sn)
+        self.profiler = StageProfiler()
+        # Son yüklemenin mesajları: (seviye, mesaj)
+        self.messages = []
+
+    @property
+    def timings(self):
+        """Son çalıştırmada aşama -> süre (saniye)"""
+        return self.profiler.timings
+
+    def run(self, uploaded_file=None, segment_params=None, metric_weights=None,
+            transfer_lead_time=TRANSFER_LEAD_TIME_DAYS, historical_data_path=None,
+            chunksize=None, reuse_loaded=False, capture_profile=False,
+            track_memory=False, memory_budget_mb=None):
+        """
+        Pipeline'ı çalıştır (değişmeyen aşamalar cache'ten gelir)
+
+        Args:
+            uploaded_file: Katalog dosyası (None = örnek veri)
+            segment_params: Özel segment parametreleri
+            metric_weights: Özel final score ağırlıkları
+            transfer_lead_time: Transfer süresi (gün)
+            historical_data_path: Historik satış dosyası (None = HISTORICAL_DATA_PATHS'ten ilk bulunan)
+            chunksize: CSV streaming parça boyutu
+            reuse_loaded: True ise son yüklenen katalog kullanılır (dosya okunmaz)
+            capture_profile: True ise çalışan aşamalar cProfile ile profillenir
+            track_memory: True ise aşamaların tepe / kalıcı belleği ölçülür (tracemalloc)
+            memory_budget_mb: Çalıştırmanın bellek bütçesi (MB); aşılacaksa
+                MemoryBudgetExceeded ile erken durulur (bellek takibini açar)
+
+        Returns:
+            dict: loader, df, analytics, optimizer, allocation_df, alert_mgr,
+            alerts_df (katalog yüklenemezse None)
+
+        Raises:
+            MemoryBudgetExceeded: Bellek bütçesi aşıldığında (aşama sonuçları saklanmaz)
+        """
+        self.executed = []
+        self.profiler = StageProfiler(
+            capture=capture_profile,
+            track_memory=track_memory,
+            memory_budget=memory_budget_mb * 1024 ** 2 if memory_budget_mb else None
+        )
+        self.messages = []
+
+        try:
+            return self._run(
+                uploaded_file, segment_params, metric_weights, transfer_lead_time,
+                historical_data_path, chunksize, reuse_loaded
+            )
+        finally:
+            self.profiler.close()
+
+    def _run(self, uploaded_file, segment_params, metric_weights, transfer_lead_time,
+             historical_data_path, chunksize, reuse_loaded):
+        """Aşamaları sırayla çalıştır (bkz. run)"""
+        # Parametreler kopyalanır: session'daki dict'ler yerinde değişebilir
+        segment_params = copy.deepcopy(segment_params or DEFAULT_SEGMENT_PARAMS)
+        historical_data_path = historical_data_path or next(  # Opsiyonel (Parquet/Arrow/CSV)
+            (path for path in HISTORICAL_DATA_PATHS if os.path.exists(path)), None
+        )
+
+        loader = self._load(uploaded_file, chunksize, reuse_loaded)
+        if loader is None:
+            return None
+
+        metrics_key = (
+            self._stages['load'][0], params_fingerprint(_file_stamp(historical_data_path))
+        )
+        analytics = self._stage('metrics', metrics_key, lambda: self._metrics(
+            loader.df, metric_weights, historical_data_path
+        ))
+
+        # Segment parametreleri metrikleri etkilemez: sadece segmentasyon yeniden çalışır
+        analysis_key = (metrics_key, params_fingerprint(segment_params))
+        analytics = self._stage('segment', analysis_key, lambda: self._segment(
+            analytics, segment_params
+        ))
+
+        # Ağırlıklar segmentleri etkilemez: sadece final_score yeniden hesaplanır
+        metric_weights = dict(metric_weights or METRIC_WEIGHTS)
+        if metric_weights != analytics.metric_weights:
+            self.executed.append('rescore')
+            with self.profiler.stage('rescore', rows=len(analytics.df)):
+                analytics.rescore(metric_weights)
+        df = analytics.df
+
+        allocation_key = (analysis_key, params_fingerprint(transfer_lead_time))
+        optimizer = self._stage('allocate', allocation_key, lambda: self._allocate(
+            df, segment_params, transfer_lead_time
+        ))
+
+        alert_mgr, alerts_df = self._stage('alerts', allocation_key, lambda: self._alerts(
+            df, optimizer.allocation_plan
+        ))
+
+        return {
+            'loader': loader,
+            'df': df,
+            'analytics': analytics,
+            'optimizer': optimizer,
+            'allocation_df': optimizer.allocation_plan,
+            'alert_mgr': alert_mgr,
+            'alerts_df': alerts_df
+        }
+
+    def clear(self):
+        """Tüm aşama sonuçlarını sil"""
+        self._stages = {}
+
+    def _load(self, uploaded_file, chunksize, reuse_loaded):
+        """Katalog yükleme aşaması (anahtar: dosya içeriği + loader konfigürasyonu)"""
+        if reuse_loaded and 'load' in self._stages:
+            return self._stages['load'][1]
+
+        source = SAMPLE_DATA_PATH if uploaded_file is None else uploaded_file
+        key = file_fingerprint(source, extra=DataLoader._cache_key_config())
+
+        cached = self._stages.get('load')
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        self.executed.append('load')
+        with self.profiler.stage('load') as record:
+            loader = DataLoader(search_index=self.search_index)
+            if uploaded_file is not None:
+                df = loader.load_from_file(uploaded_file, chunksize=chunksize)
+            else:
+                df = loader.load_sample_data()
+            record['rows'] = 0 if df is None else len(df)
+        self.messages = loader.messages
+
+        if df is None:
+            return None
+
+        # Yeni katalog: sonraki aşamaların sonuçları geçersiz
+        self._stages = {'load': (key, loader)}
+        return loader
+
+    def _stage(self, stage, key, build):
+        """Aşama sonucu cache'te aynı anahtarla varsa döndür, yoksa hesapla"""
+        cached = self._stages.get(stage)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        self.executed.append(stage)
+        result = build()
+        self._stages[stage] = (key, result)
+        return result
+
+    def _metrics(self, df, metric_weights, historical_data_path):
+        """Metrik aşaması (katalog AnalyticsEngine içinde kopyalanır)"""
+        # Seasonal model AnalyticsEngine oluşturulurken yüklenir
+        with self.profiler.stage('seasonal', rows=len(df), input_frame=df):
+            analytics = AnalyticsEngine(
+                df,
+                historical_data_path=historical_data_path,
+                metric_weights=metric_weights
+            )
+        with self.profiler.stage('metrics', rows=len(df)):
+            analytics.calculate_all_metrics()
+        return analytics
+
+    def _segment(self, analytics, segment_params):
+        """Segmentasyon aşaması (mevcut metrikler üzerinde)"""
+        with self.profiler.stage('segment', rows=len(analytics.df)):
+            analytics.segment_params = segment_params
+            analytics.segment_products()
+        return analytics
+
+    def _allocate(self, df, segment_params, transfer_lead_time):
+        """Allocation aşaması"""
+        with self.profiler.stage('allocate', rows=len(df), input_frame=df):
+            optimizer = AllocationOptimizer(
+                df, segment_params=segment_params, transfer_lead_time=transfer_lead_time
+            )
+            optimizer.generate_allocation_strategy()
+        return optimizer
+
+    def _alerts(self, df, allocation_df):
+        """Alert aşaması (uyarı yoksa alerts_df boş tablo)"""
+        with self.profiler.stage('alerts', rows=len(df)):
+            alert_mgr = AlertManager(df, allocation_df)
+            alerts_df = alert_mgr.generate_all_alerts()
+        return alert_mgr, alerts_df
+
+
+def load_settings_profile(path):
+    """
+    Ayar profilini (JSON) pipeline parametrelerine çevir
+
+    Profil ayarlar sayfasından indirilen formattadır; verilmeyen segment
+    parametreleri ve ağırlıklar varsayılan değerlerini korur.
+    Örnek: {"transfer_lead_time": 7, "segment_params": {"HOT": {"velocity_min": 1.4}},
+    "metric_weights": {"velocity_score": 0.3}}
+
+    Args:
+        path: Profil dosyası yolu
+
+    Returns:
+        dict: segment_params, metric_weights, transfer_lead_time
+    """
+    with open(path, encoding='utf-8') as f:
+        profile = json.load(f)
+
+    unknown = [key for key in profile if key not in SETTINGS_PROFILE_KEYS]
+    if unknown:
+        raise ValueError(f"Bilinmeyen profil ayarı: {', '.join(unknown)}")
+
+    segment_params = copy.deepcopy(DEFAULT_SEGMENT_PARAMS)
+    for segment, params in profile.get('segment_params', {}).items():
+        if segment not in segment_params:
+            raise ValueError(f"Bilinmeyen segment: {segment}")
+        segment_params[segment].update(params)
+
+    metric_weights = dict(METRIC_WEIGHTS)
+    metric_weights.update(profile.get('metric_weights', {}))
+
+    return {
+        'segment_params': segment_params,
+        'metric_weights': metric_weights,
+        'transfer_lead_time': profile.get('transfer_lead_time', TRANSFER_LEAD_TIME_DAYS)
+    }
+
+
+def _file_stamp(path):
+    """Dosyanın yol + boyut + değişiklik zamanı bilgisi (yoksa None)"""
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [path, stat.st_size, stat.st_mtime_ns]
@@ -3,8 +3,16 @@ Analytics Engine - Segmentasyon ve Metrik Hesaplama
 """
 import pandas as pd
 import numpy as np
-from utils.constants import DEFAULT_SEGMENT_PARAMS, METRIC_WEIGHTS
-from utils.helpers import safe_divide
+from utils.constants import DEFAULT_SEGMENT_PARAMS, METRIC_WEIGHTS, SEGMENT_NAMES
+from modules.metrics_kernel import (
+    compute_metrics, new_score_matrix, rescore_metrics, METRIC_NAMES
+)
+from modules.rollup_cube import RollupCube
+from modules.segment_index import SegmentIndex
+from modules.segment_rules import (
+    RULE_OPERATORS, SEGMENT_RULE_COLUMNS, assign_segment_codes, combine_clauses,
+    resolve_segment_rules
+)
 
 # Seasonal forecaster import (opsiyonel)
 try:
@@ -16,16 +24,24 @@ except:
 class AnalyticsEngine:
     """Ürün analizi ve segmentasyon motoru"""
     
-    def __init__(self, df, segment_params=None, historical_data_path=None):
+    def __init__(self, df, segment_params=None, historical_data_path=None,
+                 metric_weights=None):
         """
         Args:
             df: Ürün dataframe
             segment_params: Özel segment parametreleri (opsiyonel)
             historical_data_path: Historik satış verisi CSV yolu (opsiyonel)
+            metric_weights: Özel final score ağırlıkları (opsiyonel)
         """
         self.df = df.copy()
         self.segment_params = segment_params or DEFAULT_SEGMENT_PARAMS
+        self.metric_weights = dict(metric_weights or METRIC_WEIGHTS)
+        # Segment adı -> ürünler (SegmentIndex, segment_products ile oluşur)
         self.segments = {}
+        # Final score girdileri (ağırlık değişiminde yeniden skorlama için)
+        self.score_matrix = None
+        self._segment_summary = None
+        self._rollup_cube = None
         
         # Seasonal forecaster'ı yükle (varsa)
         self.seasonal_forecaster = None
@@ -38,100 +54,100 @@ class AnalyticsEngine:
                 self.seasonal_forecaster = None
     
     def calculate_all_metrics(self):
-        """Tüm metrikleri hesapla"""
+        """
+        Tüm metrikleri hesapla
         
-        # 1. Velocity Score (Satış hız değişimi)
-        self.df['velocity_score'] = safe_divide(
-            self.df['daily_sales_avg_7d'],
-            self.df['daily_sales_avg_30d'],
-            default=1.0
+        Metrikler (velocity, trend, engagement, conversion, days_of_stock,
+        quality, stockout, campaign, seasonal, final score) tek geçişli
+        NumPy kernel'inde hesaplanır (bkz. modules/metrics_kernel.py).
+        """
+        # Seasonal Adjustment (eğer aktifse)
+        seasonal_factor = None
+        if self.seasonal_forecaster:
+            seasonal_factor = self._get_seasonal_factors()
+        
+        self.score_matrix = new_score_matrix(len(self.df))
+        metrics = compute_metrics(
+            self.df,
+            seasonal_factor=seasonal_factor,
+            weights=self.metric_weights,
+            score_matrix=self.score_matrix
         )
         
-        # 2. Trend Score (Günlük momentum)
-        self.df['trend_score'] = safe_divide(
-            self.df['daily_sales_yesterday'],
-            self.df['daily_sales_avg_7d'],
-            default=1.0
+        # Skor kolonları (METRIC_COLUMNS float32) kopyalanmadan eklenir
+        self.df = pd.concat(
+            [self.df.drop(columns=METRIC_NAMES, errors='ignore'), metrics], axis=1
         )
+        self._segment_summary = None
+        self._rollup_cube = None
         
-        # 3. Engagement Score (İlgi/Görüntülenme oranı)
-        self.df['engagement_score'] = safe_divide(
-            self.df['add_to_cart_7d'],
-            self.df['view_count_7d'],
-            default=0
-        ) * 100
-        
-        # 4. Conversion Rate (Satış/Sepet oranı)
-        self.df['conversion_rate'] = safe_divide(
-            self.df['daily_sales_avg_7d'] * 7,
-            self.df['add_to_cart_7d'],
-            default=0
-        ) * 100
-        
-        # 5. Stock Health (Stok kaç güne yeter?)
-        self.df['days_of_stock'] = safe_divide(
-            self.df['total_stock'],
-            self.df['daily_sales_avg_7d'],
-            default=999
-        )
+        return self.df
+    
+    def score(self, metric_weights):
+        """
+        Verilen ağırlıklarla final score hesapla (self.df değişmez)
         
-        # 6. Quality Score (Ürün kalitesi - rating + review count)
-        self.df['quality_score'] = (
-            self.df['avg_rating'] * 20 +  # 0-100 skala
-            np.minimum(self.df['review_count'] / 10, 10)  # Max 10 puan
-        ) / 2
+        Saklanan score matrisi üzerinde tek matris-vektör çarpımıdır;
+        metrikler yeniden hesaplanmaz.
         
-        # 7. Stockout Penalty (Stoksuzluk cezası)
-        self.df['stockout_penalty'] = 100 - (self.df['stock_out_days_last_30d'] * 3)
-        self.df['stockout_penalty'] = self.df['stockout_penalty'].clip(lower=0)
+        Args:
+            metric_weights: Metrik -> ağırlık
+            
+        Returns:
+            pd.Series: float32 final score
+        """
+        if self.score_matrix is None:
+            self.calculate_all_metrics()
         
-        # 8. Campaign Boost
-        self.df['campaign_boost'] = self.df['campaign_flag'] * 1.3 + (1 - self.df['campaign_flag']) * 1.0
+        final = rescore_metrics(self.score_matrix, metric_weights)
         
-        # 9. Seasonal Adjustment (eğer aktifse)
-        self.df['seasonal_factor'] = 1.0  # Default
-        if self.seasonal_forecaster:
-            self._apply_seasonal_adjustment()
-        
-        # 10. Final Score (Ağırlıklı toplam)
-        self.df['final_score'] = (
-            self.df['velocity_score'] * METRIC_WEIGHTS['velocity_score'] +
-            self.df['trend_score'] * METRIC_WEIGHTS['trend_score'] +
-            self.df['engagement_score'] * METRIC_WEIGHTS['engagement_score'] +
-            self.df['conversion_rate'] * METRIC_WEIGHTS['conversion_rate'] +
-            self.df['quality_score'] * METRIC_WEIGHTS['quality_score'] +
-            self.df['stockout_penalty'] * METRIC_WEIGHTS['stockout_penalty']
-        ) * self.df['campaign_boost'] * self.df['seasonal_factor']  # Seasonal ekledik!
-        
-        return self.df
+        return pd.Series(final.astype('float32'), index=self.df.index, name='final_score')
     
-    def _apply_seasonal_adjustment(self):
-        """
-        Her ürün için seasonal factor hesapla ve ekle
+    def rescore(self, metric_weights):
         """
-        seasonal_factors = []
-        
-        for idx, row in self.df.iterrows():
-            # Ürün bilgilerini al
-            sku = row.get('sku', None)
-            subcat = row.get('SubGroupDesc', None)
-            maingroup = row.get('MainGroup', None)
-            is_promo = row.get('campaign_flag', 0) == 1
+        Ağırlıklar değiştiğinde final score'u ve segment özetini güncelle
+        
+        Segment üyeliği final score'a bağlı olmadığı için sadece
+        final_score kolonu ve özetin avg_final_score kolonu yenilenir.
+        
+        Args:
+            metric_weights: Metrik -> ağırlık
             
-            # Seasonal factor al
-            seasonal_info = self.seasonal_forecaster.get_seasonal_factor(
-                sku=sku,
-                subcat=subcat,
-                maingroup=maingroup,
-                is_promo=is_promo
+        Returns:
+            pd.DataFrame: Güncellenmiş ürün dataframe
+        """
+        self.df['final_score'] = self.score(metric_weights)
+        self.metric_weights = dict(metric_weights)
+        self._rollup_cube = None
+        
+        if self._segment_summary is not None:
+            avg_score = self.df['final_score'].groupby(self.df['segment'], observed=True).mean()
+            self._segment_summary['avg_final_score'] = (
+                avg_score.reindex(self._segment_summary['segment']).to_numpy()
             )
-            
-            seasonal_factors.append(seasonal_info['factor'])
         
-        self.df['seasonal_factor'] = seasonal_factors
-    
         return self.df
     
+    def _get_seasonal_factors(self):
+        """
+        Tüm ürünler için seasonal factor'ü toplu lookup ile hesapla
+        
+        Returns:
+            np.ndarray: Ürün başına seasonal factor
+        """
+        is_promo = None
+        if 'campaign_flag' in self.df.columns:
+            is_promo = (self.df['campaign_flag'] == 1).to_numpy()
+        
+        seasonal_info = self.seasonal_forecaster.get_seasonal_factors(
+            skus=self.df['sku'].to_numpy() if 'sku' in self.df.columns else None,
+            subcats=self.df['SubGroupDesc'].to_numpy() if 'SubGroupDesc' in self.df.columns else None,
+            maingroups=self.df['MainGroup'].to_numpy() if 'MainGroup' in self.df.columns else None,
+            promo=is_promo
+        )
+        
+        return seasonal_info['factor'].to_numpy()
+    
     def segment_products(self):
         """Ürünleri segmentlere ayır"""
         
@@ -139,58 +155,28 @@ class AnalyticsEngine:
         if 'velocity_score' not in self.df.columns:
             self.calculate_all_metrics()
         
-        # Default segment
-        self.df['segment'] = 'UNCLASSIFIED'
+        # Kurallar öncelik sırasıyla uygulanır (bkz. modules/segment_rules.py)
+        rules = resolve_segment_rules(self.segment_params)
+        columns = {col: self.df[col].to_numpy() for col in SEGMENT_RULE_COLUMNS}
         
-        # HOT segment
-        hot_params = self.segment_params['HOT']
-        hot_mask = (
-            (self.df['velocity_score'] > hot_params.get('velocity_min', 1.5)) &
-            (self.df['trend_score'] > hot_params.get('trend_min', 1.3)) &
-            (self.df['daily_sales_avg_7d'] > hot_params.get('daily_sales_min', 15))
-        )
-        self.df.loc[hot_mask, 'segment'] = 'HOT'
-        
-        # RISING_STAR segment
-        rising_params = self.segment_params['RISING_STAR']
-        rising_mask = (
-            (self.df['velocity_score'] > rising_params.get('velocity_min', 1.2)) &
-            (self.df['velocity_score'] <= rising_params.get('velocity_max', 1.5)) &
-            (self.df['trend_score'] > rising_params.get('trend_min', 1.2)) &
-            (self.df['engagement_score'] > rising_params.get('engagement_min', 5))
-        )
-        self.df.loc[rising_mask & (self.df['segment'] == 'UNCLASSIFIED'), 'segment'] = 'RISING_STAR'
-        
-        # STEADY segment
-        steady_params = self.segment_params['STEADY']
-        steady_mask = (
-            (self.df['velocity_score'] >= steady_params.get('velocity_min', 0.8)) &
-            (self.df['velocity_score'] <= steady_params.get('velocity_max', 1.2)) &
-            (self.df['daily_sales_avg_30d'] > steady_params.get('daily_sales_min', 5)) &
-            (self.df['stock_out_days_last_30d'] < steady_params.get('stockout_max', 3))
-        )
-        self.df.loc[steady_mask & (self.df['segment'] == 'UNCLASSIFIED'), 'segment'] = 'STEADY'
-        
-        # SLOW segment
-        slow_params = self.segment_params['SLOW']
-        slow_mask = (
-            (self.df['daily_sales_avg_7d'] < slow_params.get('daily_sales_max', 5)) &
-            (self.df['daily_sales_avg_7d'] > 0) &
-            (self.df['velocity_score'] >= slow_params.get('velocity_min', 0.5))
-        )
-        self.df.loc[slow_mask & (self.df['segment'] == 'UNCLASSIFIED'), 'segment'] = 'SLOW'
+        def clause_mask(column, op, threshold):
+            return RULE_OPERATORS[op](columns[column], threshold)
         
-        # DYING segment
-        dying_params = self.segment_params['DYING']
-        dying_mask = (
-            (self.df['velocity_score'] < dying_params.get('velocity_max', 0.5)) |
-            (self.df['days_of_stock'] > dying_params.get('stock_days_min', 60))
+        codes = assign_segment_codes(
+            (
+                (segment, combine_clauses(combine, clauses, clause_mask))
+                for segment, (combine, clauses) in rules.items()
+            ),
+            len(self.df)
         )
-        self.df.loc[dying_mask & (self.df['segment'] == 'UNCLASSIFIED'), 'segment'] = 'DYING'
         
-        # Segmentleri dictionary'e kaydet
-        for segment_name in ['HOT', 'RISING_STAR', 'STEADY', 'SLOW', 'DYING', 'UNCLASSIFIED']:
-            self.segments[segment_name] = self.df[self.df['segment'] == segment_name].copy()
+        # Segment kolonu categorical olarak tutulur
+        self.df['segment'] = pd.Categorical.from_codes(codes, categories=SEGMENT_NAMES)
+        
+        # Segment üyeliklerini indeksle (segment DataFrame'leri erişimde oluşur)
+        self.segments = SegmentIndex(self.df)
+        self._segment_summary = None
+        self._rollup_cube = None
         
         return self.df
     
@@ -200,54 +186,73 @@ class AnalyticsEngine:
         if 'segment' not in self.df.columns:
             self.segment_products()
         
-        summary = []
-        
-        for segment_name, segment_df in self.segments.items():
-            if len(segment_df) > 0:
-                summary.append({
-                    'segment': segment_name,
-                    'count': len(segment_df),
-                    'total_stock': segment_df['total_stock'].sum(),
-                    'stock_value': (segment_df['total_stock'] * segment_df['price']).sum(),
-                    'avg_velocity': segment_df['velocity_score'].mean(),
-                    'avg_trend': segment_df['trend_score'].mean(),
-                    'total_daily_sales': segment_df['daily_sales_avg_7d'].sum(),
-                    'avg_days_of_stock': segment_df['days_of_stock'].mean(),
-                    'avg_final_score': segment_df['final_score'].mean()
-                })
-        
-        return pd.DataFrame(summary)
+        # Özet, segmentler değişene kadar saklanır (rescore sadece skoru günceller)
+        if self._segment_summary is not None:
+            return self._segment_summary.copy()
+        
+        # Tek groupby ile tüm segmentler (boş segmentler atlanır)
+        values = pd.DataFrame({
+            'sku': self.df['sku'],
+            'total_stock': self.df['total_stock'],
+            'stock_value': self.df['total_stock'] * self.df['price'],
+            'velocity_score': self.df['velocity_score'],
+            'trend_score': self.df['trend_score'],
+            'daily_sales_avg_7d': self.df['daily_sales_avg_7d'],
+            'days_of_stock': self.df['days_of_stock'],
+            'final_score': self.df['final_score']
+        })
+        
+        summary = values.groupby(self.df['segment'], observed=True).agg(
+            count=('sku', 'size'),
+            total_stock=('total_stock', 'sum'),
+            stock_value=('stock_value', 'sum'),
+            avg_velocity=('velocity_score', 'mean'),
+            avg_trend=('trend_score', 'mean'),
+            total_daily_sales=('daily_sales_avg_7d', 'sum'),
+            avg_days_of_stock=('days_of_stock', 'mean'),
+            avg_final_score=('final_score', 'mean')
+        ).reset_index()
+        
+        summary['segment'] = summary['segment'].astype(str)
+        self._segment_summary = summary
+        
+        return summary.copy()
     
-    def get_category_performance(self):
-        """Kategori bazlı performans analizi"""
+    def get_rollup_cube(self):
+        """
+        Kategori / ana grup / alt grup / segment özet küpü
         
+        Küp analiz başına bir kez oluşur; metrikler, segmentler veya
+        skorlar değişince yeniden oluşturulur.
+        
+        Returns:
+            RollupCube: Tüm boyut kombinasyonları için özetler
+        """
         if 'segment' not in self.df.columns:
             self.segment_products()
         
-        category_perf = self.df.groupby('category').agg({
-            'sku': 'count',
-            'total_stock': 'sum',
-            'daily_sales_avg_7d': 'sum',
-            'price': 'mean',
-            'velocity_score': 'mean',
-            'final_score': 'mean',
-            'days_of_stock': 'mean'
-        }).reset_index()
-        
-        category_perf.columns = [
-            'category', 'product_count', 'total_stock', 'daily_sales',
-            'avg_price', 'avg_velocity', 'avg_score', 'avg_stock_days'
-        ]
+        if self._rollup_cube is None:
+            self._rollup_cube = RollupCube(self.df)
         
-        # Stok değeri hesapla
-        category_value = self.df.groupby('category').apply(
-            lambda x: (x['total_stock'] * x['price']).sum()
-        ).reset_index()
-        category_value.columns = ['category', 'stock_value']
+        return self._rollup_cube
+    
+    def get_category_performance(self):
+        """Kategori bazlı performans analizi (rollup cube'dan)"""
         
-        category_perf = category_perf.merge(category_value, on='category')
+        category_perf = self.get_rollup_cube().query(by=['category'])
+        category_perf = category_perf[category_perf['category'].notna()]
         
-        return category_perf
+        category_perf = category_perf.rename(columns={
+            'daily_sales_avg_7d': 'daily_sales',
+            'avg_velocity_score': 'avg_velocity',
+            'avg_final_score': 'avg_score',
+            'avg_days_of_stock': 'avg_stock_days'
+        })
+        
+        return category_perf[[
+            'category', 'product_count', 'total_stock', 'daily_sales',
+            'avg_price', 'avg_velocity', 'avg_score', 'avg_stock_days', 'stock_value'
+        ]].reset_index(drop=True)
     
     def get_top_performers(self, n=10, metric='final_score'):
         """En iyi performans gösteren ürünler"""
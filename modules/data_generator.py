@@ -0,0 +1,479 @@
+"""
+Data Generator - Yük testi için sentetik katalog ve haftalık satış geçmişi
+
+Katalog sample_data.csv şemasında, geçmiş historical_sales.csv düzenindedir.
+Ürünler hedef segment dağılımına göre profillenir (HOT, RISING_STAR, ...);
+satışlar çarpık (lognormal), stoklar Akyazı / Ana Depo / OMS arasında
+bölünmüş, geçmiş satışlar MainGroupCode / SubGroupCode mevsimselliği ve
+kampanya etkisi taşır.
+
+Üretim parça parça ve vektöreldir: her parça kendi seed'inden (seed,
+akış, parça no) üretilir, böylece aynı seed ve parça boyutu aynı veriyi
+verir ve dosyaya yazım tüm veriyi bellekte tutmadan yapılır.
+"""
+import os
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from utils.columnar import detect_format
+
+# Streaming yazım (opsiyonel - pyarrow gerekli; CSV için pandas'a düşülür)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Parça başına çıktı satırı (katalogda ürün; geçmişte ürün x hafta satırı,
+# yani geçmiş parçası GENERATOR_CHUNK_ROWS / hafta sayısı kadar ürün içerir)
+GENERATOR_CHUNK_ROWS = 100_000
+
+# Katalog kolonları (sample_data.csv sırası)
+CATALOG_LAYOUT_COLUMNS = [
+    'sku', 'product_name', 'category', 'maingroupcode', 'SubGroupcode', 'tip',
+    'price', 'margin_pct', 'stock_akyazi', 'stock_ana_depo', 'stock_oms_total',
+    'daily_sales_avg_30d', 'daily_sales_avg_7d', 'daily_sales_yesterday',
+    'view_count_7d', 'add_to_cart_7d', 'favorites_7d', 'review_count', 'avg_rating',
+    'stock_out_days_last_30d', 'last_restock_date', 'campaign_flag'
+]
+
+# Geçmiş kolonları (historical_sales.csv sırası)
+HISTORY_LAYOUT_COLUMNS = [
+    'Sku', 'MainGroupCode', 'SubGroupCode', 'year', 'week', 'sales', 'stock',
+    'gross_margin', 'promo'
+]
+
+# Geçmiş üretiminde kullanılan katalog kolonları (bkz. history_for)
+HISTORY_INPUT_COLUMNS = [
+    'sku', 'maingroupcode', 'SubGroupcode', 'daily_sales_avg_30d', 'margin_pct', 'campaign_flag'
+]
+
+# historical_sales.csv kolonları -> SeasonalForecaster kolonları
+FORECASTER_COLUMN_NAMES = {'Sku': 'sku', 'MainGroupCode': 'MainGroup', 'SubGroupCode': 'SubGroupDesc'}
+
+# (category, maingroupcode, SubGroupcode, ürün adı öneki, ebat, mevsimsellik genliği)
+CATALOG_HIERARCHY = [
+    ('Tekstil', 'CARSAF', 'LASTIKLI', 'Lastikli Çarşaf', '160x200', 0.20),
+    ('Tekstil', 'CARSAF', 'PIKE', 'Pike Çarşaf', '180x200', 0.35),
+    ('Tekstil', 'NEVRESIM', 'TEKLI', 'Tek Kişilik Nevresim', '160x220', 0.25),
+    ('Tekstil', 'NEVRESIM', 'CIFT', 'Çift Kişilik Nevresim', '200x220', 0.30),
+    ('Ev Tekstili', 'HAVLU', 'BANYO', 'Banyo Havlusu', '70x140', 0.15),
+    ('Ev Tekstili', 'HAVLU', 'PLAJ', 'Plaj Havlusu', '90x170', 0.80),
+    ('Ev Tekstili', 'BORNOZ', 'KADIN', 'Kadın Bornoz', 'M', 0.45),
+    ('Ev Tekstili', 'BORNOZ', 'ERKEK', 'Erkek Bornoz', 'L', 0.40)
+]
+
+# MainGroupCode -> satışların tepe yaptığı hafta
+MAINGROUP_PEAK_WEEK = {'CARSAF': 38, 'NEVRESIM': 45, 'HAVLU': 27, 'BORNOZ': 2}
+
+COLORS = [
+    'Beyaz', 'Mavi', 'Gri', 'Pembe', 'Lacivert', 'Bej', 'Ekru', 'Yeşil',
+    'Mor', 'Turuncu', 'Siyah', 'Krem', 'Bordo', 'Füme'
+]
+
+# Hedef segment dağılımı ve profil parametreleri:
+# pay, 30 günlük satış medyanı, velocity (7g/30g) aralığı, trend (dün/7g) aralığı,
+# stok gün aralığı, sepet oranı (sepet/görüntüleme) aralığı, kampanya olasılığı
+SEGMENT_PROFILES = {
+    'HOT': (0.05, 14.0, (1.6, 2.4), (1.35, 1.9), (3, 20), (0.08, 0.20), 0.50),
+    'RISING_STAR': (0.10, 6.0, (1.25, 1.5), (1.25, 1.6), (5, 25), (0.06, 0.18), 0.35),
+    'STEADY': (0.30, 10.0, (0.85, 1.15), (0.8, 1.2), (10, 45), (0.03, 0.10), 0.15),
+    'SLOW': (0.35, 2.0, (0.6, 1.1), (0.5, 1.5), (15, 50), (0.01, 0.06), 0.10),
+    'DYING': (0.20, 3.0, (0.1, 0.45), (0.0, 0.8), (70, 200), (0.005, 0.03), 0.10)
+}
+
+# Toplam stoğun depolara bölünmesi (Dirichlet ağırlıkları: Akyazı, Ana Depo, OMS)
+DEPOT_SPLIT_ALPHA = [2.0, 5.0, 3.0]
+
+# Katalogun "bugün"ü (son stok girişi tarihleri buna göre)
+CATALOG_AS_OF = '2024-10-31'
+
+DEFAULT_HISTORY_YEARS = (2023, 2024)
+WEEKS_PER_YEAR = 52
+
+# Rastgele akışlar (aynı parça no'su için katalog ve geçmiş bağımsız)
+_CATALOG_STREAM = 0
+_HISTORY_STREAM = 1
+
+
+def iter_catalog(rows, seed=42, chunk_rows=GENERATOR_CHUNK_ROWS):
+    """
+    Sentetik katalog parçaları
+
+    Args:
+        rows: Toplam ürün sayısı
+        seed: Rastgelelik seed'i
+        chunk_rows: Parça başına ürün
+
+    Yields:
+        pd.DataFrame: sample_data.csv şemasında katalog parçası
+    """
+    for index, start in enumerate(range(0, rows, chunk_rows)):
+        rng = np.random.default_rng([seed, _CATALOG_STREAM, index])
+        yield _catalog_chunk(rng, start, min(chunk_rows, rows - start))
+
+
+def generate_catalog(rows, seed=42, chunk_rows=GENERATOR_CHUNK_ROWS):
+    """Tüm sentetik katalog tek DataFrame olarak (bkz. iter_catalog)"""
+    chunks = list(iter_catalog(rows, seed, chunk_rows))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _catalog_chunk(rng, start, rows):
+    """Tek katalog parçası (SKU numaraları start'tan başlar)"""
+    profiles = list(SEGMENT_PROFILES.values())
+    shares = np.array([profile[0] for profile in profiles])
+    profile = rng.choice(len(profiles), rows, p=shares / shares.sum())
+
+    def by_profile(field):
+        return np.array([p[field] for p in profiles])[profile]
+
+    def uniform_by_profile(field):
+        bounds = np.array([p[field] for p in profiles], dtype='float64')[profile]
+        return rng.uniform(bounds[:, 0], bounds[:, 1])
+
+    # Çarpık satış: profil medyanı etrafında lognormal
+    sales_30d = by_profile(1) * rng.lognormal(0.0, 0.5, rows)
+    sales_7d = sales_30d * uniform_by_profile(2)
+    sales_yesterday = np.round(sales_7d * uniform_by_profile(3))
+
+    # Stok: stok günü x 7 günlük satış, depolara Dirichlet ile bölünür
+    total_stock = np.round(np.maximum(sales_7d, 0.5) * uniform_by_profile(4))
+    split = rng.dirichlet(DEPOT_SPLIT_ALPHA, rows)
+    stock_akyazi = np.floor(total_stock * split[:, 0])
+    stock_ana_depo = np.floor(total_stock * split[:, 1])
+    stock_oms = total_stock - stock_akyazi - stock_ana_depo
+
+    # Görüntüleme -> sepet (profil sepet oranıyla) -> favori
+    views = rng.poisson(np.maximum(sales_7d, 0.2) * 7 * rng.uniform(5, 40, rows))
+    add_to_cart = rng.binomial(views, uniform_by_profile(5))
+    favorites = rng.binomial(views, 0.03)
+
+    group = rng.integers(0, len(CATALOG_HIERARCHY), rows)
+    color = rng.integers(0, len(COLORS), rows)
+    hierarchy = list(zip(*CATALOG_HIERARCHY))
+    names = np.array([
+        f"{prefix} {c} {size}" for prefix, size in zip(hierarchy[3], hierarchy[4]) for c in COLORS
+    ], dtype=object)
+
+    review_count = np.minimum(rng.geometric(0.02, rows) - 1, 5000)
+    restock_days = rng.integers(0, 120, rows).astype('timedelta64[D]')
+
+    return pd.DataFrame({
+        'sku': 'SKU' + pd.Series(np.arange(start, start + rows)).astype(str).str.zfill(8),
+        'product_name': names[group * len(COLORS) + color],
+        'category': np.array(hierarchy[0], dtype=object)[group],
+        'maingroupcode': np.array(hierarchy[1], dtype=object)[group],
+        'SubGroupcode': np.array(hierarchy[2], dtype=object)[group],
+        'tip': np.where(rng.random(rows) < 0.3, 1, 2),
+        'price': np.round(rng.lognormal(np.log(170), 0.4, rows), 2),
+        'margin_pct': np.round(rng.normal(42, 4, rows).clip(15, 70), 1),
+        'stock_akyazi': stock_akyazi.astype('int64'),
+        'stock_ana_depo': stock_ana_depo.astype('int64'),
+        'stock_oms_total': stock_oms.astype('int64'),
+        'daily_sales_avg_30d': np.round(sales_30d, 1),
+        'daily_sales_avg_7d': np.round(sales_7d, 1),
+        'daily_sales_yesterday': sales_yesterday.astype('int64'),
+        'view_count_7d': views,
+        'add_to_cart_7d': add_to_cart,
+        'favorites_7d': favorites,
+        'review_count': review_count,
+        'avg_rating': np.round(rng.beta(8, 2, rows) * 4 + 1, 1),
+        'stock_out_days_last_30d': np.minimum(rng.poisson(np.where(profile == 2, 0.5, 2.0)), 30),
+        'last_restock_date': np.datetime64(CATALOG_AS_OF, 'ns') - restock_days,
+        'campaign_flag': (rng.random(rows) < by_profile(6)).astype('int64')
+    })
+
+
+def seasonal_curves():
+    """
+    SubGroupCode x hafta mevsimsellik çarpanları
+
+    Alt grup, ana grubunun tepe haftasını kullanır ve kendi genliğiyle
+    salınır (ortalaması 1).
+
+    Returns:
+        np.ndarray: (alt grup sayısı x 52) çarpan matrisi (CATALOG_HIERARCHY sırası)
+    """
+    weeks = np.arange(1, WEEKS_PER_YEAR + 1)
+    peaks = np.array([MAINGROUP_PEAK_WEEK[row[1]] for row in CATALOG_HIERARCHY])
+    amplitudes = np.array([row[5] for row in CATALOG_HIERARCHY])
+    phase = 2 * np.pi * (weeks[None, :] - peaks[:, None]) / WEEKS_PER_YEAR
+    return 1 + amplitudes[:, None] * np.cos(phase)
+
+
+def history_for(catalog, years=DEFAULT_HISTORY_YEARS, seed=42, chunk_index=0):
+    """
+    Katalog (parçası) için haftalık satış geçmişi
+
+    Her ürünün haftalık beklenen satışı: 30 günlük ortalama x 7 x alt grup
+    mevsimselliği x yıllık büyüme x kampanya etkisi; satış Poisson'dur ve
+    stoksuz haftalarda sıfırdır. Sku / grup kolonları categorical'dır
+    (milyonlarca satırda metin kopyası oluşmaz).
+
+    Args:
+        catalog: Katalog (sku, maingroupcode, SubGroupcode, daily_sales_avg_30d,
+            margin_pct, campaign_flag kolonları yeterli)
+        years: Geçmiş yılları
+        seed: Rastgelelik seed'i
+        chunk_index: Geçmiş parçası no (bkz. iter_history; aynı no aynı veriyi üretir)
+
+    Returns:
+        pd.DataFrame: historical_sales.csv düzeninde, Sku / year / week sıralı
+    """
+    rng = np.random.default_rng([seed, _HISTORY_STREAM, chunk_index])
+    n = len(catalog)
+    years = np.asarray(years)
+    periods = len(years) * WEEKS_PER_YEAR
+    week = np.tile(np.arange(1, WEEKS_PER_YEAR + 1), len(years))
+    year_index = np.repeat(np.arange(len(years)), WEEKS_PER_YEAR)
+
+    subgroups = pd.Index([row[2] for row in CATALOG_HIERARCHY])
+    curve_row = subgroups.get_indexer(catalog['SubGroupcode'].astype(str))
+    curves = np.vstack([seasonal_curves(), np.ones((1, WEEKS_PER_YEAR))])  # -1 -> düz
+
+    # Tek uniform matris: alt uç kampanya, üst %3 stoksuz hafta
+    draw = rng.random((n, periods), dtype=np.float32)
+    promo = draw < np.where(catalog['campaign_flag'].to_numpy() == 1, 0.25, 0.08)[:, None]
+    stockout = draw > 0.97
+
+    # Ürün x hafta beklenen satış
+    base = catalog['daily_sales_avg_30d'].to_numpy(dtype='float64') * 7
+    growth = rng.uniform(0.9, 1.25, n)[:, None] ** (year_index - (len(years) - 1))
+    expected = (
+        base[:, None] * curves[curve_row][:, week - 1] * growth * np.where(promo, 1.6, 1.0)
+    )
+
+    # Stok: ürün bazlı 1-8 haftalık kapsama
+    stock = np.rint(expected * rng.uniform(1, 8, (n, 1))).astype('int64')
+    stock[stockout] = 0
+    sales = np.minimum(rng.poisson(expected), stock)
+
+    margin = catalog['margin_pct'].to_numpy(dtype='float64')[:, None]
+    gross_margin = (
+        margin - promo * rng.uniform(5, 12, (n, 1)) +
+        rng.standard_normal((n, periods), dtype=np.float32)
+    )
+
+    rows = np.repeat(np.arange(n), periods)
+    return pd.DataFrame({
+        'Sku': _repeat_categorical(catalog['sku'], rows),
+        'MainGroupCode': _repeat_categorical(catalog['maingroupcode'], rows),
+        'SubGroupCode': _repeat_categorical(catalog['SubGroupcode'], rows),
+        'year': np.tile(years[year_index], n),
+        'week': np.tile(week, n),
+        'sales': sales.ravel(),
+        'stock': stock.ravel(),
+        'gross_margin': np.round(gross_margin, 1).ravel(),
+        'promo': promo.ravel().astype('int64')
+    })
+
+
+def _repeat_categorical(values, rows):
+    """values[rows] categorical olarak (metinler bir kez tutulur)"""
+    codes, uniques = pd.factorize(values)
+    return pd.Categorical.from_codes(codes[rows], categories=uniques)
+
+
+def history_chunk_skus(chunk_rows=GENERATOR_CHUNK_ROWS, years=DEFAULT_HISTORY_YEARS):
+    """Yaklaşık chunk_rows geçmiş satırı veren parça başına ürün sayısı"""
+    return max(1, chunk_rows // (len(years) * WEEKS_PER_YEAR))
+
+
+def iter_history(catalog, years=DEFAULT_HISTORY_YEARS, seed=42, chunk_rows=GENERATOR_CHUNK_ROWS):
+    """
+    Bellekteki katalog için geçmiş parçaları
+
+    Parça boyutu çıktı satırıyla sınırlıdır: parça başına
+    history_chunk_skus(chunk_rows, years) ürün (~chunk_rows satır).
+    Parça no katalogdaki konumdan gelir; write_dataset aynı veriyi yazar.
+
+    Yields:
+        pd.DataFrame: historical_sales.csv düzeninde geçmiş parçası
+    """
+    skus = history_chunk_skus(chunk_rows, years)
+    for index, start in enumerate(range(0, len(catalog), skus)):
+        yield history_for(catalog.iloc[start:start + skus], years, seed, index)
+
+
+def generate_history(catalog, years=DEFAULT_HISTORY_YEARS, seed=42,
+                     chunk_rows=GENERATOR_CHUNK_ROWS):
+    """
+    Tüm geçmiş tek DataFrame olarak (bkz. iter_history)
+
+    Parçaların categorical kolonları kategorileri birleştirilerek
+    categorical kalır (pd.concat farklı kategorilerde metne döner).
+    """
+    chunks = list(iter_history(catalog, years, seed, chunk_rows))
+    if len(chunks) == 1:
+        return chunks[0]
+
+    columns = chunks[0].columns
+    categorical = [col for col in columns if isinstance(chunks[0][col].dtype, pd.CategoricalDtype)]
+    merged = {
+        col: union_categoricals([chunk[col] for chunk in chunks]) for col in categorical
+    }
+    history = pd.concat(
+        [chunk.drop(columns=categorical) for chunk in chunks], ignore_index=True
+    )
+    del chunks
+    return history.assign(**merged)[columns]
+
+
+def _regroup(chunks, rows):
+    """
+    Katalog parçalarını rows ürünlük ardışık parçalara yeniden böl
+
+    Sadece HISTORY_INPUT_COLUMNS tutulur; parçalar arasında en fazla
+    rows - 1 ürün bekler.
+    """
+    pending = None
+    for chunk in chunks:
+        chunk = chunk[HISTORY_INPUT_COLUMNS]
+        if pending is not None:
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+        full = len(chunk) - len(chunk) % rows
+        for start in range(0, full, rows):
+            yield chunk.iloc[start:start + rows]
+        pending = chunk.iloc[full:] if full < len(chunk) else None
+
+    if pending is not None:
+        yield pending
+
+
+def write_dataset(rows, catalog_path=None, history_path=None, years=DEFAULT_HISTORY_YEARS,
+                  seed=42, chunk_rows=GENERATOR_CHUNK_ROWS,
+                  history_chunk_rows=GENERATOR_CHUNK_ROWS):
+    """
+    Katalog ve geçmişi parça parça üretip dosyalara yaz
+
+    Bellekte aynı anda bir katalog parçası (chunk_rows ürün) ve bir geçmiş
+    parçası (~history_chunk_rows satır) tutulur; geçmiş, katalog
+    parçalarından bağımsız olarak çıktı satırına göre bölünür; sonuç
+    generate_history(generate_catalog(rows, seed, chunk_rows), years, seed,
+    history_chunk_rows) ile aynıdır.
+    Çıktı formatı uzantıdan bulunur (.csv, .parquet, .feather / .arrow).
+
+    Args:
+        rows: Ürün sayısı
+        catalog_path: Katalog dosyası (None = yazılmaz)
+        history_path: Geçmiş dosyası (None = üretilmez)
+        chunk_rows: Katalog parçası başına ürün
+        history_chunk_rows: Geçmiş parçası başına satır
+
+    Returns:
+        tuple: (katalog satır sayısı, geçmiş satır sayısı)
+    """
+    catalog_writer = FrameWriter(catalog_path) if catalog_path else None
+    history_writer = FrameWriter(history_path) if history_path else None
+    catalog_rows = 0
+
+    def catalog_chunks():
+        nonlocal catalog_rows
+        for chunk in iter_catalog(rows, seed, chunk_rows):
+            catalog_rows += len(chunk)
+            if catalog_writer:
+                catalog_writer.write(chunk)
+            yield chunk
+
+    try:
+        if history_writer:
+            skus = history_chunk_skus(history_chunk_rows, years)
+            for index, batch in enumerate(_regroup(catalog_chunks(), skus)):
+                history_writer.write(history_for(batch, years, seed, index))
+        else:
+            for _ in catalog_chunks():
+                pass
+    finally:
+        for writer in (catalog_writer, history_writer):
+            if writer:
+                writer.close()
+
+    return catalog_rows, history_writer.rows if history_writer else 0
+
+
+class FrameWriter:
+    """DataFrame parçalarını tek dosyaya ekleyerek yazan streaming yazıcı"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Çıktı dosyası (.csv, .parquet, .feather / .arrow); pyarrow
+                yoksa sadece CSV (pandas ile)
+        """
+        self.path = path
+        self.format = detect_format(path)
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+        self._sink = None
+
+        if self.format != 'csv' and not ARROW_AVAILABLE:
+            raise ImportError("Parquet/Arrow yazımı için pyarrow gerekli")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, frame):
+        """Parçayı dosyaya ekle (ilk parça şemayı / başlığı belirler)"""
+        if not ARROW_AVAILABLE:
+            frame.to_csv(
+                self.path, mode='a' if self.rows else 'w', header=not self.rows,
+                index=False, encoding='utf-8'
+            )
+            self.rows += len(frame)
+            return
+
+        table = self._file_table(pa.Table.from_pandas(frame, preserve_index=False))
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open(table.schema)
+        else:
+            table = table.cast(self._schema)
+
+        self._writer.write_table(table)
+        self.rows += len(frame)
+
+    def _file_table(self, table):
+        """
+        Tabloyu dosya formatına uygun tiplere çevir
+
+        CSV'de timestamp'ler tarih olarak (sample_data.csv gibi YYYY-MM-DD),
+        Arrow IPC dosyasında categorical kolonlar düz metin olarak yazılır
+        (IPC dosyasında parçalar arası farklı sözlük tutulamaz).
+        """
+        for i, field in enumerate(table.schema):
+            if self.format == 'csv' and pa.types.is_timestamp(field.type):
+                table = table.set_column(i, field.name, table.column(i).cast(pa.date32()))
+            elif self.format == 'arrow' and pa.types.is_dictionary(field.type):
+                table = table.set_column(
+                    i, field.name, table.column(i).cast(field.type.value_type)
+                )
+        return table
+
+    def _open(self, schema):
+        if self.format == 'parquet':
+            return pq.ParquetWriter(self.path, schema)
+        if self.format == 'arrow':
+            return pa.ipc.new_file(self.path, schema)
+
+        # Başlık pyarrow'da her zaman tırnaklı yazıldığı için elle yazılır
+        self._sink = pa.OSFile(self.path, 'wb')
+        self._sink.write((','.join(schema.names) + '\n').encode('utf-8'))
+        return pa_csv.CSVWriter(
+            self._sink, schema,
+            write_options=pa_csv.WriteOptions(include_header=False, quoting_style='none')
+        )
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
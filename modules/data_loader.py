@@ -1,58 +1,211 @@
 """
 Veri Yükleme ve Validasyon Modülü
 """
+import json
+import os
+import numpy as np
 import pandas as pd
-import streamlit as st
-from utils.constants import REQUIRED_COLUMNS, OPTIONAL_COLUMNS
-from utils.helpers import show_error, show_success, show_warning
+from modules.filter_engine import FilterEngine, compile_filters
+from modules.search_index import SearchIndex
+from utils.cache import cache_path, file_fingerprint
+from utils.columnar import detect_format, read_columnar
+from utils.constants import (
+    REQUIRED_COLUMNS, OPTIONAL_COLUMNS, NUMERIC_COLUMNS, CATALOG_CSV_DTYPES,
+    CATALOG_COLUMNS, CACHE_DIR, CATALOG_CACHE_VERSION, SAMPLE_DATA_PATH
+)
+from utils.helpers import apply_dtype_plan, memory_usage_bytes
+
+# Parquet cache (opsiyonel - pyarrow gerekli)
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
 
 class DataLoader:
-    """CSV verisi yükleme ve validasyon sınıfı"""
+    """CSV / Parquet / Arrow verisi yükleme ve validasyon sınıfı"""
     
-    def __init__(self):
+    def __init__(self, cache_dir=CACHE_DIR, search_index=False):
+        """
+        Args:
+            cache_dir: İşlenmiş katalog cache klasörü (None = cache kapalı)
+            search_index: Arama index'i yüklemede oluşturulsun mu (arama kutusu);
+                False ise ilk get_search_index çağrısında oluşur
+        """
         self.df = None
         self.validation_errors = []
         self.validation_warnings = []
+        self.cache_dir = cache_dir if PARQUET_AVAILABLE else None
+        self.memory_report = None
+        # Yükleme mesajları: (seviye, mesaj); arayüz veya CLI gösterir
+        self.messages = []
+        # SKU / ürün adı arama index'i (self.df'e bağlı; arama yapılmazsa
+        # hiç oluşturulmaz)
+        self.build_search_index = search_index
+        self.search_index = None
+        self._search_index_df = None
+        self.filter_engine = None
     
-    def load_from_file(self, uploaded_file):
+    def load_from_file(self, uploaded_file, chunksize=None):
         """
         Yüklenen dosyadan veri oku
         
         Args:
-            uploaded_file: Streamlit file uploader object
+            uploaded_file: Streamlit file uploader object (.csv, .parquet, .feather, .arrow)
+            chunksize: Verilirse CSV bu kadar satırlık parçalarla (streaming) okunur
+                (columnar dosyalarda kullanılmaz)
             
         Returns:
             pd.DataFrame veya None
         """
         try:
-            self.df = pd.read_csv(uploaded_file)
-            show_success(f"✅ Dosya yüklendi: {len(self.df)} ürün")
-            
-            # Validasyon yap
-            if self.validate_data():
-                return self.preprocess_data()
-            else:
-                return None
+            return self._load_catalog(uploaded_file, "Dosya yüklendi", chunksize=chunksize)
                 
         except Exception as e:
-            show_error(f"Dosya yükleme hatası: {str(e)}")
+            self._notify('error', f"Dosya yükleme hatası: {str(e)}")
             return None
     
     def load_sample_data(self):
         """Örnek veriyi yükle"""
         try:
-            self.df = pd.read_csv('data/sample_data.csv')
-            show_success(f"✅ Örnek veri yüklendi: {len(self.df)} ürün")
-            
-            if self.validate_data():
-                return self.preprocess_data()
-            else:
-                return None
+            return self._load_catalog(SAMPLE_DATA_PATH, "Örnek veri yüklendi")
                 
         except Exception as e:
-            show_error(f"Örnek veri yükleme hatası: {str(e)}")
+            self._notify('error', f"Örnek veri yükleme hatası: {str(e)}")
             return None
     
+    def _notify(self, level, message):
+        """Mesajı biriktir (seviye: 'success', 'warning', 'error')"""
+        self.messages.append((level, message))
+    
+    def _load_catalog(self, source, success_label, chunksize=None):
+        """
+        Katalog dosyasını oku, validasyon ve preprocess yap
+        
+        Aynı içerik daha önce işlendiyse temizlenmiş veri cache'ten okunur,
+        parse ve validasyon adımları atlanır. Parquet/Arrow dosyalarından
+        sadece CATALOG_COLUMNS okunur.
+        
+        Args:
+            source: Dosya yolu veya file-like obje
+            success_label: Başarı mesajı başlığı
+            chunksize: Verilirse streaming (parça parça) okuma yapılır
+            
+        Returns:
+            pd.DataFrame veya None
+        """
+        fingerprint = None
+        if self.cache_dir:
+            fingerprint = file_fingerprint(source, extra=self._cache_key_config())
+            if self._load_cached_catalog(fingerprint):
+                if self.df is None:
+                    return None
+                self._notify('success', f"✅ {success_label}: {len(self.df)} ürün (cache)")
+                if self.build_search_index:
+                    self.get_search_index()
+                return self.df
+        
+        file_format = detect_format(source)
+        
+        if file_format != 'csv':
+            # Columnar: sadece kullanılan kolonlar okunur (projection)
+            self.df = read_columnar(source, CATALOG_COLUMNS, file_format)
+            self._notify('success', f"✅ {success_label}: {len(self.df)} ürün")
+            is_valid = self.validate_data()
+        elif chunksize:
+            # Streaming: validasyon her parçada okuma sırasında yapılır
+            is_valid = self._read_csv_streaming(source, chunksize)
+            if self.df is not None:
+                self._notify('success', f"✅ {success_label}: {len(self.df)} ürün")
+        else:
+            self.df = pd.read_csv(source)
+            self._notify('success', f"✅ {success_label}: {len(self.df)} ürün")
+            
+            # Validasyon yap
+            is_valid = self.validate_data()
+        
+        df = self.preprocess_data() if is_valid else None
+        
+        if fingerprint:
+            self._save_cached_catalog(fingerprint, df)
+        
+        if df is not None and self.build_search_index:
+            self.get_search_index()
+        
+        return df
+    
+    @staticmethod
+    def _cache_key_config():
+        """Cache anahtarına giren loader versiyonu ve kolon konfigürasyonu"""
+        return (
+            CATALOG_CACHE_VERSION,
+            tuple(REQUIRED_COLUMNS),
+            tuple(sorted(OPTIONAL_COLUMNS.items())),
+            tuple(CATALOG_COLUMNS)
+        )
+    
+    def _load_cached_catalog(self, fingerprint):
+        """
+        İşlenmiş katalog ve validasyon mesajlarını cache'ten yükle
+        
+        Returns:
+            bool: Cache bulundu mu? (validasyon hatalı ise self.df None kalır)
+        """
+        meta_path = cache_path('catalog', fingerprint, '.json', self.cache_dir)
+        data_path = cache_path('catalog', fingerprint, '.parquet', self.cache_dir)
+        
+        if not os.path.exists(meta_path):
+            return False
+        
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            
+            if meta.get('version') != CATALOG_CACHE_VERSION:
+                return False
+            
+            df = pd.read_parquet(data_path) if meta['valid'] else None
+        except (OSError, ValueError, KeyError):
+            return False
+        
+        self.df = df
+        self.validation_warnings = meta['warnings']
+        self.validation_errors = meta['errors']
+        self.memory_report = meta.get('memory_report')
+        
+        # Validasyon mesajlarını ilk yüklemedeki gibi mesajlara ekle
+        for warning in self.validation_warnings:
+            self._notify('warning', warning)
+        for error in self.validation_errors:
+            self._notify('error', error)
+        
+        return True
+    
+    def _save_cached_catalog(self, fingerprint, df):
+        """İşlenmiş kataloğu (Parquet) ve validasyon mesajlarını (JSON) diske yaz"""
+        meta_path = cache_path('catalog', fingerprint, '.json', self.cache_dir)
+        data_path = cache_path('catalog', fingerprint, '.parquet', self.cache_dir)
+        
+        meta = {
+            'version': CATALOG_CACHE_VERSION,
+            'fingerprint': fingerprint,
+            'valid': df is not None,
+            'warnings': self.validation_warnings,
+            'errors': self.validation_errors,
+            'memory_report': self.memory_report if df is not None else None
+        }
+        
+        try:
+            # Önce veri, en son meta yazılır; meta yoksa cache yok sayılır
+            if df is not None:
+                df.to_parquet(f"{data_path}.tmp")
+                os.replace(f"{data_path}.tmp", data_path)
+            with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(f"{meta_path}.tmp", meta_path)
+        except (OSError, ValueError) as e:
+            self._notify('warning', f"Katalog cache yazılamadı: {e}")
+    
     def validate_data(self):
         """
         Veri validasyonu yap
@@ -68,10 +221,22 @@ class DataLoader:
             return False
         
         # Zorunlu kolonları kontrol et
-        missing_columns = []
-        for col in REQUIRED_COLUMNS:
-            if col not in self.df.columns:
-                missing_columns.append(col)
+        if not self._check_required_columns(self.df.columns):
+            return False
+        
+        stats = self._new_validation_stats()
+        self.df = self._coerce_chunk(self.df, stats)
+        
+        return self._finish_validation(stats)
+    
+    def _check_required_columns(self, columns):
+        """
+        Zorunlu kolonların varlığını kontrol et
+        
+        Returns:
+            bool: Tüm zorunlu kolonlar var mı?
+        """
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
         
         if missing_columns:
             self.validation_errors.append(
@@ -79,58 +244,139 @@ class DataLoader:
             )
             return False
         
+        return True
+    
+    @staticmethod
+    def _new_validation_stats():
+        """Chunk'lar boyunca biriktirilen validasyon istatistikleri"""
+        return {
+            'missing_optional': [],
+            'negative_columns': [],
+            'conversion_errors': [],
+            'null_counts': pd.Series(0, index=REQUIRED_COLUMNS, dtype='int64')
+        }
+    
+    def _coerce_chunk(self, chunk, stats):
+        """
+        Bir veri parçasında opsiyonel kolonları ekle, sayısal kolonları dönüştür
+        ve validasyon istatistiklerini güncelle
+        
+        Args:
+            chunk: Veri parçası (veya tüm veri)
+            stats: _new_validation_stats ile oluşturulan istatistikler
+            
+        Returns:
+            pd.DataFrame: Dönüştürülmüş parça
+        """
         # Opsiyonel kolonları kontrol et ve ekle
         for col, default_value in OPTIONAL_COLUMNS.items():
-            if col not in self.df.columns:
-                self.df[col] = default_value
-                self.validation_warnings.append(
-                    f"'{col}' kolonu bulunamadı, varsayılan değer ({default_value}) kullanılıyor"
-                )
+            if col not in chunk.columns:
+                chunk[col] = default_value
+                if col not in stats['missing_optional']:
+                    stats['missing_optional'].append(col)
         
         # Veri tipleri kontrolü
-        numeric_columns = [
-            'price', 'stock_akyazi', 'stock_ana_depo', 'stock_oms_total',
-            'daily_sales_avg_30d', 'daily_sales_avg_7d', 'daily_sales_yesterday'
-        ]
-        
-        for col in numeric_columns:
-            if col in self.df.columns:
+        for col in NUMERIC_COLUMNS:
+            if col in chunk.columns:
                 try:
-                    self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
+                    chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
                     
                     # Negatif değer kontrolü
-                    if (self.df[col] < 0).any():
-                        self.validation_warnings.append(
-                            f"'{col}' kolonunda negatif değerler var, 0 yapılıyor"
-                        )
-                        self.df[col] = self.df[col].clip(lower=0)
+                    if (chunk[col] < 0).any():
+                        if col not in stats['negative_columns']:
+                            stats['negative_columns'].append(col)
+                        chunk[col] = chunk[col].clip(lower=0)
                         
                 except Exception as e:
-                    self.validation_errors.append(
-                        f"'{col}' kolonu sayısal değere çevrilemedi: {str(e)}"
-                    )
-                    return False
+                    stats['conversion_errors'].append((col, str(e)))
         
         # Boş değer kontrolü
-        critical_nulls = self.df[REQUIRED_COLUMNS].isnull().sum()
+        stats['null_counts'] += chunk[REQUIRED_COLUMNS].isnull().sum()
+        
+        return chunk
+    
+    def _finish_validation(self, stats):
+        """
+        Biriken istatistiklerden uyarı/hata mesajlarını oluştur ve mesajlara ekle
+        
+        Returns:
+            bool: Validasyon başarılı mı?
+        """
+        for col in stats['missing_optional']:
+            self.validation_warnings.append(
+                f"'{col}' kolonu bulunamadı, varsayılan değer ({OPTIONAL_COLUMNS[col]}) kullanılıyor"
+            )
+        
+        if stats['conversion_errors']:
+            col, error = stats['conversion_errors'][0]
+            self.validation_errors.append(
+                f"'{col}' kolonu sayısal değere çevrilemedi: {error}"
+            )
+            return False
+        
+        for col in stats['negative_columns']:
+            self.validation_warnings.append(
+                f"'{col}' kolonunda negatif değerler var, 0 yapılıyor"
+            )
+        
+        critical_nulls = stats['null_counts']
         if critical_nulls.any():
             null_cols = critical_nulls[critical_nulls > 0]
             self.validation_warnings.append(
                 f"Zorunlu kolonlarda boş değerler var: {dict(null_cols)}"
             )
         
-        # Validasyon sonuçlarını göster
+        # Validasyon sonuçlarını mesajlara ekle
         if self.validation_warnings:
             for warning in self.validation_warnings:
-                show_warning(warning)
+                self._notify('warning', warning)
         
         if self.validation_errors:
             for error in self.validation_errors:
-                show_error(error)
+                self._notify('error', error)
             return False
         
         return True
     
+    def _read_csv_streaming(self, source, chunksize):
+        """
+        CSV'yi sabit boyutlu parçalar halinde oku; her parçayı ayrı
+        validasyon/dönüşümden geçirip son tablodaki yerine kopyala
+        
+        Sayısal kolonlar dosyanın satır sayısı (üst sınır) kadar önceden
+        ayrılır ve her parça bir sonraki okunmadan yerine yazılır; metin
+        kolonları parça dizileri olarak tutulup sonda kopyasız birleştirilir.
+        Tepe bellek yaklaşık son tablo + bir parça ile sınırlıdır.
+        
+        Args:
+            source: Dosya yolu veya file-like obje
+            chunksize: Parça başına satır sayısı
+            
+        Returns:
+            bool: Validasyon başarılı mı? (veri self.df'e yazılır)
+        """
+        self.validation_errors = []
+        self.validation_warnings = []
+        self.df = None
+        
+        stats = self._new_validation_stats()
+        builder = _FrameBuilder(_count_lines(source) or chunksize)
+        
+        with pd.read_csv(source, chunksize=chunksize, dtype=CATALOG_CSV_DTYPES) as reader:
+            for chunk in reader:
+                if builder.columns is None and not self._check_required_columns(chunk.columns):
+                    return False
+                builder.append(self._coerce_chunk(chunk, stats))
+                del chunk
+        
+        if builder.rows == 0:
+            self.validation_errors.append("Veri boş!")
+            return False
+        
+        self.df = builder.finish()
+        
+        return self._finish_validation(stats)
+    
     def preprocess_data(self):
         """
         Veriyi işle ve temizle
@@ -162,7 +408,7 @@ class DataLoader:
         
         # Tip kolonu kontrolü (1 veya 2 olmalı)
         if 'tip' in self.df.columns:
-            self.df['tip'] = self.df['tip'].apply(lambda x: 2 if x not in [1, 2] else x)
+            self.df['tip'] = self.df['tip'].where(self.df['tip'].isin([1, 2]), 2)
         
         # SKU'ları string yap
         self.df['sku'] = self.df['sku'].astype(str)
@@ -174,6 +420,18 @@ class DataLoader:
                 errors='coerce'
             )
         
+        # Kompakt veri tipleri (categorical / int32 / float32)
+        bytes_before = memory_usage_bytes(self.df)
+        apply_dtype_plan(self.df)
+        bytes_after = memory_usage_bytes(self.df)
+        
+        self.memory_report = {
+            'bytes_before': bytes_before,
+            'bytes_after': bytes_after,
+            'bytes_saved': bytes_before - bytes_after,
+            'saved_pct': 100 * (bytes_before - bytes_after) / max(bytes_before, 1)
+        }
+        
         return self.df
     
     def get_data_summary(self):
@@ -197,16 +455,90 @@ class DataLoader:
             'total_akyazi_stock': self.df['stock_akyazi'].sum(),
             'total_ana_depo_stock': self.df['stock_ana_depo'].sum(),
             'total_oms_stock': self.df['stock_oms_total'].sum(),
+            'memory_bytes': memory_usage_bytes(self.df),
         }
         
         return summary
     
+    def get_search_index(self):
+        """
+        SKU / ürün adı arama index'i
+        
+        Index ilk çağrıda (search_index=True ise yüklemede) oluşur;
+        self.df değiştirildiyse yeniden oluşturulur.
+        
+        Returns:
+            SearchIndex veya None
+        """
+        if self.df is None:
+            return None
+        
+        if self.search_index is None or self._search_index_df is not self.df:
+            self.search_index = SearchIndex(self.df)
+            self._search_index_df = self.df
+        
+        return self.search_index
+    
+    def get_filter_engine(self):
+        """
+        Mevcut veri için filtre motoru
+        
+        Predicate maskeleri saklandığı için aynı filtre tekrar uygulandığında
+        kolon taranmaz; veri değişince (yeni df) motor yeniden oluşturulur.
+        
+        Returns:
+            FilterEngine: Filtre motoru (veri yoksa None)
+        """
+        if self.df is None:
+            return None
+        
+        if self.filter_engine is None or self.filter_engine.df is not self.df:
+            self.filter_engine = FilterEngine(self.df)
+        
+        return self.filter_engine
+    
+    def filter_positions(self, **filters):
+        """
+        Filtrelere uyan satır pozisyonları
+        
+        Kategori / segment / tip / satış filtreleri cache'li maskelerin
+        AND'i ile, arama index'ten gelen pozisyonlarla kesiştirilir; veri
+        kopyalanmaz.
+        
+        Args:
+            **filters: filter_data ile aynı filtre parametreleri
+            
+        Returns:
+            np.ndarray: Sıralı satır pozisyonları
+        """
+        engine = self.get_filter_engine()
+        if engine is None:
+            return None
+        
+        predicates = [
+            predicate for predicate in compile_filters(
+                category=filters.get('category'),
+                segment=filters.get('segment'),
+                tip=filters.get('tip'),
+                sales_min=filters.get('sales_min'),
+                sales_max=filters.get('sales_max')
+            )
+            if predicate.column in self.df.columns
+        ]
+        view = engine.filter(*predicates)
+        
+        # SKU / ürün adı araması (alt metin, büyük/küçük harf ve aksan duyarsız)
+        if filters.get('sku_search'):
+            view = view.intersect(self.get_search_index().search(filters['sku_search']))
+        
+        return view.positions
+    
     def filter_data(self, **filters):
         """
         Veriyi filtrele
         
         Args:
-            **filters: Filtre parametreleri
+            **filters: category, segment, tip, sku_search, sales_min, sales_max
             
         Returns:
             pd.DataFrame: Filtrelenmiş veri
@@ -214,39 +546,127 @@ class DataLoader:
         if self.df is None:
             return None
         
-        filtered_df = self.df.copy()
+        return self.df.take(self.filter_positions(**filters))
+
+
+# Satır sayımında okunan blok boyutu (byte)
+_LINE_COUNT_BLOCK = 1 << 20
+
+
+def _count_lines(source):
+    """
+    CSV'deki satır sonu sayısı (veri satırı sayısının üst sınırı)
+    
+    Tırnak içindeki satır sonları da sayıldığı için gerçek satır
+    sayısından büyük olabilir. File-like objelerde okuma konumu geri alınır.
+    
+    Returns:
+        int veya None (kaynak geri sarılamıyorsa)
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return _count_newlines(f)
+    
+    if not (hasattr(source, 'seek') and hasattr(source, 'tell')):
+        return None
+    try:
+        position = source.tell()
+        count = _count_newlines(source)
+        source.seek(position)
+    except (OSError, ValueError):
+        return None
+    return count
+
+
+def _count_newlines(stream):
+    count = 0
+    block = stream.read(_LINE_COUNT_BLOCK)
+    while block:
+        count += block.count(b'\n' if isinstance(block, bytes) else '\n')
+        block = stream.read(_LINE_COUNT_BLOCK)
+    return count + 1
+
+
+class _FrameBuilder:
+    """
+    Parçaları tek DataFrame'de birleştiren, son tabloyu yerinde dolduran yapı
+    
+    NumPy tipli kolonlar kapasite kadar önceden ayrılır (kapasite aşılırsa
+    iki katına büyütülür, parçalar arası tip değişirse ortak tipe yükseltilir);
+    diğer kolonlar (metin, extension tipleri) parça dizileri olarak tutulur.
+    """
+    
+    def __init__(self, capacity):
+        self.capacity = max(int(capacity), 1)
+        self.rows = 0
+        self.columns = None
+        # Kolon -> np.ndarray (yerinde doldurulan) veya parça listesi
+        self._buffers = {}
+    
+    def append(self, chunk):
+        """Parçayı son tablodaki yerine kopyala"""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+        
+        start, stop = self.rows, self.rows + len(chunk)
+        if stop > self.capacity:
+            self._grow(max(stop, 2 * self.capacity))
         
-        # Kategori filtresi
-        if 'category' in filters and filters['category']:
-            if isinstance(filters['category'], list):
-                filtered_df = filtered_df[filtered_df['category'].isin(filters['category'])]
+        for col in self.columns:
+            values = chunk[col]
+            buffer = self._buffers.get(col)
+            
+            if buffer is None:
+                buffer = self._new_buffer(values)
+            elif isinstance(buffer, np.ndarray):
+                buffer = self._fit_buffer(buffer, values, start)
+            
+            if isinstance(buffer, np.ndarray):
+                buffer[start:stop] = values.to_numpy()
             else:
-                filtered_df = filtered_df[filtered_df['category'] == filters['category']]
+                buffer.append(values.array)
+            self._buffers[col] = buffer
         
-        # Segment filtresi
-        if 'segment' in filters and filters['segment'] and 'segment' in filtered_df.columns:
-            if isinstance(filters['segment'], list):
-                filtered_df = filtered_df[filtered_df['segment'].isin(filters['segment'])]
+        self.rows = stop
+    
+    def _new_buffer(self, values):
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biufcmM':
+            return np.empty(self.capacity, dtype=values.dtype)
+        return []
+    
+    def _fit_buffer(self, buffer, values, filled):
+        """Parçanın tipi tampona sığmıyorsa tamponu ortak tipe çevir"""
+        dtype = values.dtype
+        if dtype == buffer.dtype:
+            return buffer
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biufc' and buffer.dtype.kind in 'biufc':
+            common = np.result_type(buffer.dtype, dtype)
+            return buffer if common == buffer.dtype else buffer.astype(common)
+        # Sayısal olmayan parça: kolon parça listesine döner
+        return [pd.Series(buffer[:filled]).array]
+    
+    def _grow(self, capacity):
+        for col, buffer in self._buffers.items():
+            if isinstance(buffer, np.ndarray):
+                grown = np.empty(capacity, dtype=buffer.dtype)
+                grown[:self.rows] = buffer[:self.rows]
+                self._buffers[col] = grown
+        self.capacity = capacity
+    
+    def finish(self):
+        """
+        Son DataFrame (NumPy kolonları kopyalanmadan, kapasite fazlası görünüm dışında)
+        """
+        data = {}
+        for col in self.columns:
+            buffer = self._buffers.pop(col)
+            if isinstance(buffer, np.ndarray):
+                data[col] = buffer[:self.rows]
+            elif len(buffer) == 1:
+                data[col] = buffer[0]
             else:
-                filtered_df = filtered_df[filtered_df['segment'] == filters['segment']]
-        
-        # Tip filtresi
-        if 'tip' in filters and filters['tip']:
-            filtered_df = filtered_df[filtered_df['tip'] == filters['tip']]
-        
-        # SKU araması
-        if 'sku_search' in filters and filters['sku_search']:
-            search_term = filters['sku_search'].lower()
-            filtered_df = filtered_df[
-                filtered_df['sku'].str.lower().str.contains(search_term) |
-                filtered_df['product_name'].str.lower().str.contains(search_term)
-            ]
-        
-        # Satış aralığı
-        if 'sales_min' in filters and filters['sales_min'] is not None:
-            filtered_df = filtered_df[filtered_df['daily_sales_avg_7d'] >= filters['sales_min']]
-        
-        if 'sales_max' in filters and filters['sales_max'] is not None:
-            filtered_df = filtered_df[filtered_df['daily_sales_avg_7d'] <= filters['sales_max']]
+                data[col] = pd.concat(
+                    [pd.Series(part, copy=False) for part in buffer], ignore_index=True
+                ).array
         
-        return filtered_df
+        return pd.DataFrame(data, copy=False)
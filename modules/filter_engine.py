@@ -0,0 +1,199 @@
+"""
+Filter Engine - Analiz edilmiş katalog üzerinde kopyasız filtreleme
+
+Filtreler hashlenebilir predicate'lere derlenir; her predicate'in bool
+maskesi bir kez hesaplanıp saklanır ve filtreler maskelerin AND'i ile
+birleştirilir. Sonuç satır pozisyonlarını tutan hafif bir görünümdür
+(FilterView); DataFrame sadece gösterim veya export anında oluşturulur.
+"""
+from collections import OrderedDict, namedtuple
+import numpy as np
+
+# Saklanacak en fazla predicate maskesi sayısı (LRU)
+FILTER_MASK_CACHE_SIZE = 64
+
+# kind: 'isin', 'between' veya 'is_true'; value: predicate'e göre parametre
+Predicate = namedtuple('Predicate', ['kind', 'column', 'value'])
+
+
+def isin(column, values):
+    """Kolon değeri listedekilerden biri"""
+    if isinstance(values, (list, tuple, set, frozenset)):
+        return Predicate('isin', column, frozenset(values))
+    return Predicate('isin', column, frozenset([values]))
+
+
+def between(column, low=None, high=None):
+    """low <= kolon <= high (None olan sınır uygulanmaz)"""
+    return Predicate('between', column, (low, high))
+
+
+def is_true(column):
+    """Bool kolon True"""
+    return Predicate('is_true', column, None)
+
+
+def compile_filters(category=None, segment=None, tip=None, sales_min=None,
+                    sales_max=None, urgent=False):
+    """
+    Standart filtre parametrelerini predicate listesine çevir
+
+    Args:
+        category / segment: Değer veya değer listesi (boş = filtre yok)
+        tip: Ürün tipi (boş = filtre yok)
+        sales_min / sales_max: daily_sales_avg_7d aralığı
+        urgent: Sadece acil transferler (is_urgent_transfer)
+
+    Returns:
+        list: Predicate listesi
+    """
+    predicates = []
+
+    if category:
+        predicates.append(isin('category', category))
+    if segment:
+        predicates.append(isin('segment', segment))
+    if tip:
+        predicates.append(isin('tip', tip))
+    if sales_min is not None or sales_max is not None:
+        predicates.append(between('daily_sales_avg_7d', sales_min, sales_max))
+    if urgent:
+        predicates.append(is_true('is_urgent_transfer'))
+
+    return predicates
+
+
+class FilterEngine:
+    """DataFrame üzerinde predicate maskelerini saklayan filtre motoru"""
+
+    def __init__(self, df):
+        """
+        Args:
+            df: Filtrelenecek dataframe (değiştirilmemeli; değişirse yeni engine)
+        """
+        self.df = df
+        self._mask_cache = OrderedDict()
+
+    def mask(self, predicate):
+        """
+        Tek predicate'in bool maskesi (cache)
+
+        Returns:
+            np.ndarray: len(df) uzunluğunda bool maske (değiştirilmemeli)
+        """
+        if predicate in self._mask_cache:
+            self._mask_cache.move_to_end(predicate)
+            return self._mask_cache[predicate]
+
+        series = self.df[predicate.column]
+
+        if predicate.kind == 'isin':
+            mask = series.isin(list(predicate.value)).to_numpy(dtype=bool)
+        elif predicate.kind == 'between':
+            low, high = predicate.value
+            mask = np.ones(len(series), dtype=bool)
+            if low is not None:
+                mask &= (series >= low).to_numpy(dtype=bool)
+            if high is not None:
+                mask &= (series <= high).to_numpy(dtype=bool)
+        elif predicate.kind == 'is_true':
+            mask = series.to_numpy(dtype=bool, na_value=False)
+        else:
+            raise ValueError(f"Bilinmeyen predicate: {predicate.kind}")
+
+        self._mask_cache[predicate] = mask
+        if len(self._mask_cache) > FILTER_MASK_CACHE_SIZE:
+            self._mask_cache.popitem(last=False)
+
+        return mask
+
+    def combined_mask(self, predicates):
+        """Predicate maskelerinin AND'i (predicate yoksa None)"""
+        combined = None
+        for predicate in predicates:
+            mask = self.mask(predicate)
+            combined = mask.copy() if combined is None else np.logical_and(combined, mask, out=combined)
+        return combined
+
+    def filter(self, *predicates):
+        """
+        Predicate'lere uyan satırların görünümü
+
+        Returns:
+            FilterView: Satır pozisyonları (kopya yok)
+        """
+        combined = self.combined_mask(predicates)
+        if combined is None:
+            return self.view()
+        return FilterView(self, np.flatnonzero(combined))
+
+    def view(self, positions=None):
+        """Verilen pozisyonların (None = tüm satırlar) görünümü"""
+        if positions is None:
+            positions = np.arange(len(self.df))
+        return FilterView(self, positions)
+
+
+class FilterView:
+    """Filtrelenmiş satır pozisyonları; DataFrame materialize ile oluşur"""
+
+    def __init__(self, engine, positions):
+        self.engine = engine
+        self.positions = positions
+
+    @property
+    def df(self):
+        return self.engine.df
+
+    def __len__(self):
+        return len(self.positions)
+
+    def filter(self, *predicates):
+        """Ek predicate'lerle daralt (cache'li maskeler pozisyonlarda okunur)"""
+        combined = self.engine.combined_mask(predicates)
+        if combined is None:
+            return self
+        return FilterView(self.engine, self.positions[combined[self.positions]])
+
+    def intersect(self, positions):
+        """Harici pozisyon kümesiyle kesişim (ör. arama sonucu)"""
+        keep = np.isin(self.positions, positions, assume_unique=True)
+        return FilterView(self.engine, self.positions[keep])
+
+    def sort_values(self, by, ascending=True):
+        """
+        Pozisyonları kolon(lar)a göre sırala
+
+        Sadece sıralama kolonları okunur; sıra DataFrame.sort_values ile aynıdır.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        keys = self.df.iloc[self.positions, self.df.columns.get_indexer(by)]
+        keys.index = self.positions
+        order = keys.sort_values(by, ascending=ascending).index.to_numpy()
+        return FilterView(self.engine, order)
+
+    def slice(self, start, stop):
+        """Görünümün [start, stop) aralığı (ör. tablo sayfası)"""
+        return FilterView(self.engine, self.positions[start:stop])
+
+    def column(self, name):
+        """Tek kolonun görünümdeki değerleri"""
+        return self.df[name].take(self.positions)
+
+    def count(self, *predicates):
+        """Görünümde predicate'lere uyan satır sayısı"""
+        combined = self.engine.combined_mask(predicates)
+        if combined is None:
+            return len(self)
+        return int(combined[self.positions].sum())
+
+    def materialize(self, columns=None):
+        """
+        Görünümü DataFrame'e çevir (gösterim / export anında)
+
+        Args:
+            columns: Alınacak kolonlar (None = hepsi)
+        """
+        if columns is None:
+            return self.df.take(self.positions)
+        return self.df.iloc[self.positions, self.df.columns.get_indexer(columns)]
@@ -0,0 +1,191 @@
+"""
+Metrics Kernel - calculate_all_metrics için tek geçişli NumPy hesaplaması
+
+Metrikler önceden ayrılmış iki çıktı bloğuna yazılır: eşik karşılaştırması
+yapılan skorlar float64, METRIC_COLUMNS float32. Bölmeler NaN/inf sonuçları
+default'a çeken korumalı bölme ile yapılır, ara Series oluşturulmaz.
+"""
+import numpy as np
+import pandas as pd
+from utils.constants import METRIC_WEIGHTS, METRIC_COLUMNS
+
+# Kernel çıktı kolonları (DataFrame'e bu sırayla yazılır)
+METRIC_NAMES = [
+    'velocity_score', 'trend_score', 'engagement_score', 'conversion_rate',
+    'days_of_stock', 'quality_score', 'stockout_penalty', 'campaign_boost',
+    'seasonal_factor', 'final_score'
+]
+
+# Final score girdileri: ağırlıklı terimler + çarpanlar (score matrisi satırları)
+SCORE_TERMS = list(METRIC_WEIGHTS)
+SCORE_INPUTS = SCORE_TERMS + ['campaign_boost', 'seasonal_factor']
+
+# Kernel'in okuduğu girdi kolonları
+KERNEL_INPUT_COLUMNS = [
+    'daily_sales_avg_7d', 'daily_sales_avg_30d', 'daily_sales_yesterday',
+    'add_to_cart_7d', 'view_count_7d', 'total_stock', 'avg_rating',
+    'review_count', 'stock_out_days_last_30d', 'campaign_flag'
+]
+
+
+def compute_metrics(df, seasonal_factor=None, weights=None, score_matrix=None):
+    """
+    Tüm metrikleri tek geçişte hesapla
+
+    Sonuçlar eski safe_divide + pandas aritmetiği ile birebir aynıdır: aynı
+    işlem sırası ve girdi dtype'ları korunur, final score float64 ara
+    değerlerden toplanır ve sadece en sonda float32'ye yazılır.
+
+    Args:
+        df: KERNEL_INPUT_COLUMNS kolonlarını içeren dataframe
+        seasonal_factor: Ürün başına seasonal factor dizisi (None = 1.0)
+        weights: Final score ağırlıkları (None = METRIC_WEIGHTS)
+        score_matrix: Verilirse (len(SCORE_INPUTS), n) float64 matris; final
+            score girdileri (float64, yuvarlanmamış) bu matrise yazılır
+            ve rescore_metrics ile yeniden skorlamada kullanılır
+
+    Returns:
+        pd.DataFrame: METRIC_NAMES kolonları (df ile aynı index)
+    """
+    n = len(df)
+    cols = {col: df[col].to_numpy() for col in KERNEL_INPUT_COLUMNS}
+    weights = weights or METRIC_WEIGHTS
+
+    # Çıktı blokları (kolon başına tek satır, kopyasız DataFrame'e çevrilir)
+    wide_names = [name for name in METRIC_NAMES if name not in METRIC_COLUMNS]
+    narrow_names = [name for name in METRIC_NAMES if name in METRIC_COLUMNS]
+    wide = np.empty((len(wide_names), n), dtype=np.float64)
+    narrow = np.empty((len(narrow_names), n), dtype=np.float32)
+    metrics = dict(zip(wide_names, wide))
+    metrics.update(zip(narrow_names, narrow))
+
+    # float64 ara değer ve bölme maskesi tamponları
+    value = np.empty(n, dtype=np.float64)
+    term = np.empty(n, dtype=np.float64)
+    invalid = np.empty(n, dtype=bool)
+
+    sales_7d = cols['daily_sales_avg_7d']
+    final = np.empty(n, dtype=np.float64)
+
+    def accumulate(values, name):
+        """Final score'a ağırlıklı terimi ekle (pandas ile aynı toplama sırası)"""
+        if score_matrix is not None:
+            score_matrix[SCORE_INPUTS.index(name)] = values
+
+        if name == 'velocity_score':
+            np.multiply(values, weights[name], out=final)
+        else:
+            np.multiply(values, weights[name], out=term)
+            np.add(final, term, out=final)
+
+    # 1-2. Velocity / Trend
+    velocity = metrics['velocity_score']
+    _guarded_divide(sales_7d, cols['daily_sales_avg_30d'], 1.0, velocity, invalid)
+    accumulate(velocity, 'velocity_score')
+
+    trend = metrics['trend_score']
+    _guarded_divide(cols['daily_sales_yesterday'], sales_7d, 1.0, trend, invalid)
+    accumulate(trend, 'trend_score')
+
+    # 3. Engagement (sepete ekleme / görüntülenme * 100)
+    engagement = metrics['engagement_score']
+    _guarded_divide(cols['add_to_cart_7d'], cols['view_count_7d'], 0, engagement, invalid)
+    np.multiply(engagement, 100, out=engagement)
+    accumulate(engagement, 'engagement_score')
+
+    # 4. Conversion (haftalık satış / sepete ekleme * 100)
+    np.multiply(sales_7d, 7, out=value)
+    _guarded_divide(value, cols['add_to_cart_7d'], 0, value, invalid)
+    np.multiply(value, 100, out=value)
+    accumulate(value, 'conversion_rate')
+    metrics['conversion_rate'][:] = value
+
+    # 5. Stok kaç güne yeter
+    _guarded_divide(cols['total_stock'], sales_7d, 999, metrics['days_of_stock'], invalid)
+
+    # 6. Quality (rating 0-100 skala + max 10 puan review)
+    np.divide(cols['review_count'], 10, out=value)
+    np.minimum(value, 10, out=value)
+    np.add(cols['avg_rating'] * 20, value, out=value)
+    np.divide(value, 2, out=value)
+    accumulate(value, 'quality_score')
+    metrics['quality_score'][:] = value
+
+    # 7. Stockout penalty
+    np.multiply(cols['stock_out_days_last_30d'], 3, out=value)
+    np.subtract(100, value, out=value)
+    np.maximum(value, 0, out=value)
+    accumulate(value, 'stockout_penalty')
+    metrics['stockout_penalty'][:] = value
+
+    # 8. Campaign boost
+    campaign = cols['campaign_flag']
+    np.multiply(campaign, 1.3, out=value)
+    np.add(value, 1 - campaign, out=value)
+    np.multiply(final, value, out=final)
+    metrics['campaign_boost'][:] = value
+
+    # 9. Seasonal factor
+    if seasonal_factor is None:
+        metrics['seasonal_factor'].fill(1.0)
+    else:
+        np.multiply(final, seasonal_factor, out=final)
+        metrics['seasonal_factor'][:] = seasonal_factor
+
+    if score_matrix is not None:
+        score_matrix[SCORE_INPUTS.index('campaign_boost')] = value
+        score_matrix[SCORE_INPUTS.index('seasonal_factor')] = (
+            1.0 if seasonal_factor is None else seasonal_factor
+        )
+
+    # 10. Final score
+    metrics['final_score'][:] = final
+
+    result = pd.concat([
+        pd.DataFrame(wide.T, index=df.index, columns=wide_names, copy=False),
+        pd.DataFrame(narrow.T, index=df.index, columns=narrow_names, copy=False)
+    ], axis=1)
+
+    return result[METRIC_NAMES]
+
+
+def new_score_matrix(n):
+    """compute_metrics'e verilecek boş score matrisi"""
+    return np.empty((len(SCORE_INPUTS), n), dtype=np.float64)
+
+
+def rescore_metrics(score_matrix, weights):
+    """
+    Saklanan score matrisinden yeni ağırlıklarla final score hesapla
+
+    final = (w · terimler) * campaign_boost * seasonal_factor
+
+    Args:
+        score_matrix: compute_metrics ile doldurulmuş matris
+        weights: Metrik -> ağırlık (SCORE_TERMS anahtarları)
+
+    Returns:
+        np.ndarray: float64 final score
+    """
+    vector = np.array([weights[name] for name in SCORE_TERMS], dtype=np.float64)
+    terms = len(SCORE_TERMS)
+
+    final = vector @ score_matrix[:terms]
+    np.multiply(final, score_matrix[terms], out=final)
+    np.multiply(final, score_matrix[terms + 1], out=final)
+
+    return final
+
+
+def _guarded_divide(numerator, denominator, default, out, invalid):
+    """
+    out = numerator / denominator; sıfıra bölme, NaN ve inf sonuçlarda default
+
+    Args:
+        invalid: n uzunluğunda bool tampon (içeriği ezilir)
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(numerator, denominator, out=out)
+    np.isfinite(out, out=invalid)
+    np.logical_not(invalid, out=invalid)
+    np.copyto(out, default, where=invalid)
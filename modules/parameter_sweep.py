@@ -0,0 +1,349 @@
+"""
+Parameter Sweep - Segment parametre ızgarasının toplu değerlendirmesi
+
+Her konfigürasyon için segment_products + allocation KPI'ları hesaplanır.
+Segment kodları sadece eşik parametrelerine bağlıdır: aynı eşik setini
+paylaşan konfigürasyonlar için kodlar bir kez, (eşik seti x ürün)
+matrislerine broadcast edilen karşılaştırmalarla hesaplanır. Allocation
+KPI'ları segmentlere göre toplanabilir: segment toplamları bir önceki eşik
+setinden sadece segmenti değişen ürünlerle güncellenir, segment
+parametresi farklı konfigürasyonlar için sadece farklı değerler
+(değer x segment ürünleri) değerlendirilir.
+
+Kullanım:
+    sweep = ParameterSweep(analytics.df)
+    results = sweep.sweep({
+        ('HOT', 'velocity_min'): [1.3, 1.5, 1.7],
+        ('STEADY', 'allocation_pct'): [0.3, 0.4, 0.5]
+    })
+"""
+import itertools
+import numpy as np
+import pandas as pd
+from utils.constants import (
+    DEFAULT_SEGMENT_PARAMS, SEGMENT_NAMES, TRANSFER_LEAD_TIME_DAYS, SWEEP_CHUNK_ELEMENTS
+)
+from utils.helpers import round_values
+from modules.segment_rules import (
+    RULE_OPERATORS, SEGMENT_RULES, SEGMENT_RULE_COLUMNS, resolve_segment_rules
+)
+
+# Sonuç tablosundaki KPI kolonları (segment sayılarından sonra)
+SWEEP_KPI_COLUMNS = [
+    'urgent_transfers', 'auto_transfers', 'total_transfer_volume', 'avg_transfer_size',
+    'critical_products', 'markdown_urgent', 'markdown_consider'
+]
+
+
+class ParameterSweep:
+    """Segment parametre ızgarası için vektörel değerlendirme motoru"""
+
+    def __init__(self, df, transfer_lead_time=TRANSFER_LEAD_TIME_DAYS,
+                 chunk_elements=SWEEP_CHUNK_ELEMENTS):
+        """
+        Args:
+            df: Metrikleri hesaplanmış ürün dataframe (AnalyticsEngine)
+            transfer_lead_time: Transfer süresi (gün)
+            chunk_elements: Ara matris başına en fazla eleman (bellek sınırı)
+        """
+        self.n = len(df)
+        self.chunk_elements = chunk_elements
+        self.columns = {
+            col: df[col].to_numpy(dtype=np.float64) for col in SEGMENT_RULE_COLUMNS
+        }
+
+        # Allocation girdileri (AllocationOptimizer.generate_allocation_strategy ile aynı)
+        forecast = df['daily_sales_avg_7d'].to_numpy(dtype=np.float64)
+        if 'trend_score' in df.columns:
+            forecast = forecast * df['trend_score'].to_numpy(dtype=np.float64)
+        stock_akyazi = df['stock_akyazi'].to_numpy(dtype=np.float64)
+
+        self.inputs = {
+            'forecast': forecast,
+            'total': df['total_stock'].to_numpy(dtype=np.float64),
+            'stock_akyazi': stock_akyazi,
+            'stock_ana_depo': df['stock_ana_depo'].to_numpy(dtype=np.float64),
+            'days_of_stock': df['days_of_stock'].to_numpy(dtype=np.float64),
+            'stock_consumed': forecast * transfer_lead_time
+        }
+
+        # Acil transfer segment parametrelerine bağlı değil
+        days_until_stockout = stock_akyazi / (forecast + 0.1)
+        self.urgent_count = int((days_until_stockout < transfer_lead_time).sum())
+
+        # Parametre tablosu başına ürün istatistikleri ve son segment toplamları
+        self._profile = None
+
+    def sweep(self, axes, base_params=None):
+        """
+        Kartezyen parametre ızgarasını değerlendir
+
+        Args:
+            axes: {(segment, parametre): [değerler]} ör. {('HOT', 'velocity_min'): [1.3, 1.5]}
+            base_params: Taranmayan parametreler için temel (None = DEFAULT_SEGMENT_PARAMS)
+
+        Returns:
+            pd.DataFrame: Konfigürasyon başına bir satır ('SEGMENT.parametre' kolonları + KPI'lar)
+        """
+        base_params = base_params or DEFAULT_SEGMENT_PARAMS
+        keys = list(axes)
+        points = list(itertools.product(*(axes[key] for key in keys)))
+
+        grid = []
+        for point in points:
+            config = {segment: dict(params) for segment, params in base_params.items()}
+            for (segment, param), value in zip(keys, point):
+                config.setdefault(segment, {})[param] = value
+            grid.append(config)
+
+        results = self.run(grid)
+
+        swept = pd.DataFrame(points, columns=[f"{segment}.{param}" for segment, param in keys])
+        return pd.concat([swept, results.drop(columns='config')], axis=1)
+
+    def run(self, grid):
+        """
+        Segment parametre setlerini değerlendir
+
+        Args:
+            grid: Segment parametre dict'lerinin listesi
+
+        Returns:
+            pd.DataFrame: config, segment sayıları ('<SEGMENT>_count') ve SWEEP_KPI_COLUMNS
+        """
+        grid = list(grid)
+        count_columns = [f"{segment}_count" for segment in SEGMENT_NAMES]
+        results = np.zeros((len(grid), len(count_columns) + len(SWEEP_KPI_COLUMNS)))
+
+        # Aynı eşik setini paylaşan konfigürasyonları grupla
+        groups = {}
+        for position, config in enumerate(grid):
+            rules = resolve_segment_rules(config)
+            key = tuple(
+                threshold for _, clauses in rules.values() for _, _, threshold in clauses
+            )
+            groups.setdefault(key, (rules, []))[1].append(position)
+        groups = list(groups.values())
+
+        chunk_size = max(1, self.chunk_elements // max(self.n, 1))
+        for start in range(0, len(groups), chunk_size):
+            chunk = groups[start:start + chunk_size]
+            codes = self._segment_codes([rules for rules, _ in chunk])
+
+            for row, (_, members) in zip(codes, chunk):
+                results[members] = self._evaluate_codes(row, [grid[i] for i in members])
+
+        results = pd.DataFrame(results, columns=count_columns + SWEEP_KPI_COLUMNS)
+        integer_columns = [
+            col for col in results.columns
+            if col not in ('total_transfer_volume', 'avg_transfer_size')
+        ]
+        results[integer_columns] = results[integer_columns].astype('int64')
+        results.insert(0, 'config', np.arange(len(results)))
+
+        return results
+
+    def _segment_codes(self, rules):
+        """
+        Eşik setlerinin segment kodları (segment_products ile aynı öncelik)
+
+        Args:
+            rules: Eşik seti başına resolve_segment_rules çıktısı
+
+        Returns:
+            np.ndarray: (eşik seti x ürün) SEGMENT_NAMES indeksleri
+        """
+        codes = np.full((len(rules), self.n), SEGMENT_NAMES.index('UNCLASSIFIED'), dtype=np.int8)
+        delta = np.empty_like(codes)
+
+        # Düşük öncelikten yükseğe: öncelikli segment sonra yazılır
+        for segment in reversed(list(SEGMENT_RULES)):
+            combine, clauses = rules[0][segment]
+            reduce = np.logical_and if combine == 'all' else np.logical_or
+
+            mask = None
+            for position, (column, op, _) in enumerate(clauses):
+                thresholds = [set_rules[segment][1][position][2] for set_rules in rules]
+                clause = self._clause_masks(column, op, thresholds)
+                mask = clause if mask is None else reduce(mask, clause)
+
+            np.subtract(codes, SEGMENT_NAMES.index(segment), out=delta)
+            np.multiply(delta, mask.view(np.int8), out=delta)
+            np.subtract(codes, delta, out=codes)
+
+        return codes
+
+    def _clause_masks(self, column, op, thresholds):
+        """
+        Bir koşulun tüm eşik setleri için maskesi
+
+        Aynı eşik tek kez karşılaştırılır; tüm setlerde eşik aynıysa
+        (1 x ürün) maske döner ve broadcast ile kullanılır.
+        """
+        unique, inverse = np.unique(np.asarray(thresholds, dtype=np.float64), return_inverse=True)
+        masks = RULE_OPERATORS[op](self.columns[column][None, :], unique[:, None])
+
+        return masks if len(unique) == 1 else masks[inverse]
+
+    def _evaluate_codes(self, codes, configs):
+        """
+        Aynı segment kodlarını paylaşan konfigürasyonların KPI'ları
+
+        Returns:
+            np.ndarray: (konfigürasyon x kolon) segment sayıları + SWEEP_KPI_COLUMNS
+        """
+        counts = np.bincount(codes, minlength=len(SEGMENT_NAMES))
+
+        # (konfigürasyon x segment) parametre tabloları; tanımsız segmentler
+        # (UNCLASSIFIED) AllocationOptimizer gibi STEADY parametrelerini kullanır
+        tables = {
+            param: np.array([
+                [config.get(segment, config['STEADY'])[param] for segment in SEGMENT_NAMES]
+                for config in configs
+            ], dtype=bool if param == 'auto_transfer' else np.float64)
+            for param in [param for param, _ in _PARAM_STATS] + ['auto_transfer']
+        }
+
+        # (konfigürasyon x segment x istatistik) segment toplamları: ilk
+        # konfigürasyonun parametreleriyle, sonra farklı parametreli segmentler
+        sums = np.repeat(self._base_sums(codes, tables)[None], len(configs), axis=0)
+        self._apply_deviations(sums, codes, counts, tables)
+
+        transfer_volume = round_values(sums[:, :, 0].sum(axis=1), 0)
+        auto_count = (sums[:, :, 1] * tables['auto_transfer']).sum(axis=1)
+        avg_transfer_size = round_values(transfer_volume / np.maximum(auto_count, 1), 0)
+
+        return np.column_stack([
+            np.broadcast_to(counts, (len(configs), len(SEGMENT_NAMES))),
+            np.full(len(configs), self.urgent_count),
+            auto_count,
+            transfer_volume,
+            avg_transfer_size,
+            sums[:, :, 2].sum(axis=1),
+            np.full(len(configs), counts[SEGMENT_NAMES.index('DYING')]),
+            sums[:, :, 3].sum(axis=1)
+        ])
+
+    def _base_sums(self, codes, tables):
+        """
+        İlk konfigürasyonun parametreleriyle segment toplamları
+
+        Her ürünün 6 olası segmentteki istatistikleri parametre tablosu
+        başına bir kez hesaplanır. Toplamlar bir önceki eşik setinden
+        sadece segmenti değişen ürünler üzerinden güncellenir.
+
+        Returns:
+            np.ndarray: (segment x istatistik) toplamlar
+        """
+        key = tuple(tables[param][0].tobytes() for param, _ in _PARAM_STATS)
+
+        if self._profile is None or self._profile['key'] != key:
+            stats = np.empty((len(SEGMENT_NAMES), _STAT_COUNT, self.n), dtype=np.float64)
+            for code in range(len(SEGMENT_NAMES)):
+                stats[code] = np.concatenate([
+                    compute(self.inputs, tables[param][0, code])
+                    for param, compute in _PARAM_STATS
+                ])
+            stats[SEGMENT_NAMES.index('DYING'), 3] = 0  # DYING zaten URGENT
+
+            # Başlangıç: tüm ürünler UNCLASSIFIED
+            unclassified = SEGMENT_NAMES.index('UNCLASSIFIED')
+            sums = np.zeros((len(SEGMENT_NAMES), _STAT_COUNT))
+            sums[unclassified] = stats[unclassified].sum(axis=1)
+
+            self._profile = {
+                'key': key,
+                'stats': stats,
+                'codes': np.full(self.n, unclassified, dtype=np.int8),
+                'sums': sums
+            }
+
+        profile = self._profile
+        changed = np.flatnonzero(codes != profile['codes'])
+        old_codes = profile['codes'][changed]
+        new_codes = codes[changed]
+
+        sums = profile['sums'].copy()
+        for stat in range(_STAT_COUNT):
+            sums[:, stat] += np.bincount(
+                new_codes, weights=profile['stats'][new_codes, stat, changed],
+                minlength=len(SEGMENT_NAMES)
+            )
+            sums[:, stat] -= np.bincount(
+                old_codes, weights=profile['stats'][old_codes, stat, changed],
+                minlength=len(SEGMENT_NAMES)
+            )
+
+        profile['codes'] = codes
+        profile['sums'] = sums
+
+        return sums
+
+    def _apply_deviations(self, sums, codes, counts, tables):
+        """
+        Parametresi ilk konfigürasyondan farklı segmentlerin toplamlarını hesapla
+
+        Segment ürünleri bir kez seçilir; farklı değerler (değer x segment
+        ürünleri) matrisine broadcast ile değerlendirilir.
+        """
+        stat = 0
+        for param, compute in _PARAM_STATS:
+            values = tables[param]
+            width = _STAT_WIDTHS[param]
+
+            for code in range(len(SEGMENT_NAMES)):
+                differs = values[:, code] != values[0, code]
+                if not counts[code] or not differs.any():
+                    continue
+                if param == 'markdown_day' and SEGMENT_NAMES[code] == 'DYING':
+                    continue
+
+                positions = np.flatnonzero(codes == code)
+                inputs = {name: column[positions] for name, column in self.inputs.items()}
+                unique, inverse = np.unique(values[differs, code], return_inverse=True)
+                step = max(1, self.chunk_elements // len(positions))
+
+                segment_sums = np.concatenate([
+                    compute(inputs, unique[start:start + step, None]).sum(axis=-1)
+                    for start in range(0, len(unique), step)
+                ], axis=-1)
+                sums[differs, code, stat:stat + width] = segment_sums.T[inverse]
+
+            stat += width
+
+
+def _transfer_stats(inputs, allocation_pct):
+    """
+    Ürün başına transfer miktarı ve transfer yapılıp yapılmadığı
+
+    AllocationOptimizer ile aynı işlem sırası ve yuvarlama kullanılır.
+    """
+    transfer = inputs['total'] * allocation_pct
+    transfer += inputs['stock_consumed']
+    transfer -= inputs['stock_akyazi']
+    np.fmax(0, transfer, out=transfer)
+    np.fmin(transfer, inputs['stock_ana_depo'], out=transfer)
+    transfer = round_values(transfer, 0)
+
+    return np.stack([transfer, transfer > 0])
+
+
+def _critical_stats(inputs, reorder_days):
+    """Toplam stok reorder point altında mı"""
+    return (inputs['total'] < inputs['forecast'] * reorder_days)[None]
+
+
+def _markdown_stats(inputs, markdown_day):
+    """Stok günü markdown eşiğini aşıyor mu (CONSIDER)"""
+    return (inputs['days_of_stock'] > markdown_day)[None]
+
+
+# Segment parametresi -> ürün istatistikleri (sırasıyla: transfer miktarı,
+# transfer var mı, kritik mi, markdown CONSIDER mı)
+_PARAM_STATS = [
+    ('allocation_pct', _transfer_stats),
+    ('reorder_days', _critical_stats),
+    ('markdown_day', _markdown_stats)
+]
+_STAT_WIDTHS = {'allocation_pct': 2, 'reorder_days': 1, 'markdown_day': 1}
+_STAT_COUNT = sum(_STAT_WIDTHS.values())
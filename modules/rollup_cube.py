@@ -0,0 +1,131 @@
+"""
+Rollup Cube - Kategori / ana grup / alt grup / segment özet küpü
+
+Ürün tablosu bir kez en ince kırılımda (tüm boyutlar) gruplanır; diğer
+tüm boyut kombinasyonları bu küçük tablodan toplanır. Ortalamalar toplam
+ve dolu değer sayısından hesaplandığı için her seviyede yeniden
+toplanabilir. Drill-down sorguları ürün tablosuna dokunmadan küpten
+cevaplanır.
+"""
+import itertools
+import numpy as np
+import pandas as pd
+from utils.constants import ROLLUP_DIMENSIONS, ROLLUP_SUM_COLUMNS, ROLLUP_MEAN_COLUMNS
+
+
+class RollupCube:
+    """Hiyerarşi boyutlarının tüm kombinasyonları için önceden hesaplanmış özetler"""
+
+    def __init__(self, df, dimensions=None):
+        """
+        Args:
+            df: Metrikleri ve segmentleri hesaplanmış ürün dataframe
+            dimensions: Hiyerarşi boyutları (None = ROLLUP_DIMENSIONS, olmayanlar atlanır)
+        """
+        self.dimensions = [
+            dim for dim in (dimensions or ROLLUP_DIMENSIONS) if dim in df.columns
+        ]
+        self.sum_columns = []
+        self.mean_columns = [col for col in ROLLUP_MEAN_COLUMNS if col in df.columns]
+
+        # En ince kırılım: tüm boyutlar (NaN boyut değerleri ayrı grup)
+        values = pd.DataFrame({dim: df[dim] for dim in self.dimensions})
+        values['product_count'] = 1
+        for col in ROLLUP_SUM_COLUMNS:
+            if col in df.columns:
+                values[col] = df[col]
+            elif col == 'stock_value':
+                values[col] = (
+                    df['total_stock'].to_numpy(dtype=np.float64) * df['price'].to_numpy(dtype=np.float64)
+                )
+            else:
+                continue
+            self.sum_columns.append(col)
+        for col in self.mean_columns:
+            column = df[col].to_numpy(dtype=np.float64)
+            values[f'{col}_sum'] = column
+            values[f'{col}_count'] = ~np.isnan(column)
+
+        self._measures = [col for col in values.columns if col not in self.dimensions]
+        cells = self._aggregate(values, self.dimensions)
+
+        # Her boyut kombinasyonu (hiyerarşi sırasıyla) -> özet tablo
+        self.levels = {}
+        for size in range(len(self.dimensions) + 1):
+            for level in itertools.combinations(self.dimensions, size):
+                table = cells if size == len(self.dimensions) else self._aggregate(cells, list(level))
+                self.levels[level] = self._add_means(table)
+
+    def query(self, by=(), filters=None):
+        """
+        Boyutlara göre özet
+
+        Args:
+            by: Gruplanacak boyutlar (ör. ['category', 'segment']); boş = genel toplam
+            filters: {boyut: değer veya değer listesi} (ör. {'segment': 'HOT'})
+
+        Returns:
+            pd.DataFrame: by boyutları, product_count, toplamlar ve avg_<kolon> ortalamaları
+        """
+        by = list(by)
+        filters = filters or {}
+
+        unknown = [dim for dim in by + list(filters) if dim not in self.dimensions]
+        if unknown:
+            raise ValueError(f"Bilinmeyen boyut: {', '.join(unknown)}")
+
+        level = tuple(dim for dim in self.dimensions if dim in by or dim in filters)
+        table = self.levels[level]
+
+        if filters:
+            mask = np.ones(len(table), dtype=bool)
+            for dim, value in filters.items():
+                selected = value if isinstance(value, (list, tuple, set)) else [value]
+                mask &= table[dim].isin(selected).to_numpy()
+            table = table[mask]
+
+            # Filtre boyutları gruplamada yoksa filtrelenmiş hücreler toplanır
+            if len(level) != len(by):
+                table = self._add_means(self._aggregate(table, by))
+
+        return table[by + self.output_columns].reset_index(drop=True)
+
+    def drill_down(self, path=None):
+        """
+        Hiyerarşide bir alt seviyeye in
+
+        Args:
+            path: Seçili boyut değerleri, ör. {'category': 'Tekstil'}
+
+        Returns:
+            pd.DataFrame: Seçimdeki bir sonraki boyuta göre özet (son seviyede genel toplam)
+        """
+        path = path or {}
+        remaining = [dim for dim in self.dimensions if dim not in path]
+
+        return self.query(by=remaining[:1], filters=path)
+
+    @property
+    def output_columns(self):
+        """Sorgu sonucundaki ölçü kolonları"""
+        return ['product_count'] + self.sum_columns + [f'avg_{col}' for col in self.mean_columns]
+
+    def _aggregate(self, table, by):
+        """Ölçüleri (toplam ve sayılar) verilen boyutlara göre topla"""
+        if not by:
+            return pd.DataFrame({col: [table[col].sum()] for col in self._measures})
+
+        return table.groupby(
+            by, observed=True, dropna=False, sort=True
+        )[self._measures].sum().reset_index()
+
+    def _add_means(self, table):
+        """Toplam / dolu değer sayısından ortalama kolonlarını ekle"""
+        table = table.copy()
+        for col in self.mean_columns:
+            count = table[f'{col}_count'].to_numpy(dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                table[f'avg_{col}'] = np.where(
+                    count > 0, table[f'{col}_sum'].to_numpy(dtype=np.float64) / count, np.nan
+                )
+        return table
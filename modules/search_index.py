@@ -0,0 +1,205 @@
+"""
+Search Index - SKU ve ürün adı için trigram arama index'i
+
+Her kolonun farklı değerleri normalize edilir (Türkçe küçük harf + aksan
+katlama) ve trigramları sıralı posting listelerine yazılır. Arama terimi
+trigram listelerinin kesişimi ile aday değerlere indirilir, adaylar alt
+metin kontrolüyle doğrulanır ve eşleşen satır pozisyonları döndürülür.
+"""
+import numpy as np
+import pandas as pd
+from utils.constants import SEARCH_COLUMNS
+from utils.helpers import normalize_search_text, normalize_search_texts
+
+# Trigram anahtarı: 3 karakter x 21 bit (unicode) -> int64
+NGRAM_SIZE = 3
+_CHAR_BITS = 21
+
+# Index oluşturulurken aynı anda işlenen en fazla farklı değer ve toplam
+# karakter sayısı (bellek sınırı: parça belleği karakter sayısıyla orantılı)
+_BUILD_BATCH = 50_000
+_BUILD_BATCH_CHARS = 1_000_000
+
+
+class SearchIndex:
+    """Birden fazla metin kolonu üzerinde alt metin araması"""
+
+    def __init__(self, df, columns=None):
+        """
+        Args:
+            df: Ürün dataframe
+            columns: Aranacak kolonlar (None = SEARCH_COLUMNS, olmayanlar atlanır)
+        """
+        self.n = len(df)
+        self.fields = {
+            col: _ColumnIndex(df[col])
+            for col in (columns or SEARCH_COLUMNS) if col in df.columns
+        }
+
+    def search(self, term):
+        """
+        Terimi içeren satırlar (herhangi bir kolonda)
+
+        Args:
+            term: Arama terimi (büyük/küçük harf ve Türkçe aksan duyarsız)
+
+        Returns:
+            np.ndarray: Sıralı satır pozisyonları
+        """
+        term = normalize_search_text(term)
+        if not term:
+            return np.arange(self.n)
+
+        hits = np.zeros(self.n, dtype=bool)
+        for field in self.fields.values():
+            hits |= field.row_mask(term)
+
+        return np.flatnonzero(hits)
+
+
+class _ColumnIndex:
+    """Tek kolonun farklı değerleri üzerinde trigram index'i"""
+
+    def __init__(self, series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            uniques = series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+
+        # NaN kodu (-1) hit tablosunun son (hep False) elemanına denk gelir
+        self.codes = codes.astype(np.int32, copy=False)
+        self.texts = normalize_search_texts(np.asarray(uniques, dtype=object))
+
+        lengths = np.fromiter(
+            (len(text) for text in self.texts), dtype=np.int64, count=len(self.texts)
+        )
+
+        keys, owners = [], []
+        for start, stop in _batch_bounds(lengths):
+            batch_keys, batch_owners = _trigram_pairs(self.texts[start:stop], lengths[start:stop])
+            # Parça içinde (trigram, değer) çiftleri tekilleştirilir; tekrar
+            # eden trigramlar birleştirmeye hiç girmez
+            order = np.lexsort((batch_owners, batch_keys))
+            batch_keys, batch_owners = batch_keys[order], batch_owners[order]
+            distinct = np.ones(len(batch_keys), dtype=bool)
+            distinct[1:] = (
+                (batch_keys[1:] != batch_keys[:-1]) | (batch_owners[1:] != batch_owners[:-1])
+            )
+            keys.append(batch_keys[distinct])
+            owners.append(batch_owners[distinct] + start)
+
+        keys = np.concatenate(keys) if keys else np.empty(0, dtype=np.int64)
+        owners = np.concatenate(owners) if owners else np.empty(0, dtype=np.int32)
+
+        # Trigram -> sıralı değer listesi (CSR: gram_keys, offsets, postings).
+        # Parçalar değer sırasında olduğundan trigrama göre stable sıralama
+        # posting listelerini sıralı bırakır
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        self.postings = owners[order]
+        del order, owners
+
+        boundary = np.ones(len(keys), dtype=bool)
+        boundary[1:] = keys[1:] != keys[:-1]
+        starts = np.flatnonzero(boundary)
+        self.gram_keys = keys[starts]
+        self.offsets = np.append(starts, len(keys))
+
+    def matching_values(self, term):
+        """
+        Normalize edilmiş terimi içeren farklı değerlerin indeksleri
+
+        Returns:
+            np.ndarray: Değer indeksleri
+        """
+        if len(term) < NGRAM_SIZE:
+            # Kısa terimlerde trigram yok; farklı değerler taranır
+            return np.array(
+                [i for i, text in enumerate(self.texts) if term in text], dtype=np.int64
+            )
+
+        grams = np.unique(_trigram_keys(term))
+        slots = np.searchsorted(self.gram_keys, grams)
+        found = slots < len(self.gram_keys)
+        found[found] = self.gram_keys[slots[found]] == grams[found]
+        if not found.all():
+            return np.empty(0, dtype=np.int64)
+
+        # En kısa posting listesinden başlayarak kesişim
+        lists = sorted(
+            (self.postings[self.offsets[slot]:self.offsets[slot + 1]] for slot in slots),
+            key=len
+        )
+        candidates = lists[0]
+        for postings in lists[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, postings, assume_unique=True)
+
+        # Trigramların hepsi olsa da sıralı geçmeyebilir: alt metin kontrolü
+        return np.array(
+            [i for i in candidates if term in self.texts[i]], dtype=np.int64
+        )
+
+    def row_mask(self, term):
+        """Terimi içeren satırların bool maskesi"""
+        hit = np.zeros(len(self.texts) + 1, dtype=bool)
+        hit[self.matching_values(term)] = True
+        return hit[self.codes]
+
+
+def _trigram_keys(text):
+    """Tek metnin trigram anahtarları"""
+    points = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    return (
+        (points[:-2] << (2 * _CHAR_BITS)) | (points[1:-1] << _CHAR_BITS) | points[2:]
+    )
+
+
+def _batch_bounds(lengths):
+    """
+    Index parçalarının (başlangıç, bitiş) aralıkları
+
+    Parça en fazla _BUILD_BATCH değer ve (tek başına daha uzun bir değer
+    yoksa) en fazla _BUILD_BATCH_CHARS karakter içerir.
+    """
+    ends = np.cumsum(lengths)
+    start = 0
+    while start < len(lengths):
+        consumed = ends[start - 1] if start else 0
+        stop = int(np.searchsorted(ends, consumed + _BUILD_BATCH_CHARS, side='right'))
+        stop = min(max(stop, start + 1), start + _BUILD_BATCH)
+        yield start, stop
+        start = stop
+
+
+def _trigram_pairs(texts, lengths):
+    """
+    Metin listesinin (trigram anahtarı, metin indeksi) çiftleri
+
+    Metinler tek bir UCS-4 kod noktası dizisine birleştirilip tüm
+    pozisyonlar vektörel olarak anahtarlanır; metin sınırını aşan
+    trigramlar atılır. Bellek toplam karakter sayısıyla orantılıdır.
+    """
+    points = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+    if len(points) < NGRAM_SIZE:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+    points = points.astype(np.int64)
+
+    keys = (
+        (points[:-2] << (2 * _CHAR_BITS)) | (points[1:-1] << _CHAR_BITS) | points[2:]
+    )
+    del points
+    owners = np.repeat(np.arange(len(texts), dtype=np.int32), lengths)[:len(keys)]
+
+    # Her metnin son iki pozisyonundan başlayan trigramlar sonraki metne taşar
+    # (3 karakterden kısa metinlerde bu pozisyonlar önceki metne düşer; onlar
+    # da zaten geçersizdir)
+    valid = np.ones(len(keys), dtype=bool)
+    ends = np.cumsum(lengths)
+    for back in range(1, NGRAM_SIZE):
+        positions = ends - back
+        valid[positions[(positions >= 0) & (positions < len(keys))]] = False
+
+    return keys[valid], owners[valid]
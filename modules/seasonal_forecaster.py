@@ -2,9 +2,19 @@
 Seasonal Forecasting Modülü
 Hierarchical forecast: Product → SubCat → MainGroup
 """
+import os
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from utils.cache import cache_path, file_fingerprint
+from utils.columnar import detect_format, read_columnar
+from utils.constants import CACHE_DIR, SEASONAL_MODEL_VERSION, HISTORICAL_COLUMNS
+
+# Hiyerarşi seviyeleri (fallback sırasıyla)
+SEASONAL_LEVELS = ('product', 'subcat', 'maingroup')
+
+# Seasonal index matrislerinin hafta kolon sayısı (ISO yılı en fazla 53 hafta)
+WEEKS_PER_YEAR = 53
 
 class SeasonalForecaster:
     """
@@ -12,14 +22,22 @@ class SeasonalForecaster:
     Ürün -> SubCat -> MainGroup hiyerarşik fallback ile çalışır
     """
     
-    def __init__(self, historical_data_path=None):
+    def __init__(self, historical_data_path=None, cache_dir=CACHE_DIR):
         """
         Args:
-            historical_data_path: Haftalık historik data CSV yolu
+            historical_data_path: Haftalık historik data yolu (CSV, Parquet veya Arrow)
+            cache_dir: Seasonal model artifact klasörü (None = cache kapalı)
         """
         self.historical_df = None
-        self.seasonal_indices = {}
-        self.promo_impact = {}
+        self.historical_path = None
+        self.cache_dir = cache_dir
+        # Seviye başına key -> satır numarası tablosu ve (entity x 53 hafta) matris
+        self.seasonal_codes = {level: pd.Index([], dtype=object) for level in SEASONAL_LEVELS}
+        self.seasonal_matrices = {
+            level: np.empty((0, WEEKS_PER_YEAR), dtype=np.float32) for level in SEASONAL_LEVELS
+        }
+        # SubCat -> promo lift
+        self.promo_impact = pd.Series(dtype='float64')
         
         if historical_data_path:
             self.load_historical_data(historical_data_path)
@@ -40,28 +58,120 @@ class SeasonalForecaster:
         - promo (1=kampanyalı, 0=normal)
         """
         try:
-            self.historical_df = pd.read_csv(file_path)
+            self.historical_path = file_path
             
-            # Veri validasyonu
-            required_cols = ['MainGroup', 'SubGroupDesc', 'year', 'week', 'sales']
-            missing = [col for col in required_cols if col not in self.historical_df.columns]
+            # Kaynak değişmediyse hesaplanmış modeli diskten yükle
+            fingerprint = None
+            if self.cache_dir:
+                fingerprint = file_fingerprint(file_path, extra=SEASONAL_MODEL_VERSION)
+                if self._load_model_artifact(fingerprint):
+                    print("✅ Seasonal model cache'ten yüklendi")
+                    return
             
-            if missing:
-                raise ValueError(f"Eksik kolonlar: {missing}")
-            
-            # Promo kolonu yoksa ekle
-            if 'promo' not in self.historical_df.columns:
-                self.historical_df['promo'] = 0
+            self.historical_df = self._read_historical_file(file_path)
             
             print(f"✅ Historik veri yüklendi: {len(self.historical_df)} kayıt")
             
             # Seasonal index'leri hesapla
             self.calculate_all_seasonal_indices()
             
+            if fingerprint:
+                self._save_model_artifact(fingerprint)
+            
         except Exception as e:
             print(f"❌ Historik veri yükleme hatası: {e}")
             self.historical_df = None
     
+    def _read_historical_file(self, file_path):
+        """
+        Historik dosyayı oku ve validasyon yap
+        
+        Sadece HISTORICAL_COLUMNS okunur; Parquet/Arrow dosyalarında kolon
+        projeksiyonu dosya seviyesinde yapılır.
+        
+        Returns:
+            pd.DataFrame
+        """
+        file_format = detect_format(file_path)
+        
+        if file_format == 'csv':
+            historical_df = pd.read_csv(
+                file_path, usecols=lambda col: col in HISTORICAL_COLUMNS
+            )
+        else:
+            historical_df = read_columnar(file_path, HISTORICAL_COLUMNS, file_format)
+        
+        # Veri validasyonu
+        required_cols = ['MainGroup', 'SubGroupDesc', 'year', 'week', 'sales']
+        missing = [col for col in required_cols if col not in historical_df.columns]
+        
+        if missing:
+            raise ValueError(f"Eksik kolonlar: {missing}")
+        
+        # Promo kolonu yoksa ekle
+        if 'promo' not in historical_df.columns:
+            historical_df['promo'] = 0
+        
+        return historical_df
+    
+    def _load_model_artifact(self, fingerprint):
+        """
+        Daha önce hesaplanmış seasonal modeli diskten yükle
+        
+        Returns:
+            bool: Geçerli bir artifact bulundu mu?
+        """
+        path = cache_path('seasonal', fingerprint, '.npz', self.cache_dir)
+        if not os.path.exists(path):
+            return False
+        
+        try:
+            with np.load(path, allow_pickle=False) as artifact:
+                if (int(artifact['version']) != SEASONAL_MODEL_VERSION or
+                        str(artifact['fingerprint']) != fingerprint):
+                    return False
+                
+                for level in SEASONAL_LEVELS:
+                    self.seasonal_codes[level] = pd.Index(
+                        artifact[f'{level}_codes'].astype(object), dtype=object
+                    )
+                    self.seasonal_matrices[level] = artifact[f'{level}_matrix']
+                
+                self.promo_impact = pd.Series(
+                    artifact['promo_lifts'],
+                    index=pd.Index(artifact['promo_keys'].astype(object), dtype=object),
+                    dtype='float64'
+                )
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Seasonal model cache okunamadı, yeniden hesaplanacak: {e}")
+            return False
+        
+        return True
+    
+    def _save_model_artifact(self, fingerprint):
+        """
+        Hesaplanmış seasonal index'leri ve promo lift'leri diske yaz
+        """
+        path = cache_path('seasonal', fingerprint, '.npz', self.cache_dir)
+        arrays = {
+            'version': np.array(SEASONAL_MODEL_VERSION),
+            'fingerprint': np.array(fingerprint),
+            'promo_keys': self.promo_impact.index.to_numpy(dtype=str),
+            'promo_lifts': self.promo_impact.to_numpy(dtype=np.float64)
+        }
+        for level in SEASONAL_LEVELS:
+            arrays[f'{level}_codes'] = self.seasonal_codes[level].to_numpy(dtype=str)
+            arrays[f'{level}_matrix'] = self.seasonal_matrices[level]
+        
+        try:
+            # Yarım kalmış dosya okunmasın diye önce geçici dosyaya yaz
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Seasonal model cache yazılamadı: {e}")
+    
     def calculate_all_seasonal_indices(self):
         """
         Tüm seviyelerde (Product, SubCat, MainGroup) seasonal index hesapla
@@ -83,7 +193,8 @@ class SeasonalForecaster:
         # 4. Promo impact hesapla
         self._calculate_promo_impact()
         
-        print(f"✅ Seasonal index hazır: {len(self.seasonal_indices)} grup")
+        total_groups = sum(len(codes) for codes in self.seasonal_codes.values())
+        print(f"✅ Seasonal index hazır: {total_groups} grup")
     
     def _calculate_product_seasonal_index(self):
         """
@@ -93,58 +204,62 @@ class SeasonalForecaster:
             return
         
         # SKU'su olan kayıtları al
-        product_data = self.historical_df[self.historical_df['sku'].notna()].copy()
+        product_data = self.historical_df[self.historical_df['sku'].notna()]
         
         if len(product_data) == 0:
             return
         
-        # Her ürün için haftalık ortalama
-        for sku in product_data['sku'].unique():
-            sku_data = product_data[product_data['sku'] == sku]
-            
-            # Haftalık ortalama satış
-            weekly_avg = sku_data.groupby('week')['sales'].mean()
-            
-            # Yıllık ortalama satış
-            yearly_avg = sku_data['sales'].mean()
-            
-            # Seasonal Index = Haftalık / Yıllık
-            if yearly_avg > 0:
-                seasonal_index = (weekly_avg / yearly_avg).to_dict()
-                self.seasonal_indices[f"product_{sku}"] = seasonal_index
+        self._calculate_grouped_seasonal_index(product_data, 'sku', 'product')
     
     def _calculate_subcat_seasonal_index(self):
         """
         SubCategory bazlı haftalık seasonal index
         """
-        for subcat in self.historical_df['SubGroupDesc'].unique():
-            subcat_data = self.historical_df[
-                self.historical_df['SubGroupDesc'] == subcat
-            ]
-            
-            # Haftalık ortalama
-            weekly_avg = subcat_data.groupby('week')['sales'].mean()
-            yearly_avg = subcat_data['sales'].mean()
-            
-            if yearly_avg > 0:
-                seasonal_index = (weekly_avg / yearly_avg).to_dict()
-                self.seasonal_indices[f"subcat_{subcat}"] = seasonal_index
+        self._calculate_grouped_seasonal_index(self.historical_df, 'SubGroupDesc', 'subcat')
     
     def _calculate_maingroup_seasonal_index(self):
         """
         MainGroup bazlı haftalık seasonal index
         """
-        for maingroup in self.historical_df['MainGroup'].unique():
-            mg_data = self.historical_df[
-                self.historical_df['MainGroup'] == maingroup
-            ]
-            
-            weekly_avg = mg_data.groupby('week')['sales'].mean()
-            yearly_avg = mg_data['sales'].mean()
-            
-            if yearly_avg > 0:
-                seasonal_index = (weekly_avg / yearly_avg).to_dict()
-                self.seasonal_indices[f"maingroup_{maingroup}"] = seasonal_index
+        self._calculate_grouped_seasonal_index(self.historical_df, 'MainGroup', 'maingroup')
+    
+    def _calculate_grouped_seasonal_index(self, data, key_col, level):
+        """
+        Tek groupby ile bir hiyerarşi seviyesindeki tüm grupların index'ini hesapla
+        
+        Args:
+            data: Historik veri
+            key_col: Grup kolonu (sku, SubGroupDesc, MainGroup)
+            level: Hiyerarşi seviyesi (product, subcat, maingroup)
+        """
+        # Grup x hafta ortalama satış
+        weekly_avg = data.groupby([key_col, 'week'])['sales'].mean()
+        
+        # Grup bazlı yıllık ortalama satış
+        yearly_avg = data.groupby(key_col)['sales'].mean()
+        yearly_avg = yearly_avg[yearly_avg > 0]
+        
+        keys = weekly_avg.index.get_level_values(0)
+        weekly_avg = weekly_avg[keys.isin(yearly_avg.index)]
+        
+        # Seasonal Index = Haftalık / Yıllık
+        seasonal_index = weekly_avg / yearly_avg.reindex(
+            weekly_avg.index.get_level_values(0)
+        ).to_numpy()
+        
+        # Entity'leri integer kodla, (entity x hafta) matrise yerleştir
+        codes, keys = pd.factorize(seasonal_index.index.get_level_values(0).astype(str))
+        weeks = seasonal_index.index.get_level_values(1).to_numpy()
+        in_range = (weeks >= 1) & (weeks <= WEEKS_PER_YEAR)
+        
+        # Datası olmayan haftalar NaN kalır (lookup'ta 1.0 kabul edilir)
+        matrix = np.full((len(keys), WEEKS_PER_YEAR), np.nan, dtype=np.float32)
+        matrix[codes[in_range], weeks[in_range].astype('int64') - 1] = (
+            seasonal_index.to_numpy()[in_range]
+        )
+        
+        self.seasonal_codes[level] = pd.Index(keys, dtype=object)
+        self.seasonal_matrices[level] = matrix
     
     def _calculate_promo_impact(self):
         """
@@ -153,21 +268,108 @@ class SeasonalForecaster:
         if self.historical_df is None:
             return
         
-        # Promo vs Normal satış karşılaştırması
-        for subcat in self.historical_df['SubGroupDesc'].unique():
-            subcat_data = self.historical_df[
-                self.historical_df['SubGroupDesc'] == subcat
-            ]
+        # Promo vs Normal satış karşılaştırması (tek groupby)
+        sales = self.historical_df['sales']
+        promo = self.historical_df['promo']
+        subcats = self.historical_df['SubGroupDesc']
+        
+        promo_sales = sales.where(promo == 1).groupby(subcats, dropna=False).mean()
+        normal_sales = sales.where(promo == 0).groupby(subcats, dropna=False).mean()
+        
+        # Promo Lift = Kampanyalı / Normal
+        promo_lift = (promo_sales / normal_sales).where(normal_sales > 0, 1.0)
+        
+        promo_lift.index = promo_lift.index.astype(str)
+        self.promo_impact = promo_lift.astype('float64')
+    
+    def get_seasonal_factors(self, skus=None, subcats=None, maingroups=None,
+                             weeks=None, promo=None):
+        """
+        Ürün listesi için seasonal factor'leri toplu hesapla (hierarchical fallback ile)
+        
+        Her seviye için key'ler integer satır koduna çevrilir ve factor'ler
+        (entity x hafta) matrisinden NumPy fancy indexing ile tek seferde okunur.
+        
+        Args:
+            skus: Ürün kodları (array-like)
+            subcats: Alt kategoriler (array-like)
+            maingroups: Ana gruplar (array-like)
+            weeks: Hafta numarası (skaler veya array-like, None = bu hafta)
+            promo: Kampanyalı mı? (bool array-like)
             
-            promo_sales = subcat_data[subcat_data['promo'] == 1]['sales'].mean()
-            normal_sales = subcat_data[subcat_data['promo'] == 0]['sales'].mean()
+        Returns:
+            pd.DataFrame: factor, source, week, promo_adjusted kolonları
+        """
+        inputs = [x for x in (skus, subcats, maingroups, weeks, promo)
+                  if x is not None and np.ndim(x) > 0]
+        n = len(inputs[0]) if inputs else 1
+        
+        if weeks is None:
+            weeks = datetime.now().isocalendar()[1]
+        weeks = np.broadcast_to(np.asarray(weeks, dtype='int64'), (n,))
+        
+        # Hiçbir data yoksa genel mevsimsellik
+        factors = self._get_default_seasonal_factors(weeks)
+        sources = np.full(n, 'default', dtype=object)
+        resolved = np.zeros(n, dtype=bool)
+        
+        # Product -> SubCat -> MainGroup sırasıyla fallback
+        for level, keys in (('product', skus), ('subcat', subcats), ('maingroup', maingroups)):
+            if keys is None:
+                continue
             
-            # Promo Lift = Kampanyalı / Normal
-            if normal_sales > 0:
-                promo_lift = promo_sales / normal_sales
-                self.promo_impact[f"subcat_{subcat}"] = promo_lift
+            names, valid = self._normalize_keys(keys, n)
+            rows = self.seasonal_codes[level].get_indexer(names)
+            hit = valid & ~resolved & (rows >= 0)
+            
+            if hit.any():
+                hit_weeks = weeks[hit]
+                in_range = (hit_weeks >= 1) & (hit_weeks <= WEEKS_PER_YEAR)
+                level_factors = self.seasonal_matrices[level][
+                    rows[hit], np.clip(hit_weeks, 1, WEEKS_PER_YEAR) - 1
+                ]
+                # Datası olmayan hafta -> 1.0
+                factors[hit] = np.where(
+                    in_range & ~np.isnan(level_factors), level_factors, 1.0
+                )
+                sources[hit] = level
+                resolved |= hit
+        
+        # Kampanya etkisini ekle
+        if promo is None:
+            is_promo = np.zeros(n, dtype=bool)
+        else:
+            is_promo = np.broadcast_to(np.asarray(promo, dtype=bool), (n,))
+        
+        if is_promo.any():
+            if subcats is None:
+                promo_lift = np.full(n, 1.2)
             else:
-                self.promo_impact[f"subcat_{subcat}"] = 1.0
+                names, _ = self._normalize_keys(subcats, n)
+                rows = self.promo_impact.index.get_indexer(names)
+                # Bulunamayan subcat (-1) son elemana, yani default %20 artışa düşer
+                promo_lift = np.append(self.promo_impact.to_numpy(), 1.2)[rows]
+            factors = np.where(is_promo, factors * promo_lift, factors)
+        
+        return pd.DataFrame({
+            'factor': factors,
+            'source': sources,
+            'week': weeks,
+            'promo_adjusted': is_promo
+        })
+    
+    @staticmethod
+    def _normalize_keys(keys, n):
+        """
+        Key kolonunu lookup tablolarıyla aynı string formatına çevir
+        
+        Returns:
+            tuple: (string key array, geçerli (boş olmayan) key maskesi)
+        """
+        keys = pd.Series(np.broadcast_to(np.asarray(keys, dtype=object), (n,)))
+        names = keys.astype(str).to_numpy()
+        valid = (keys.notna() & (names != '')).to_numpy()
+        return names, valid
     
     def get_seasonal_factor(self, sku=None, subcat=None, maingroup=None, 
                            week=None, is_promo=False):
@@ -188,40 +390,17 @@ class SeasonalForecaster:
             # Şu anki hafta numarasını al
             week = datetime.now().isocalendar()[1]
         
-        seasonal_factor = 1.0
-        
-        # 1. Önce ürün seviyesinde ara
-        if sku and f"product_{sku}" in self.seasonal_indices:
-            seasonal_index = self.seasonal_indices[f"product_{sku}"]
-            seasonal_factor = seasonal_index.get(week, 1.0)
-            source = "product"
-        
-        # 2. Yoksa SubCat seviyesinde
-        elif subcat and f"subcat_{subcat}" in self.seasonal_indices:
-            seasonal_index = self.seasonal_indices[f"subcat_{subcat}"]
-            seasonal_factor = seasonal_index.get(week, 1.0)
-            source = "subcat"
-        
-        # 3. Yoksa MainGroup seviyesinde
-        elif maingroup and f"maingroup_{maingroup}" in self.seasonal_indices:
-            seasonal_index = self.seasonal_indices[f"maingroup_{maingroup}"]
-            seasonal_factor = seasonal_index.get(week, 1.0)
-            source = "maingroup"
-        
-        else:
-            # Hiçbir data yok, genel mevsimsellik kullan
-            seasonal_factor = self._get_default_seasonal_factor(week)
-            source = "default"
-        
-        # Kampanya etkisini ekle
-        if is_promo:
-            promo_key = f"subcat_{subcat}" if subcat else None
-            promo_lift = self.promo_impact.get(promo_key, 1.2)  # Default %20 artış
-            seasonal_factor *= promo_lift
+        seasonal_info = self.get_seasonal_factors(
+            skus=[sku],
+            subcats=[subcat],
+            maingroups=[maingroup],
+            weeks=week,
+            promo=[bool(is_promo)]
+        ).iloc[0]
         
         return {
-            'factor': seasonal_factor,
-            'source': source,
+            'factor': float(seasonal_info['factor']),
+            'source': seasonal_info['source'],
             'week': week,
             'promo_adjusted': is_promo
         }
@@ -245,6 +424,21 @@ class SeasonalForecaster:
         else:
             return 1.0
     
+    def _get_default_seasonal_factors(self, weeks):
+        """
+        _get_default_seasonal_factor'ün vektörel versiyonu
+        """
+        weeks = np.asarray(weeks)
+        return np.select(
+            [
+                (weeks >= 44) & (weeks <= 47),
+                (weeks >= 1) & (weeks <= 4),
+                (weeks >= 22) & (weeks <= 35)
+            ],
+            [1.5, 0.7, 0.9],
+            default=1.0
+        )
+    
     def forecast_next_weeks(self, sku=None, subcat=None, maingroup=None,
                            base_daily_sales=10, weeks_ahead=4, is_promo=False):
         """
@@ -297,6 +491,14 @@ class SeasonalForecaster:
         Returns:
             float: YoY growth rate (0.2 = %20 artış)
         """
+        # Model cache'ten yüklendiyse ham veriyi sadece gerektiğinde oku
+        if self.historical_df is None and self.historical_path:
+            try:
+                self.historical_df = self._read_historical_file(self.historical_path)
+            except Exception as e:
+                print(f"❌ Historik veri yükleme hatası: {e}")
+                self.historical_path = None
+        
         if self.historical_df is None:
             return 0.0
         
@@ -327,22 +529,18 @@ class SeasonalForecaster:
         Returns:
             dict: Hafta bazlı toplam seasonal index
         """
-        if not self.seasonal_indices:
+        matrices = [m for m in self.seasonal_matrices.values() if len(m) > 0]
+        if not matrices:
             return {}
         
-        # Tüm kategorilerin ortalaması
-        all_weeks = {}
-        
-        for key, indices in self.seasonal_indices.items():
-            for week, factor in indices.items():
-                if week not in all_weeks:
-                    all_weeks[week] = []
-                all_weeks[week].append(factor)
+        # Tüm kategorilerin ortalaması (sadece datası olan haftalar)
+        all_indices = np.vstack(matrices).astype(np.float64)
+        has_data = ~np.isnan(all_indices).all(axis=0)
         
         # Her hafta için ortalama
         avg_seasonal = {
-            week: np.mean(factors) 
-            for week, factors in all_weeks.items()
+            week: np.nanmean(all_indices[:, week - 1])
+            for week in np.flatnonzero(has_data) + 1
         }
         
         return avg_seasonal
@@ -0,0 +1,78 @@
+"""
+Segment Index - Segment üyeliklerinin tek kopyalık pozisyon indeksi
+"""
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+from utils.constants import SEGMENT_NAMES
+from modules.filter_engine import FilterEngine, FilterView
+
+
+class SegmentIndex(Mapping):
+    """
+    Segment adı -> ürün satırları eşlemesi
+
+    Üyelik bir kez (categorical kod dizisi + koda göre sıralı pozisyonlar)
+    saklanır; bellekte segment başına kopya tutulmaz. index[name] her
+    erişimde segmentin DataFrame kopyasını oluşturur (copy-on-access);
+    tekrar eden erişimlerde kopyasız view(name) kullanılmalı ve DataFrame
+    sadece gösterim anında materialize edilmelidir.
+    """
+
+    def __init__(self, df, column='segment', names=SEGMENT_NAMES, engine=None):
+        """
+        Args:
+            df: Segment kolonu olan ürün dataframe
+            column: Segment kolonu
+            names: Segment isimleri (iterasyon sırası)
+            engine: df üzerindeki FilterEngine (yoksa oluşturulur)
+        """
+        self.df = df
+        self.names = list(names)
+        self.engine = engine if engine is not None else FilterEngine(df)
+
+        segments = pd.Categorical(df[column], categories=self.names)
+        self.codes = segments.codes
+
+        # Stable sort: segment içindeki satırlar orijinal sırayı korur
+        self.order = np.argsort(self.codes, kind='stable')
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.names))
+        start = int((self.codes < 0).sum())
+        self.bounds = start + np.concatenate(([0], np.cumsum(counts)))
+
+    def positions(self, name):
+        """
+        Segmentteki satırların pozisyonları (orijinal sırada)
+
+        Returns:
+            np.ndarray: df.iloc ile kullanılabilecek pozisyonlar
+        """
+        code = self.names.index(name)
+        return self.order[self.bounds[code]:self.bounds[code + 1]]
+
+    def count(self, name):
+        """Segmentteki ürün sayısı"""
+        code = self.names.index(name)
+        return int(self.bounds[code + 1] - self.bounds[code])
+
+    def view(self, name):
+        """
+        Segmentin kopyasız görünümü
+
+        Returns:
+            FilterView: filter / sort_values / slice ile daraltılabilir,
+            DataFrame materialize ile oluşur
+        """
+        if name not in self.names:
+            raise KeyError(name)
+        return FilterView(self.engine, self.positions(name))
+
+    def __getitem__(self, name):
+        """Segmentin DataFrame'i (her erişimde yeni kopya; bkz. view)"""
+        return self.view(name).materialize()
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
@@ -0,0 +1,141 @@
+"""
+Segment Önizleme - Eşik değişikliklerinin segment dağılımına etkisi
+
+Kural kolonları bir kez sıralanır; her eşik koşulu ikili arama ile
+çözülür ve maskeleri saklanır. Eşik değiştikçe sadece değişen koşulun
+maskesi yeniden oluşturulur, segment_products tüm tabloda çalıştırılmaz.
+"""
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from utils.constants import SEGMENT_NAMES
+from modules.segment_rules import (
+    SEGMENT_RULE_COLUMNS, assign_segment_codes, combine_clauses, resolve_segment_rules
+)
+
+# Saklanacak en fazla koşul / segment maskesi sayısı (LRU)
+MASK_CACHE_SIZE = 64
+
+
+class SegmentPreview:
+    """Sıralı eşik dizileri ile hızlı segment sayımı"""
+
+    def __init__(self, df):
+        """
+        Args:
+            df: Metrikleri hesaplanmış ürün dataframe (SEGMENT_RULE_COLUMNS)
+        """
+        self.df = df
+        self.n = len(df)
+        self.stock_value = (df['total_stock'] * df['price']).to_numpy(dtype=np.float64)
+
+        # Kolon -> (sıralı pozisyonlar, sıralı değerler, NaN olmayan değer sayısı)
+        self.sorted_columns = {}
+        for column in SEGMENT_RULE_COLUMNS:
+            values = df[column].to_numpy(dtype=np.float64)
+            order = np.argsort(values, kind='stable')
+            sorted_values = values[order]
+            valid = len(sorted_values) - int(np.isnan(sorted_values).sum())
+            self.sorted_columns[column] = (order, sorted_values, valid)
+
+        self._mask_cache = OrderedDict()
+        self._segment_cache = OrderedDict()
+
+    def clause_mask(self, column, op, threshold):
+        """
+        Tek eşik koşulunun bool maskesi (ikili arama + cache)
+
+        Args:
+            column: Kural kolonu
+            op: '>', '>=', '<' veya '<='
+            threshold: Eşik değeri
+
+        Returns:
+            np.ndarray: n uzunluğunda bool maske (değiştirilmemeli)
+        """
+        key = (column, op, float(threshold))
+        if key in self._mask_cache:
+            self._mask_cache.move_to_end(key)
+            return self._mask_cache[key]
+
+        order, sorted_values, valid = self.sorted_columns[column]
+        values = sorted_values[:valid]
+
+        # NaN değerler hiçbir koşulu sağlamaz (sıralamada en sonda)
+        if op == '>':
+            selected = order[np.searchsorted(values, threshold, side='right'):valid]
+        elif op == '>=':
+            selected = order[np.searchsorted(values, threshold, side='left'):valid]
+        elif op == '<':
+            selected = order[:np.searchsorted(values, threshold, side='left')]
+        elif op == '<=':
+            selected = order[:np.searchsorted(values, threshold, side='right')]
+        else:
+            raise ValueError(f"Bilinmeyen operatör: {op}")
+
+        mask = np.zeros(self.n, dtype=bool)
+        mask[selected] = True
+
+        _cache_put(self._mask_cache, key, mask)
+
+        return mask
+
+    def segment_mask(self, combine, clauses):
+        """
+        Bir segment kuralının birleştirilmiş maskesi (cache)
+
+        Eşikleri değişmeyen segmentlerin maskeleri tekrar hesaplanmaz.
+        """
+        key = (combine, tuple((column, op, float(threshold)) for column, op, threshold in clauses))
+        if key in self._segment_cache:
+            self._segment_cache.move_to_end(key)
+            return self._segment_cache[key]
+
+        mask = combine_clauses(combine, clauses, self.clause_mask)
+        _cache_put(self._segment_cache, key, mask)
+
+        return mask
+
+    def segment_codes(self, segment_params):
+        """
+        Verilen parametrelerle segment kodları (segment_products ile aynı kurallar)
+
+        Returns:
+            np.ndarray: SEGMENT_NAMES indeksleri
+        """
+        rules = resolve_segment_rules(segment_params)
+        return assign_segment_codes(
+            (
+                (segment, self.segment_mask(combine, clauses))
+                for segment, (combine, clauses) in rules.items()
+            ),
+            self.n
+        )
+
+    def preview(self, segment_params):
+        """
+        Segment başına ürün sayısı ve stok değeri
+
+        Args:
+            segment_params: Segment -> parametre dict'i
+
+        Returns:
+            pd.DataFrame: segment, count, stock_value (SEGMENT_NAMES sırasıyla)
+        """
+        codes = self.segment_codes(segment_params)
+
+        counts = np.bincount(codes, minlength=len(SEGMENT_NAMES))
+        stock_value = np.bincount(codes, weights=self.stock_value, minlength=len(SEGMENT_NAMES))
+
+        return pd.DataFrame({
+            'segment': SEGMENT_NAMES,
+            'count': counts,
+            'stock_value': stock_value
+        })
+
+
+def _cache_put(cache, key, value):
+    """LRU cache'e ekle, sınır aşılırsa en eskiyi at"""
+    cache[key] = value
+    if len(cache) > MASK_CACHE_SIZE:
+        cache.popitem(last=False)
@@ -0,0 +1,114 @@
+"""
+Segment Kuralları - segment_products ve segment önizlemesi için ortak tablo
+"""
+import operator
+import numpy as np
+from utils.constants import SEGMENT_NAMES
+
+# Segment kuralları (öncelik sırasıyla; ürün ilk eşleştiği segmente girer)
+# segment -> (birleştirme, [(kolon, operatör, parametre, default), ...])
+# parametre None ise default sabit eşik olarak kullanılır
+SEGMENT_RULES = {
+    'HOT': ('all', [
+        ('velocity_score', '>', 'velocity_min', 1.5),
+        ('trend_score', '>', 'trend_min', 1.3),
+        ('daily_sales_avg_7d', '>', 'daily_sales_min', 15)
+    ]),
+    'RISING_STAR': ('all', [
+        ('velocity_score', '>', 'velocity_min', 1.2),
+        ('velocity_score', '<=', 'velocity_max', 1.5),
+        ('trend_score', '>', 'trend_min', 1.2),
+        ('engagement_score', '>', 'engagement_min', 5)
+    ]),
+    'STEADY': ('all', [
+        ('velocity_score', '>=', 'velocity_min', 0.8),
+        ('velocity_score', '<=', 'velocity_max', 1.2),
+        ('daily_sales_avg_30d', '>', 'daily_sales_min', 5),
+        ('stock_out_days_last_30d', '<', 'stockout_max', 3)
+    ]),
+    'SLOW': ('all', [
+        ('daily_sales_avg_7d', '<', 'daily_sales_max', 5),
+        ('daily_sales_avg_7d', '>', None, 0),
+        ('velocity_score', '>=', 'velocity_min', 0.5)
+    ]),
+    'DYING': ('any', [
+        ('velocity_score', '<', 'velocity_max', 0.5),
+        ('days_of_stock', '>', 'stock_days_min', 60)
+    ])
+}
+
+# Kurallarda kullanılan kolonlar
+SEGMENT_RULE_COLUMNS = list(dict.fromkeys(
+    column for _, clauses in SEGMENT_RULES.values() for column, _, _, _ in clauses
+))
+
+# Kural operatörleri
+RULE_OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le
+}
+
+
+def resolve_segment_rules(segment_params):
+    """
+    Kural tablosundaki parametreleri segment parametreleriyle doldur
+
+    Args:
+        segment_params: Segment -> parametre dict'i
+
+    Returns:
+        dict: segment -> (birleştirme, [(kolon, operatör, eşik), ...])
+    """
+    rules = {}
+    for segment, (combine, clauses) in SEGMENT_RULES.items():
+        params = segment_params.get(segment, {})
+        rules[segment] = (combine, [
+            (column, op, default if key is None else params.get(key, default))
+            for column, op, key, default in clauses
+        ])
+    return rules
+
+
+def combine_clauses(combine, clauses, clause_mask):
+    """
+    Bir segmentin koşul maskelerini birleştir
+
+    Args:
+        combine: 'all' (ve) veya 'any' (veya)
+        clauses: [(kolon, operatör, eşik), ...]
+        clause_mask: (kolon, operatör, eşik) -> bool dizi
+
+    Returns:
+        np.ndarray: Segment kuralını sağlayan ürünler (yeni dizi)
+    """
+    reduce = np.logical_and if combine == 'all' else np.logical_or
+    mask = clause_mask(*clauses[0]).copy()
+    for clause in clauses[1:]:
+        reduce(mask, clause_mask(*clause), out=mask)
+    return mask
+
+
+def assign_segment_codes(segment_masks, n):
+    """
+    Segment maskelerini öncelik sırasıyla uygula, segment kodlarını döndür
+
+    Args:
+        segment_masks: Öncelik sırasıyla (segment, bool maske) çiftleri
+        n: Ürün sayısı
+
+    Returns:
+        np.ndarray: SEGMENT_NAMES indeksleri (int8; eşleşmeyen UNCLASSIFIED)
+    """
+    codes = np.full(n, SEGMENT_NAMES.index('UNCLASSIFIED'), dtype=np.int8)
+    delta = np.empty(n, dtype=np.int8)
+
+    # Düşük öncelikten yükseğe: sonra yazılan (öncelikli) segment kazanır.
+    # codes -= mask * (codes - kod) maskeli atamadan çok daha hızlıdır.
+    for segment, mask in reversed(list(segment_masks)):
+        np.subtract(codes, SEGMENT_NAMES.index(segment), out=delta)
+        np.multiply(delta, mask.view(np.int8), out=delta)
+        np.subtract(codes, delta, out=codes)
+
+    return codes
@@ -15,6 +15,7 @@ class Visualizations:
     def segment_pie_chart(df):
         """Segment dağılımı pasta grafik"""
         segment_counts = df['segment'].value_counts()
+        segment_counts = segment_counts[segment_counts > 0]
         
         colors = [SEGMENT_COLORS.get(seg, '#CCCCCC') for seg in segment_counts.index]
         labels = [f"{SEGMENT_EMOJI.get(seg, '❓')} {seg}" for seg in segment_counts.index]
@@ -88,19 +89,15 @@ class Visualizations:
         return fig
     
     @staticmethod
-    def category_performance_bar(df):
-        """Kategori performansı grouped bar"""
-        category_perf = df.groupby('category').agg({
-            'daily_sales_avg_7d': 'sum',
-            'total_stock': 'sum'
-        }).reset_index()
+    def category_performance_bar(category_perf):
+        """Kategori performansı grouped bar (AnalyticsEngine.get_category_performance)"""
         
         fig = make_subplots(specs=[[{"secondary_y": True}]])
         
         fig.add_trace(
             go.Bar(
                 x=category_perf['category'],
-                y=category_perf['daily_sales_avg_7d'],
+                y=category_perf['daily_sales'],
                 name='Günlük Satış',
                 marker_color='#2196F3'
             ),
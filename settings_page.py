@@ -4,13 +4,27 @@ Ayarlar Sayfası - Sistem Parametrelerini Düzenleme*
 import streamlit as st
 import pandas as pd
 import copy
+import json
 from utils.constants import (
     DEFAULT_SEGMENT_PARAMS, 
     METRIC_WEIGHTS, 
     TRANSFER_LEAD_TIME_DAYS,
     SEGMENT_EMOJI
 )
-from utils.helpers import show_success, show_warning, show_info
+from utils.ui import show_success, show_warning, show_info
+from modules.segment_preview import SegmentPreview
+
+# Segment eşik girişleri: parametre -> (etiket, max değer, adım)
+SEGMENT_THRESHOLD_INPUTS = {
+    'velocity_min': ("Velocity Min", 5.0, 0.1),
+    'velocity_max': ("Velocity Max", 5.0, 0.1),
+    'trend_min': ("Trend Min", 5.0, 0.1),
+    'daily_sales_min': ("Günlük Satış Min", 1000.0, 1.0),
+    'daily_sales_max': ("Günlük Satış Max", 1000.0, 1.0),
+    'engagement_min': ("Engagement Min", 100.0, 0.5),
+    'stockout_max': ("Stoksuz Gün Max", 30.0, 1.0),
+    'stock_days_min': ("Stok Günü Min", 365.0, 1.0)
+}
 
 def show_settings_page():
     """Ayarlar sayfası ana fonksiyonu"""
@@ -181,6 +195,7 @@ def show_segment_settings():
     - Safety Stock Days: Güvenlik stoğu (gün)
     - Allocation %: Akyazı'da olması gereken oran
     - Markdown Day: Markdown başlatma günü
+    - Segmentasyon Eşikleri: Değişikliğin etkisi kaydetmeden önizlenir
     """)
     
     # Segment seçimi
@@ -259,25 +274,21 @@ def show_segment_settings():
         
         st.markdown("**Segmentasyon Eşikleri:**")
         
-        if 'velocity_min' in params:
-            velocity_min = st.number_input(
-                "Velocity Min",
-                min_value=0.0,
-                max_value=5.0,
-                value=params.get('velocity_min', 1.0),
-                step=0.1,
-                key=f'vel_min_{selected_segment}'
-            )
-        
-        if 'velocity_max' in params:
-            velocity_max = st.number_input(
-                "Velocity Max",
-                min_value=0.0,
-                max_value=5.0,
-                value=params.get('velocity_max', 2.0),
-                step=0.1,
-                key=f'vel_max_{selected_segment}'
-            )
+        thresholds = {}
+        for key, (label, max_value, step) in SEGMENT_THRESHOLD_INPUTS.items():
+            if key in params:
+                thresholds[key] = st.number_input(
+                    label,
+                    min_value=0.0,
+                    max_value=max_value,
+                    value=float(params[key]),
+                    step=step,
+                    key=f'{key}_{selected_segment}'
+                )
+    
+    # Eşiklerin segment dağılımına etkisi (kaydetmeden önce)
+    if st.session_state.get('data_loaded'):
+        show_segment_preview(selected_segment, thresholds)
     
     st.divider()
     
@@ -294,10 +305,7 @@ def show_segment_settings():
             st.session_state.custom_segment_params[selected_segment]['auto_transfer'] = auto_transfer
             st.session_state.custom_segment_params[selected_segment]['depot_priority'] = depot_priority
             
-            if 'velocity_min' in params:
-                st.session_state.custom_segment_params[selected_segment]['velocity_min'] = velocity_min
-            if 'velocity_max' in params:
-                st.session_state.custom_segment_params[selected_segment]['velocity_max'] = velocity_max
+            st.session_state.custom_segment_params[selected_segment].update(thresholds)
             
             show_success(f"{selected_segment} parametreleri kaydedildi!")
             st.rerun()
@@ -315,6 +323,48 @@ def show_segment_settings():
         st.json(st.session_state.custom_segment_params[selected_segment])
 
 
+def get_segment_preview():
+    """Yüklü analiz için segment önizleme motoru (veri değişene kadar saklanır)"""
+    
+    analytics = st.session_state.analytics
+    preview = st.session_state.get('segment_preview')
+    
+    if preview is None or preview.df is not analytics.df:
+        preview = SegmentPreview(analytics.df)
+        st.session_state.segment_preview = preview
+    
+    return preview
+
+
+def show_segment_preview(selected_segment, thresholds):
+    """Düzenlenen eşiklerle segment başına ürün sayısı ve stok değeri"""
+    
+    st.markdown("#### 👁️ Önizleme: Segment Dağılımı")
+    
+    preview = get_segment_preview()
+    saved_params = st.session_state.custom_segment_params
+    
+    edited_params = copy.deepcopy(saved_params)
+    edited_params[selected_segment].update(thresholds)
+    
+    current = preview.preview(saved_params)
+    edited = preview.preview(edited_params)
+    
+    preview_df = pd.DataFrame({
+        'Segment': [f"{SEGMENT_EMOJI.get(name, '❓')} {name}" for name in edited['segment']],
+        'Kayıtlı': current['count'],
+        'Önizleme': edited['count'],
+        'Fark': edited['count'] - current['count'],
+        'Stok Değeri': edited['stock_value']
+    })
+    
+    st.dataframe(
+        preview_df.style.format({'Stok Değeri': '₺{:,.0f}', 'Fark': '{:+,d}'}),
+        use_container_width=True,
+        hide_index=True
+    )
+
+
 def show_metric_weights_settings():
     """Metrik ağırlıkları ayarlama"""
     
@@ -387,11 +437,17 @@ def show_metric_weights_settings():
             key='stockout_weight'
         )
     
+    slider_weights = {
+        'velocity_score': velocity_weight,
+        'trend_score': trend_weight,
+        'engagement_score': engagement_weight,
+        'conversion_rate': conversion_weight,
+        'quality_score': quality_weight,
+        'stockout_penalty': stockout_weight
+    }
+    
     # Toplam kontrol
-    total_weight = (
-        velocity_weight + trend_weight + engagement_weight +
-        conversion_weight + quality_weight + stockout_weight
-    )
+    total_weight = sum(slider_weights.values())
     
     st.divider()
     
@@ -406,14 +462,8 @@ def show_metric_weights_settings():
     with col2:
         if total_weight == 100:
             if st.button("💾 Ağırlıkları Kaydet", key='save_weights'):
-                st.session_state.custom_metric_weights = {
-                    'velocity_score': velocity_weight,
-                    'trend_score': trend_weight,
-                    'engagement_score': engagement_weight,
-                    'conversion_rate': conversion_weight,
-                    'quality_score': quality_weight,
-                    'stockout_penalty': stockout_weight
-                }
+                st.session_state.custom_metric_weights = slider_weights
+                apply_metric_weights(slider_weights)
                 show_success("Metrik ağırlıkları kaydedildi!")
                 st.rerun()
         else:
@@ -422,9 +472,25 @@ def show_metric_weights_settings():
     # Varsayılana dön
     if st.button("🔄 Varsayılan Ağırlıklara Dön", key='reset_weights'):
         st.session_state.custom_metric_weights = copy.deepcopy(METRIC_WEIGHTS)
+        apply_metric_weights(METRIC_WEIGHTS)
         show_success("Ağırlıklar varsayılan değerlere döndürüldü!")
         st.rerun()
     
+    # Canlı önizleme (yüklü veri üzerinde, pipeline yeniden çalışmadan)
+    if st.session_state.get('data_loaded') and total_weight == 100:
+        st.divider()
+        st.markdown("### 🔥 Önizleme: Bu Ağırlıklarla Top 10")
+        
+        analytics = st.session_state.analytics
+        top_scores = analytics.score(slider_weights).nlargest(10)
+        
+        preview_df = analytics.df.loc[
+            top_scores.index, ['sku', 'product_name', 'category', 'segment', 'final_score']
+        ]
+        preview_df.insert(4, 'new_score', top_scores.to_numpy())
+        
+        st.dataframe(preview_df, use_container_width=True, hide_index=True)
+    
     # Grafik gösterimi
     st.divider()
     
@@ -441,6 +507,16 @@ def show_metric_weights_settings():
     st.bar_chart(weights_df.set_index('Metrik'))
 
 
+def apply_metric_weights(weights):
+    """Yüklü analizi yeni ağırlıklarla yeniden skorla (metrikler tekrar hesaplanmaz)"""
+    
+    if not st.session_state.get('data_loaded'):
+        return
+    
+    analytics = st.session_state.analytics
+    st.session_state.df = analytics.rescore(weights)
+
+
 def show_risk_levels_settings():
     """Risk seviyesi ayarları"""
     
@@ -562,42 +638,46 @@ def show_save_reset_settings():
         if st.button("🔄 Analizi Yeniden Çalıştır", use_container_width=True, type="primary"):
             if st.session_state.data_loaded:
                 with st.spinner("Analiz yeniden çalıştırılıyor..."):
-                    from modules.analytics_engine import AnalyticsEngine
-                    from modules.allocation_optimizer import AllocationOptimizer
-                    from modules.alert_manager import AlertManager
-                    
-                    df = st.session_state.df
+                    from modules.analysis_pipeline import AnalysisPipeline
+                    from utils.profiling import MemoryBudgetExceeded
                     
-                    # Yeni parametrelerle analiz
-                    analytics = AnalyticsEngine(
-                        df,
-                        segment_params=st.session_state.custom_segment_params
-                    )
-                    df = analytics.calculate_all_metrics()
-                    df = analytics.segment_products()
+                    if 'pipeline' not in st.session_state:
+                        st.session_state.pipeline = AnalysisPipeline()
+                    pipeline = st.session_state.pipeline
                     
-                    # Allocation optimizer
-                    optimizer = AllocationOptimizer(
-                        df,
-                        segment_params=st.session_state.custom_segment_params,
-                        transfer_lead_time=st.session_state.custom_transfer_lead_time
-                    )
-                    allocation_df = optimizer.generate_allocation_strategy()
+                    # Yeni parametrelerle analiz (yüklü katalog tekrar okunmaz;
+                    # parametresi değişmeyen aşamalar cache'ten gelir)
+                    try:
+                        result = pipeline.run(
+                            segment_params=st.session_state.custom_segment_params,
+                            metric_weights=st.session_state.custom_metric_weights,
+                            transfer_lead_time=st.session_state.custom_transfer_lead_time,
+                            reuse_loaded=True,
+                            capture_profile=st.session_state.get('capture_profile', False),
+                            track_memory=st.session_state.get('track_memory', False),
+                            memory_budget_mb=st.session_state.get('memory_budget_mb')
+                        )
+                    except MemoryBudgetExceeded as e:
+                        show_warning(str(e))
+                        return
                     
-                    # Alerts
-                    alert_mgr = AlertManager(df, allocation_df)
-                    alerts_df = alert_mgr.generate_all_alerts()
+                    if result is None:
+                        show_warning("⚠️ Veri yüklenemedi!")
+                        return
                     
                     # Session state'i güncelle
-                    st.session_state.df = df
-                    st.session_state.allocation_df = allocation_df
-                    st.session_state.alerts_df = alerts_df
-                    st.session_state.analytics = analytics
-                    st.session_state.optimizer = optimizer
-                    st.session_state.alert_mgr = alert_mgr
+                    st.session_state.df = result['df']
+                    st.session_state.allocation_df = result['allocation_df']
+                    st.session_state.alerts_df = result['alerts_df']
+                    st.session_state.analytics = result['analytics']
+                    st.session_state.optimizer = result['optimizer']
+                    st.session_state.alert_mgr = result['alert_mgr']
                     
-                    show_success("✅ Analiz yeni parametrelerle tamamlandı!")
-                    st.balloons()
+                    if pipeline.executed:
+                        show_success("✅ Analiz yeni parametrelerle tamamlandı!")
+                        st.balloons()
+                    else:
+                        show_info("Parametreler değişmedi, mevcut analiz kullanıldı")
             else:
                 show_warning("⚠️ Önce veri yükleyin!")
     
@@ -619,6 +699,7 @@ def show_save_reset_settings():
             # Onay dialogu
             st.session_state.custom_segment_params = copy.deepcopy(DEFAULT_SEGMENT_PARAMS)
             st.session_state.custom_metric_weights = copy.deepcopy(METRIC_WEIGHTS)
+            apply_metric_weights(METRIC_WEIGHTS)
             st.session_state.custom_transfer_lead_time = TRANSFER_LEAD_TIME_DAYS
             st.session_state.custom_risk_levels = {
                 'critical_stock_days': 3,
@@ -666,3 +747,18 @@ def show_save_reset_settings():
     
     with tab4:
         st.json(st.session_state.custom_risk_levels)
+    
+    # Ayar profili (komut satırı: python shipment_optimizer.py --profile ayar_profili.json)
+    profile = {
+        'transfer_lead_time': st.session_state.custom_transfer_lead_time,
+        'segment_params': st.session_state.custom_segment_params,
+        'metric_weights': st.session_state.custom_metric_weights,
+        'risk_levels': st.session_state.custom_risk_levels
+    }
+    st.download_button(
+        "📥 Ayar Profilini İndir (JSON)",
+        json.dumps(profile, ensure_ascii=False, indent=2).encode('utf-8'),
+        "ayar_profili.json",
+        "application/json",
+        key='download-profile'
+    )
@@ -0,0 +1,174 @@
+"""
+🚀 E-Commerce Sevkiyat Optimizasyon Sistemi
+Komut Satırı (Headless) Çalıştırıcı
+
+Streamlit olmadan yükleme -> metrikler -> segmentasyon -> allocation ->
+alert aşamalarını çalıştırır, önerileri CSV olarak yazar ve aşama
+sürelerini gösterir (ör. gece çalışan sevkiyat planı).
+
+Kullanım:
+    python shipment_optimizer.py --input data/sample_data.csv --output output
+    python shipment_optimizer.py --input katalog.parquet --profile ayar_profili.json
+"""
+import argparse
+import os
+import sys
+import pandas as pd
+from modules.analysis_pipeline import AnalysisPipeline, load_settings_profile
+from utils.constants import CSV_CHUNK_SIZE, MEMORY_BUDGET_MB
+from utils.profiling import MemoryBudgetExceeded
+
+# Çıktı dosyaları -> sonuç tablosu
+OUTPUT_FILES = {
+    'transfer_recommendations.csv': lambda result: result['optimizer'].get_transfer_recommendations(
+        min_transfer=1, priority='all'
+    ),
+    'reorder_recommendations.csv': lambda result: result['optimizer'].get_reorder_recommendations(),
+    'markdown_candidates.csv': lambda result: result['optimizer'].get_markdown_candidates(),
+    'critical_alerts.csv': lambda result: result['alerts_df']
+}
+
+# Yükleme mesajlarının önekleri (success mesajları kendi emoji'sini taşır)
+MESSAGE_PREFIX = {
+    'success': '',
+    'info': 'ℹ️ ',
+    'warning': '⚠️ ',
+    'error': '❌ '
+}
+
+
+def parse_args(argv=None):
+    """Komut satırı argümanları"""
+    parser = argparse.ArgumentParser(
+        description="Sevkiyat optimizasyonu (arayüzsüz): transfer, sipariş, markdown ve alert çıktıları"
+    )
+    parser.add_argument(
+        '--input', default=None,
+        help="Katalog dosyası (.csv, .parquet, .feather, .arrow); verilmezse örnek veri"
+    )
+    parser.add_argument(
+        '--historical', default=None,
+        help="Historik satış dosyası (verilmezse data/ altındaki ilk bulunan)"
+    )
+    parser.add_argument(
+        '--profile', default=None,
+        help="Ayar profili (ayarlar sayfasından indirilen JSON)"
+    )
+    parser.add_argument(
+        '--output', default='output',
+        help="Çıktı klasörü (varsayılan: output)"
+    )
+    parser.add_argument(
+        '--cprofile', default=None, metavar='PSTATS',
+        help="Aşamaları cProfile ile profille ve sonucu bu .pstats dosyasına yaz"
+    )
+    parser.add_argument(
+        '--track-memory', action='store_true',
+        help="Aşamaların tepe / kalıcı belleğini ölç (tracemalloc, yavaşlatır)"
+    )
+    parser.add_argument(
+        '--memory-budget', type=float, default=MEMORY_BUDGET_MB, metavar='MB',
+        help="Bellek bütçesi (MB); aşılacaksa çalıştırma erken durur (0 = sınırsız)"
+    )
+    parser.add_argument(
+        '--chunksize', type=int, default=CSV_CHUNK_SIZE,
+        help=f"CSV streaming parça boyutu (varsayılan: {CSV_CHUNK_SIZE})"
+    )
+    args = parser.parse_args(argv)
+
+    for path in (args.input, args.historical, args.profile):
+        if path and not os.path.exists(path):
+            parser.error(f"Dosya bulunamadı: {path}")
+
+    return args
+
+
+def write_outputs(result, output_dir):
+    """
+    Öneri tablolarını CSV olarak yaz
+
+    Returns:
+        dict: Dosya adı -> satır sayısı
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    rows = {}
+    for filename, build in OUTPUT_FILES.items():
+        table = build(result)
+        table.to_csv(os.path.join(output_dir, filename), index=False, encoding='utf-8-sig')
+        rows[filename] = len(table)
+
+    return rows
+
+
+def print_stage_summary(profiler):
+    """Aşama süreleri, satır/sn ve (bellek takibinde) tepe / kalıcı bellek"""
+    summary = profiler.summary()
+
+    print("\n⏱️ Aşama süreleri:")
+    for row in summary.to_dict('records'):
+        rows = f"{row['rows']:>10,.0f} satır" if pd.notna(row['rows']) else ' ' * 16
+        rate = f"{row['rows_per_sec']:12,.0f} satır/sn" if pd.notna(row['rows_per_sec']) else ' ' * 21
+        memory = (
+            f"  tepe {row['peak_mb']:8.1f} MB  kalıcı {row['retained_mb']:8.1f} MB"
+            if 'peak_mb' in row else ''
+        )
+        print(f"   {row['stage']:<10} {row['seconds']:8.3f} s {rows} {rate}{memory}")
+    print(f"   {'toplam':<10} {summary['seconds'].sum():8.3f} s")
+
+
+def main(argv=None):
+    """
+    Pipeline'ı çalıştır ve çıktıları yaz
+
+    Returns:
+        int: Çıkış kodu (0 = başarılı)
+    """
+    args = parse_args(argv)
+
+    params = load_settings_profile(args.profile) if args.profile else {}
+
+    pipeline = AnalysisPipeline()
+    try:
+        result = pipeline.run(
+            args.input,
+            historical_data_path=args.historical,
+            chunksize=args.chunksize,
+            capture_profile=bool(args.cprofile),
+            track_memory=args.track_memory,
+            memory_budget_mb=args.memory_budget,
+            **params
+        )
+    except MemoryBudgetExceeded as e:
+        print(f"❌ {e}", file=sys.stderr)
+        print_stage_summary(pipeline.profiler)
+        return 1
+
+    for level, message in pipeline.messages:
+        print(f"{MESSAGE_PREFIX[level]}{message}", file=sys.stderr if level == 'error' else sys.stdout)
+
+    if result is None:
+        print("❌ Veri yüklenemedi!", file=sys.stderr)
+        return 1
+
+    try:
+        with pipeline.profiler.stage('export') as record:
+            written = write_outputs(result, args.output)
+            record['rows'] = sum(written.values())
+    finally:
+        pipeline.profiler.close()
+
+    print(f"\n📁 Çıktılar: {os.path.abspath(args.output)}")
+    for filename, count in written.items():
+        print(f"   {filename:<32} {count:>8} satır")
+
+    print_stage_summary(pipeline.profiler)
+
+    if args.cprofile and pipeline.profiler.dump_pstats(args.cprofile):
+        print(f"\n🔬 cProfile: {os.path.abspath(args.cprofile)}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,11 +4,26 @@ Transfer, Reorder ve Markdown Önerileri
 """
 import streamlit as st
 import pandas as pd
-from utils.helpers import (
-    format_number, format_currency, format_percentage,
-    show_success, show_error, show_info, show_warning
-)
+from utils.helpers import format_number, format_currency, format_percentage
+from utils.ui import show_success, show_error, show_info, show_warning, paginated_table
 from utils.constants import SEGMENT_COLORS, SEGMENT_EMOJI, TRANSFER_LEAD_TIME_DAYS
+from modules.allocation_optimizer import TRANSFER_COLUMNS
+from modules.filter_engine import between, is_true, isin
+
+# Tablo sayı formatları (printf; sadece görünen sayfaya uygulanır)
+TRANSFER_FORMATS = {
+    'transfer_from_ana_depo': '%.0f',
+    'days_until_stockout_akyazi': '%.1f',
+    'stock_consumed_during_transfer': '%.1f',
+    'forecasted_daily_sales': '%.2f'
+}
+
+# potential_loss binlik ayraçlı metin olarak gösterilir (bkz. with_loss_text;
+# printf formatında binlik ayraç yok)
+MARKDOWN_FORMATS = {
+    'current_stock': '%.0f',
+    'days_of_stock': '%.0f'
+}
 
 def show_shipment_strategy_page():
     """Sevkiyat Stratejisi Ana Sayfası"""
@@ -98,6 +113,20 @@ def show_shipment_strategy_page():
         show_depot_optimization_tab(optimizer, allocation_df, df)
 
 
+def with_segment_emoji(page):
+    """Tablo sayfasının başına segment emoji kolonu ekle"""
+    page = page.copy()
+    page.insert(0, 'segment_emoji', page['segment'].map(SEGMENT_EMOJI))
+    return page
+
+
+def with_loss_text(page):
+    """Sayfanın potansiyel kayıp kolonunu binlik ayraçlı tutar metnine çevir"""
+    page = page.copy()
+    page['potential_loss'] = page['potential_loss'].map('₺{:,.2f}'.format)
+    return page
+
+
 def show_transfer_recommendations_tab(optimizer, allocation_df, df):
     """Transfer önerileri tab'ı"""
     
@@ -115,39 +144,31 @@ def show_transfer_recommendations_tab(optimizer, allocation_df, df):
         - HOT veya RISING_STAR segmentinde
         """)
         
-        urgent_transfers = optimizer.get_transfer_recommendations(
+        urgent_view = optimizer.get_transfer_view(
             min_transfer=1, 
             priority='urgent'
         )
         
-        if len(urgent_transfers) == 0:
+        if len(urgent_view) == 0:
             st.success("✅ Acil transfer ihtiyacı yok!")
         else:
-            st.error(f"⚠️ {len(urgent_transfers)} ürün için ACİL transfer gerekiyor!")
-            
-            # Styled dataframe
-            styled_urgent = urgent_transfers.copy()
-            styled_urgent['segment_emoji'] = styled_urgent['segment'].map(SEGMENT_EMOJI)
-            styled_urgent = styled_urgent[[
-                'segment_emoji', 'sku', 'product_name', 'segment',
-                'transfer_from_ana_depo', 'days_until_stockout_akyazi',
-                'stock_consumed_during_transfer', 'forecasted_daily_sales'
-            ]]
+            st.error(f"⚠️ {len(urgent_view)} ürün için ACİL transfer gerekiyor!")
             
-            st.dataframe(
-                styled_urgent.style.format({
-                    'transfer_from_ana_depo': '{:.0f}',
-                    'days_until_stockout_akyazi': '{:.1f}',
-                    'stock_consumed_during_transfer': '{:.1f}',
-                    'forecasted_daily_sales': '{:.2f}'
-                }),
-                use_container_width=True,
-                hide_index=True,
-                height=400
+            # Sayfalı tablo (emoji kolonu sadece görünen sayfaya eklenir)
+            paginated_table(
+                urgent_view,
+                key='urgent_table',
+                columns=[
+                    'sku', 'product_name', 'segment',
+                    'transfer_from_ana_depo', 'days_until_stockout_akyazi',
+                    'stock_consumed_during_transfer', 'forecasted_daily_sales'
+                ],
+                formats=TRANSFER_FORMATS,
+                transform=with_segment_emoji
             )
             
-            # CSV Export
-            csv_urgent = urgent_transfers.to_csv(index=False).encode('utf-8-sig')
+            # CSV Export (tüm liste)
+            csv_urgent = urgent_view.materialize(TRANSFER_COLUMNS).to_csv(index=False).encode('utf-8-sig')
             st.download_button(
                 "📥 Acil Transfer Listesini İndir (CSV)",
                 csv_urgent,
@@ -165,18 +186,19 @@ def show_transfer_recommendations_tab(optimizer, allocation_df, df):
         - Minimum 10 adet transfer miktarı
         """)
         
-        auto_transfers = optimizer.get_transfer_recommendations(
+        # Görünüm: satır pozisyonları; DataFrame sadece tablo ve export için oluşur
+        auto_view = optimizer.get_transfer_view(
             min_transfer=10, 
             priority='auto'
         )
         
-        if len(auto_transfers) == 0:
+        if len(auto_view) == 0:
             st.success("✅ Otomatik transfer ihtiyacı yok!")
         else:
-            st.warning(f"📦 {len(auto_transfers)} ürün için otomatik transfer öneriliyor")
+            st.warning(f"📦 {len(auto_view)} ürün için otomatik transfer öneriliyor")
             
             # Segment filtreleme
-            segments_in_data = auto_transfers['segment'].unique().tolist()
+            segments_in_data = auto_view.column('segment').unique().tolist()
             selected_segments = st.multiselect(
                 "Segment Filtrele:",
                 segments_in_data,
@@ -184,32 +206,26 @@ def show_transfer_recommendations_tab(optimizer, allocation_df, df):
                 key='auto_segment_filter'
             )
             
-            filtered_auto = auto_transfers[auto_transfers['segment'].isin(selected_segments)]
+            filtered_view = auto_view.filter(isin('segment', selected_segments))
             
-            # Styled dataframe
-            st.dataframe(
-                filtered_auto.style.format({
-                    'transfer_from_ana_depo': '{:.0f}',
-                    'days_until_stockout_akyazi': '{:.1f}',
-                    'stock_consumed_during_transfer': '{:.1f}',
-                    'forecasted_daily_sales': '{:.2f}'
-                }),
-                use_container_width=True,
-                hide_index=True,
-                height=400
+            paginated_table(
+                filtered_view,
+                key='auto_table',
+                columns=TRANSFER_COLUMNS,
+                formats=TRANSFER_FORMATS
             )
             
             # Özet
             col1, col2 = st.columns(2)
             with col1:
-                total_to_transfer = filtered_auto['transfer_from_ana_depo'].sum()
+                total_to_transfer = filtered_view.column('transfer_from_ana_depo').sum()
                 st.metric("Toplam Transfer Adedi", format_number(total_to_transfer, 0))
             with col2:
-                avg_transfer = filtered_auto['transfer_from_ana_depo'].mean()
+                avg_transfer = filtered_view.column('transfer_from_ana_depo').mean()
                 st.metric("Ortalama Transfer", format_number(avg_transfer, 0))
             
-            # CSV Export
-            csv_auto = filtered_auto.to_csv(index=False).encode('utf-8-sig')
+            # CSV Export (filtrelenmiş tüm liste)
+            csv_auto = filtered_view.materialize(TRANSFER_COLUMNS).to_csv(index=False).encode('utf-8-sig')
             st.download_button(
                 "📥 Otomatik Transfer Listesini İndir (CSV)",
                 csv_auto,
@@ -220,21 +236,21 @@ def show_transfer_recommendations_tab(optimizer, allocation_df, df):
     
     # TÜM TRANSFERLER
     with subtab3:
-        all_transfers = optimizer.get_transfer_recommendations(
+        all_view = optimizer.get_transfer_view(
             min_transfer=1, 
             priority='all'
         )
         
-        if len(all_transfers) == 0:
+        if len(all_view) == 0:
             st.success("✅ Transfer ihtiyacı yok!")
         else:
-            st.info(f"📋 Toplam {len(all_transfers)} ürün için transfer önerisi var")
+            st.info(f"📋 Toplam {len(all_view)} ürün için transfer önerisi var")
             
             # Filtreleme seçenekleri
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                segments_all = all_transfers['segment'].unique().tolist()
+                segments_all = all_view.column('segment').unique().tolist()
                 selected_seg = st.multiselect(
                     "Segment:",
                     segments_all,
@@ -253,21 +269,24 @@ def show_transfer_recommendations_tab(optimizer, allocation_df, df):
             with col3:
                 urgent_only = st.checkbox("Sadece Acil", key='urgent_only_filter')
             
-            # Filtreleme
-            filtered_all = all_transfers[all_transfers['segment'].isin(selected_seg)]
-            filtered_all = filtered_all[filtered_all['transfer_from_ana_depo'] >= min_qty]
+            # Filtreleme (cache'li maskeler; seçim değişince plan yeniden taranmaz)
+            predicates = [
+                isin('segment', selected_seg),
+                between('transfer_from_ana_depo', low=min_qty)
+            ]
             if urgent_only:
-                filtered_all = filtered_all[filtered_all['is_urgent_transfer'] == True]
+                predicates.append(is_true('is_urgent_transfer'))
+            filtered_all = all_view.filter(*predicates)
             
-            st.dataframe(
+            paginated_table(
                 filtered_all,
-                use_container_width=True,
-                hide_index=True,
-                height=400
+                key='all_table',
+                columns=TRANSFER_COLUMNS,
+                formats=TRANSFER_FORMATS
             )
             
-            # CSV Export
-            csv_all = filtered_all.to_csv(index=False).encode('utf-8-sig')
+            # CSV Export (filtrelenmiş tüm liste)
+            csv_all = filtered_all.materialize(TRANSFER_COLUMNS).to_csv(index=False).encode('utf-8-sig')
             st.download_button(
                 "📥 Tüm Transfer Listesini İndir (CSV)",
                 csv_all,
@@ -307,17 +326,15 @@ def show_reorder_recommendations_tab(optimizer, allocation_df, df):
         
         filtered_reorder = reorder_df[reorder_df['segment'].isin(selected_segments_reorder)]
         
-        # Styled dataframe
-        st.dataframe(
-            filtered_reorder.style.format({
-                'current_stock': '{:.0f}',
-                'reorder_point': '{:.0f}',
-                'days_of_stock': '{:.1f}',
-                'suggested_order_qty': '{:.0f}'
-            }),
-            use_container_width=True,
-            hide_index=True,
-            height=400
+        paginated_table(
+            filtered_reorder,
+            key='reorder_table',
+            formats={
+                'current_stock': '%.0f',
+                'reorder_point': '%.0f',
+                'days_of_stock': '%.1f',
+                'suggested_order_qty': '%.0f'
+            }
         )
         
         # Özet metrikleri
@@ -376,14 +393,11 @@ def show_markdown_candidates_tab(optimizer, allocation_df, df):
             else:
                 st.error(f"⚠️ {len(urgent_markdown)} ürün için ACİL MARKDOWN gerekiyor!")
                 
-                st.dataframe(
-                    urgent_markdown.style.format({
-                        'current_stock': '{:.0f}',
-                        'days_of_stock': '{:.0f}',
-                        'potential_loss': '₺{:,.2f}'
-                    }),
-                    use_container_width=True,
-                    hide_index=True,
+                paginated_table(
+                    urgent_markdown,
+                    key='markdown_urgent_table',
+                    formats=MARKDOWN_FORMATS,
+                    transform=with_loss_text,
                     height=300
                 )
                 
@@ -398,14 +412,11 @@ def show_markdown_candidates_tab(optimizer, allocation_df, df):
             else:
                 st.warning(f"⚠️ {len(consider_markdown)} ürün için markdown düşünülebilir")
                 
-                st.dataframe(
-                    consider_markdown.style.format({
-                        'current_stock': '{:.0f}',
-                        'days_of_stock': '{:.0f}',
-                        'potential_loss': '₺{:,.2f}'
-                    }),
-                    use_container_width=True,
-                    hide_index=True,
+                paginated_table(
+                    consider_markdown,
+                    key='markdown_consider_table',
+                    formats=MARKDOWN_FORMATS,
+                    transform=with_loss_text,
                     height=300
                 )
                 
@@ -593,15 +604,14 @@ def show_depot_optimization_tab(optimizer, allocation_df, df):
             (reallocation_df['action_needed'].isin(action_type))
         ]
         
-        st.dataframe(
-            filtered_realloc.style.format({
-                'current_akyazi_pct': '{:.1f}%',
-                'optimal_akyazi_pct': '{:.1f}%',
-                'suggested_transfer': '{:.0f}'
-            }),
-            use_container_width=True,
-            hide_index=True,
-            height=400
+        paginated_table(
+            filtered_realloc,
+            key='realloc_table',
+            formats={
+                'current_akyazi_pct': '%.1f%%',
+                'optimal_akyazi_pct': '%.1f%%',
+                'suggested_transfer': '%.0f'
+            }
         )
         
         # Özet
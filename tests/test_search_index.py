@@ -0,0 +1,51 @@
+"""
+SearchIndex testleri: index oluşturma belleği ve arama sonuçları
+"""
+import tracemalloc
+import pandas as pd
+from modules.search_index import SearchIndex
+from utils.helpers import normalize_search_text
+
+# Tek uzun ürün adı (ör. ERP export'unda açıklama hücresi)
+LONG_NAME_CHARS = 2000
+
+# İndex oluşturmanın izin verilen en fazla tepe belleği (MB)
+BUILD_PEAK_LIMIT_MB = 150
+
+
+def _catalog(rows, long_row=None):
+    names = [f"Çift Kişilik Nevresim Beyaz {i:06d}" for i in range(rows)]
+    if long_row is not None:
+        names[long_row] = ('Uzun Açıklama ' * LONG_NAME_CHARS)[:LONG_NAME_CHARS]
+    return pd.DataFrame({
+        'sku': [f"SKU{i:08d}" for i in range(rows)],
+        'product_name': names
+    })
+
+
+def test_long_name_keeps_build_memory_bounded():
+    df = _catalog(30_000, long_row=123)
+
+    tracemalloc.start()
+    try:
+        index = SearchIndex(df)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert peak / 2 ** 20 < BUILD_PEAK_LIMIT_MB
+    assert index.search('uzun açıklama').tolist() == [123]
+
+
+def test_search_matches_substring_scan():
+    df = _catalog(2_000, long_row=7)
+    index = SearchIndex(df)
+
+    texts = [
+        (normalize_search_text(sku), normalize_search_text(name))
+        for sku, name in zip(df['sku'], df['product_name'])
+    ]
+    for term in ['nevresim', 'NEVRESİM', '0001', 'sku0000019', 'açık', 'ya', 'yok']:
+        needle = normalize_search_text(term)
+        expected = [i for i, pair in enumerate(texts) if any(needle in text for text in pair)]
+        assert index.search(term).tolist() == expected, term
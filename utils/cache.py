@@ -0,0 +1,72 @@
+"""
+Disk Cache Yardımcıları
+Kaynak dosya parmak izi (fingerprint) ve cache dosya yolları
+"""
+import hashlib
+import json
+import os
+from utils.constants import CACHE_DIR
+
+# Dosya hash'lenirken okunacak blok boyutu
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_fingerprint(source, extra=None):
+    """
+    Kaynağın içeriğinden SHA-256 parmak izi üret
+    
+    Args:
+        source: Dosya yolu, bytes veya okunabilir file-like obje
+        extra: Hash'e eklenecek ek bilgi (versiyon, konfigürasyon vb.)
+        
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    
+    if isinstance(source, (bytes, bytearray)):
+        digest.update(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+    else:
+        # File-like (ör. Streamlit UploadedFile): pozisyonu koru
+        position = source.tell()
+        source.seek(0)
+        for block in iter(lambda: source.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+        source.seek(position)
+    
+    if extra is not None:
+        digest.update(repr(extra).encode('utf-8'))
+    
+    return digest.hexdigest()
+
+
+def params_fingerprint(*parts):
+    """
+    Parametrelerden (dict, liste, sayı vb.) parmak izi üret
+    
+    Dict anahtarları sıralanır; aynı içerikli parametreler her zaman
+    aynı parmak izini verir.
+    
+    Returns:
+        str: Hex digest
+    """
+    payload = json.dumps(parts, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cache_path(namespace, fingerprint, suffix, cache_dir=CACHE_DIR):
+    """
+    Cache dosyasının yolunu döndür (klasör yoksa oluşturur)
+    
+    Args:
+        namespace: Cache türü (ör. 'seasonal')
+        fingerprint: Kaynak parmak izi
+        suffix: Dosya uzantısı (ör. '.npz')
+        cache_dir: Cache klasörü
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, f"{namespace}_{fingerprint[:24]}{suffix}")
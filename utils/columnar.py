@@ -0,0 +1,93 @@
+"""
+Columnar Dosya Okuma Yardımcıları
+Parquet / Arrow IPC (Feather v2) dosyalarını kolon projeksiyonu ile okur
+"""
+import os
+import pandas as pd
+from utils.constants import COLUMNAR_FORMATS
+
+# Parquet/Arrow okuma (opsiyonel - pyarrow gerekli)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+
+def detect_format(source):
+    """
+    Kaynağın dosya formatını uzantısından bul
+
+    Args:
+        source: Dosya yolu veya `name` özelliği olan file-like obje
+
+    Returns:
+        str: 'parquet', 'arrow' veya 'csv'
+    """
+    if isinstance(source, (str, os.PathLike)):
+        name = os.fspath(source)
+    else:
+        name = getattr(source, 'name', '') or ''
+
+    extension = os.path.splitext(str(name))[1].lower()
+    return COLUMNAR_FORMATS.get(extension, 'csv')
+
+
+def read_columnar(source, columns=None, file_format=None):
+    """
+    Parquet veya Arrow IPC dosyasını sadece istenen kolonlarla oku
+
+    Dosyada olmayan kolonlar sessizce atlanır (eksik kolon kontrolü
+    çağıran tarafta yapılır). Metin kolonları Arrow-backed string olarak,
+    dictionary-encoded kolonlar categorical olarak gelir; Python objesine
+    dönüşüm yapılmaz.
+
+    Args:
+        source: Dosya yolu veya file-like obje
+        columns: Okunacak kolonlar (None = tümü)
+        file_format: 'parquet' veya 'arrow' (None = uzantıdan bulunur)
+
+    Returns:
+        pd.DataFrame
+    """
+    if not ARROW_AVAILABLE:
+        raise ImportError("Parquet/Arrow dosyaları için pyarrow gerekli")
+
+    file_format = file_format or detect_format(source)
+    is_path = isinstance(source, (str, os.PathLike))
+
+    if file_format == 'parquet':
+        parquet_file = pq.ParquetFile(source, memory_map=is_path)
+        table = parquet_file.read(
+            columns=_project(parquet_file.schema_arrow.names, columns)
+        )
+    elif file_format == 'arrow':
+        # Dosya yolu memory-map edilir; kolon seçimi kopyasızdır
+        stream = pa.memory_map(os.fspath(source)) if is_path else source
+        table = pa.ipc.open_file(stream).read_all()
+        table = table.select(_project(table.schema.names, columns))
+    else:
+        raise ValueError(f"Desteklenmeyen columnar format: {file_format}")
+
+    return table.to_pandas(
+        types_mapper=_string_types_mapper,
+        split_blocks=True,
+        self_destruct=True
+    )
+
+
+def _project(available, columns):
+    """Dosyada bulunan kolonlardan istenenleri (dosya sırasıyla) seç"""
+    if columns is None:
+        return list(available)
+
+    wanted = set(columns)
+    return [col for col in available if col in wanted]
+
+
+def _string_types_mapper(arrow_type):
+    """Arrow string kolonlarını Arrow-backed pandas string dtype'ına eşle"""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype('pyarrow')
+    return None
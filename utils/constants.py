@@ -29,6 +29,9 @@ ALERT_LEVELS = {
     'INFO': '🔵'
 }
 
+# Segment isimleri (atama önceliği sırasıyla)
+SEGMENT_NAMES = ['HOT', 'RISING_STAR', 'STEADY', 'SLOW', 'DYING', 'UNCLASSIFIED']
+
 # Segment parametreleri (Default)
 DEFAULT_SEGMENT_PARAMS = {
     'HOT': {
@@ -125,6 +128,95 @@ OPTIONAL_COLUMNS = {
     'campaign_flag': 0
 }
 
+# Validasyonda sayısala çevrilen kolonlar (negatifler 0'a çekilir)
+NUMERIC_COLUMNS = [
+    'price', 'stock_akyazi', 'stock_ana_depo', 'stock_oms_total',
+    'daily_sales_avg_30d', 'daily_sales_avg_7d', 'daily_sales_yesterday'
+]
+
+# Katalogda zorunlu/opsiyonel kolonlar dışında kullanılan kolonlar
+CATALOG_EXTRA_COLUMNS = [
+    'maingroupcode', 'SubGroupcode', 'MainGroup', 'SubGroupDesc', 'last_restock_date'
+]
+
+# Columnar (Parquet/Arrow) dosyalardan okunacak katalog kolonları (projection)
+CATALOG_COLUMNS = REQUIRED_COLUMNS + list(OPTIONAL_COLUMNS) + CATALOG_EXTRA_COLUMNS
+
+# Historik satış dosyasından okunacak kolonlar (SeasonalForecaster)
+HISTORICAL_COLUMNS = ['sku', 'MainGroup', 'SubGroupDesc', 'year', 'week', 'sales', 'promo']
+
+# Historik satış dosyası adayları (ilk bulunan kullanılır)
+HISTORICAL_DATA_PATHS = [
+    'data/historical_sales.parquet',
+    'data/historical_sales.feather',
+    'data/historical_sales.csv'
+]
+
+# Katalog yüklenmezse kullanılan örnek veri
+SAMPLE_DATA_PATH = 'data/sample_data.csv'
+
+# Desteklenen columnar dosya uzantıları -> format
+COLUMNAR_FORMATS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'arrow',
+    '.arrow': 'arrow',
+    '.ipc': 'arrow'
+}
+
+# Streaming CSV okumasında metin olarak okunacak kolonlar
+CATALOG_CSV_DTYPES = {
+    'product_name': 'str',
+    'category': 'str',
+    'maingroupcode': 'str',
+    'SubGroupcode': 'str'
+}
+
+# Kompakt veri tipi planı (DataLoader.preprocess_data ve türetilmiş tablolar)
+CATALOG_DTYPE_PLAN = {
+    # Düşük kardinaliteli metinler -> categorical
+    'category': [
+        'category', 'maingroupcode', 'SubGroupcode', 'product_name'
+    ],
+    # Adet/sayaç kolonları -> int32 (NaN veya kesirli değer varsa float32)
+    'int32': [
+        'tip', 'stock_akyazi', 'stock_ana_depo', 'stock_oms_total', 'total_stock',
+        'view_count_7d', 'add_to_cart_7d', 'favorites_7d', 'review_count',
+        'stock_out_days_last_30d', 'campaign_flag'
+    ],
+    # price parasal tutar hesaplarında (potansiyel kayıp vb.) kullanıldığı
+    # için float64 kalır
+    'float32': [
+        'margin_pct', 'avg_rating'
+    ]
+}
+
+# Metrik/skor kolonları (AnalyticsEngine) -> float32
+# velocity/trend/engagement skorları ve days_of_stock segment ve transfer
+# eşikleriyle karşılaştırıldığı için float64 kalır (float32 yuvarlaması
+# tam eşik değerindeki ürünlerin segmentini değiştirebilir)
+METRIC_COLUMNS = [
+    'conversion_rate', 'quality_score', 'stockout_penalty', 'campaign_boost',
+    'seasonal_factor', 'final_score'
+]
+
+# Bu orandan fazla farklı değer içeren metin kolonu categorical yapılmaz
+CATEGORICAL_MAX_UNIQUE_RATIO = 0.5
+
+# Streaming CSV okumasında varsayılan parça boyutu (satır)
+CSV_CHUNK_SIZE = 200_000
+
+# Arama index'ine giren kolonlar (DataLoader.filter_data sku_search)
+SEARCH_COLUMNS = ['sku', 'product_name']
+
+# Rollup cube hiyerarşi boyutları (üstten alta) ve ölçüleri
+ROLLUP_DIMENSIONS = ['category', 'maingroupcode', 'SubGroupcode', 'segment']
+ROLLUP_SUM_COLUMNS = ['total_stock', 'daily_sales_avg_7d', 'stock_value']
+ROLLUP_MEAN_COLUMNS = ['price', 'velocity_score', 'final_score', 'days_of_stock']
+
+# Parametre taramasında ara matris (eşik seti x ürün) başına en fazla eleman
+SWEEP_CHUNK_ELEMENTS = 4_000_000
+
 # Metrik ağırlıkları
 METRIC_WEIGHTS = {
     'velocity_score': 30,
@@ -146,6 +238,22 @@ KPI_TARGETS = {
 # Transfer bilgileri
 TRANSFER_LEAD_TIME_DAYS = 5  # 🚛 Ana Depo → Akyazı transfer süresi (gün)
 
+# Analiz bellek bütçesi (MB, 0 = sınırsız); aşılacaksa analiz erken durdurulur
+MEMORY_BUDGET_MB = 0
+
+# Sayfalı tablolarda seçilebilen sayfa boyutları ve varsayılan (satır)
+TABLE_PAGE_SIZES = [25, 50, 100, 250, 500]
+TABLE_PAGE_SIZE = 50
+
+# Disk cache klasörü (seasonal model, işlenmiş katalog vb.)
+CACHE_DIR = '.cache'
+
+# Seasonal model artifact versiyonu (format değişirse arttırın)
+SEASONAL_MODEL_VERSION = 1
+
+# İşlenmiş katalog cache versiyonu (DataLoader validasyon/preprocess mantığı değişirse arttırın)
+CATALOG_CACHE_VERSION = 2
+
 # Depo bilgileri
 DEPOT_INFO = {
     'akyazi': {
@@ -2,10 +2,12 @@
 Yardımcı Fonksiyonlar
 """
 import pandas as pd
-import streamlit as st
 import numpy as np  # Bu satırı ekleyin
 from datetime import datetime, timedelta
-from utils.constants import SEGMENT_COLORS, SEGMENT_EMOJI, ALERT_LEVELS
+from utils.constants import (
+    SEGMENT_COLORS, SEGMENT_EMOJI, ALERT_LEVELS, CATALOG_DTYPE_PLAN,
+    CATEGORICAL_MAX_UNIQUE_RATIO
+)
 
 def format_number(num, decimal=0):
     """Sayıyı formatla"""
@@ -35,15 +37,6 @@ def get_alert_emoji(level):
     """Alert emoji'sini getir"""
     return ALERT_LEVELS.get(level, '🔵')
 
-def create_metric_card(title, value, delta=None, help_text=None):
-    """Streamlit metric kartı oluştur"""
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        if delta:
-            st.metric(label=title, value=value, delta=delta, help=help_text)
-        else:
-            st.metric(label=title, value=value, help=help_text)
-
 def safe_divide(numerator, denominator, default=0.0):
     """
     Güvenli bölme işlemi - pandas Series/DataFrame ile uyumlu
@@ -63,7 +56,102 @@ def safe_divide(numerator, denominator, default=0.0):
             return numerator / denominator
     except (ZeroDivisionError, TypeError, ValueError):
         return default
+
+def round_values(values, decimals=0):
+    """
+    Python round() ile birebir aynı sonucu veren vektörel yuvarlama
+    
+    np.round değeri 10^decimals ile çarptığı için .5 sınırındaki bazı
+    değerlerde (ör. 0.15) round()'dan farklı sonuç verir. Sadece bu
+    sınır değerler round() ile tek tek düzeltilir.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, decimals)
+    
+    # Tam sayıya yuvarlamada ölçekleme yok: np.round zaten round() ile aynı
+    if decimals == 0:
+        return rounded
+    
+    scaled = values * 10.0 ** decimals
+    distance_to_half = np.abs(scaled - np.floor(scaled) - 0.5)
+    ties = np.flatnonzero(distance_to_half < 1e-9 * np.maximum(1.0, np.abs(scaled)))
+    
+    for i in ties:
+        rounded[i] = round(float(values[i]), decimals)
+    
+    return rounded
+        
+def apply_dtype_plan(df, plan=CATALOG_DTYPE_PLAN):
+    """
+    DataFrame kolonlarını kompakt veri tiplerine çevir (yerinde)
+    
+    - 'category': farklı değer oranı düşükse categorical
+    - 'int32': NaN yoksa ve tüm değerler tam sayıysa int32, değilse float32
+    - 'float32': float32
+    
+    Args:
+        df: DataFrame
+        plan: {hedef tip: [kolonlar]} sözlüğü
+        
+    Returns:
+        pd.DataFrame: Aynı DataFrame
+    """
+    for col in plan.get('category', []):
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            if df[col].nunique() <= len(df) * CATEGORICAL_MAX_UNIQUE_RATIO:
+                df[col] = df[col].astype('category')
+    
+    for col in plan.get('int32', []):
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
+            values = df[col].to_numpy(dtype=np.float64)
+            is_integral = (
+                not np.isnan(values).any() and
+                np.array_equal(values, np.round(values)) and
+                (len(values) == 0 or np.abs(values).max() < 2 ** 31)
+            )
+            df[col] = df[col].astype('int32' if is_integral else 'float32')
+    
+    for col in plan.get('float32', []):
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype('float32')
+    
+    return df
+
+def memory_usage_bytes(df):
+    """DataFrame'in (metin kolonları dahil) bellek kullanımı"""
+    return int(df.memory_usage(deep=True).sum())
         
+# Türkçe büyük harfler (str.lower I -> i, İ -> i̇ yapar) ve arama için aksan katlama
+_TURKISH_UPPER = str.maketrans({'I': 'ı', 'İ': 'i'})
+_SEARCH_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+def normalize_search_text(text):
+    """
+    Arama için metni normalize et
+    
+    Türkçe kurallarla küçük harfe çevrilir (I -> ı, İ -> i), sonra aksanlar
+    katlanır: 'ÇARŞAF', 'Çarşaf' ve 'carsaf' aynı metne dönüşür.
+    """
+    return str(text).translate(_TURKISH_UPPER).lower().translate(_SEARCH_FOLD)
+
+def normalize_search_texts(values):
+    """
+    normalize_search_text'in liste versiyonu
+    
+    Değerler tek metinde birleştirilip bir kez normalize edilir (değer
+    başına çağrıdan çok daha hızlı).
+    """
+    if not len(values):
+        return []
+    
+    texts = normalize_search_text('\x00'.join(map(str, values))).split('\x00')
+    
+    # Değerlerin içinde ayraç varsa tek tek normalize et
+    if len(texts) != len(values):
+        texts = [normalize_search_text(value) for value in values]
+    
+    return texts
+
 def calculate_days_between(date_str, reference_date=None):
     """İki tarih arasındaki gün farkını hesapla"""
     if reference_date is None:
@@ -80,31 +168,6 @@ def export_to_csv(df, filename):
     csv = df.to_csv(index=False).encode('utf-8-sig')
     return csv
 
-def create_download_button(data, filename, label="📥 İndir"):
-    """Download butonu oluştur"""
-    st.download_button(
-        label=label,
-        data=data,
-        file_name=filename,
-        mime='text/csv'
-    )
-
-def show_success(message):
-    """Başarı mesajı göster"""
-    st.success(f"✅ {message}")
-
-def show_error(message):
-    """Hata mesajı göster"""
-    st.error(f"❌ {message}")
-
-def show_warning(message):
-    """Uyarı mesajı göster"""
-    st.warning(f"⚠️ {message}")
-
-def show_info(message):
-    """Bilgi mesajı göster"""
-    st.info(f"ℹ️ {message}")
-
 def get_color_gradient(value, min_val, max_val, reverse=False):
     """Değere göre renk gradient'i döndür"""
     # Normalize değer (0-1 arası)
@@ -129,16 +192,3 @@ def get_color_gradient(value, min_val, max_val, reverse=False):
         b = 0
     
     return f'rgb({r}, {g}, {b})'
-
-def styled_dataframe(df, height=400):
-    """Styled dataframe göster"""
-    st.dataframe(
-        df,
-        use_container_width=True,
-        height=height,
-        hide_index=True
-    )
-
-def create_expander_section(title, expanded=False):
-    """Genişletilebilir section oluştur"""
-    return st.expander(title, expanded=expanded)
@@ -0,0 +1,216 @@
+"""
+Aşama Profilleme
+Pipeline aşamalarının süre / satır / satır-saniye kayıtları, opsiyonel cProfile
+ve opsiyonel bellek takibi (tracemalloc)
+"""
+import cProfile
+import marshal
+import time
+import tracemalloc
+from contextlib import contextmanager
+import pandas as pd
+from utils.helpers import memory_usage_bytes
+
+# frame_inventory'de içine inilmeyecek kadar büyük dict / liste boyutu
+_INVENTORY_MAX_ITEMS = 1000
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """Çalıştırma bellek bütçesini aştı (veya aşacak)"""
+
+
+class StageProfiler:
+    """Bir pipeline çalıştırmasının aşama kayıtları"""
+
+    def __init__(self, capture=False, track_memory=False, memory_budget=None):
+        """
+        Args:
+            capture: True ise aşamalar cProfile ile de profillenir (yavaşlatır)
+            track_memory: True ise aşamaların tepe / kalıcı belleği tracemalloc ile ölçülür
+            memory_budget: Çalıştırmanın ayırabileceği en fazla bellek (byte, None = sınırsız);
+                verilirse bellek takibi açılır
+        """
+        self.records = []
+        self.profile = cProfile.Profile() if capture else None
+        self._pstats = None
+        self.memory_budget = memory_budget or None
+        self.track_memory = track_memory or self.memory_budget is not None
+        # tracemalloc bu profiler tarafından başlatıldıysa close() durdurur
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name, rows=None, input_frame=None):
+        """
+        Aşamayı ölç
+
+        Kullanım:
+            with profiler.stage('metrics', rows=len(df)) as record:
+                ...
+                record['rows'] = len(result)  # satır sayısı sonradan da verilebilir
+
+        Args:
+            name: Aşama adı
+            rows: İşlenen satır sayısı
+            input_frame: Aşamanın kopyalayacağı DataFrame; bütçe varsa aşama
+                başlamadan önce bu kopyanın sığıp sığmayacağı kontrol edilir
+
+        Raises:
+            MemoryBudgetExceeded: Bütçe aşıldığında (aşama öncesi tahmin veya aşama sonu tepe)
+        """
+        record = {'stage': name, 'seconds': 0.0, 'rows': rows}
+        before = self._start_memory(name, input_frame)
+        if self.profile is not None:
+            self.profile.enable()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            if self.profile is not None:
+                self.profile.disable()
+                self._pstats = None
+            if self.track_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record['peak_bytes'] = peak - before
+                record['retained_bytes'] = current - before
+            self.records.append(record)
+
+        if self.memory_budget is not None and peak > self.memory_budget:
+            raise MemoryBudgetExceeded(
+                f"'{name}' aşamasında bellek bütçesi aşıldı: "
+                f"{peak / 1024 ** 2:.1f} MB > {self.memory_budget / 1024 ** 2:.1f} MB"
+            )
+
+    def _start_memory(self, name, input_frame):
+        """Aşama başında tracemalloc'u hazırla ve bütçe tahminini kontrol et"""
+        if not self.track_memory:
+            return 0
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+
+        if self.memory_budget is not None and input_frame is not None:
+            expected = current + memory_usage_bytes(input_frame)
+            if expected > self.memory_budget:
+                raise MemoryBudgetExceeded(
+                    f"'{name}' aşaması bellek bütçesini aşacak: "
+                    f"~{expected / 1024 ** 2:.1f} MB > {self.memory_budget / 1024 ** 2:.1f} MB"
+                )
+
+        return current
+
+    def close(self):
+        """Bu profiler'ın başlattığı bellek takibini durdur"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @property
+    def timings(self):
+        """Aşama -> süre (saniye)"""
+        return {record['stage']: record['seconds'] for record in self.records}
+
+    def summary(self):
+        """
+        Aşama özet tablosu
+
+        Returns:
+            pd.DataFrame: stage, seconds, rows, rows_per_sec, share_pct
+            (bellek takibinde ek olarak peak_mb, retained_mb)
+        """
+        columns = ['stage', 'seconds', 'rows']
+        if self.track_memory:
+            columns += ['peak_bytes', 'retained_bytes']
+        summary = pd.DataFrame(self.records, columns=columns)
+
+        seconds = summary['seconds']
+        rows = pd.to_numeric(summary['rows'])
+        summary['rows_per_sec'] = (rows / seconds).where(seconds > 0)
+        total = seconds.sum()
+        summary['share_pct'] = seconds / total * 100 if total > 0 else 0.0
+
+        if self.track_memory:
+            summary['peak_mb'] = summary.pop('peak_bytes') / 1024 ** 2
+            summary['retained_mb'] = summary.pop('retained_bytes') / 1024 ** 2
+
+        return summary
+
+    def pstats_bytes(self):
+        """
+        cProfile sonucu (.pstats formatı; pstats.Stats ile okunur)
+
+        Returns:
+            bytes veya None (capture kapalıysa)
+        """
+        if self.profile is None:
+            return None
+        if self._pstats is None:
+            self.profile.create_stats()
+            self._pstats = marshal.dumps(self.profile.stats)
+        return self._pstats
+
+    def dump_pstats(self, path):
+        """cProfile sonucunu .pstats dosyasına yaz (capture kapalıysa False)"""
+        data = self.pstats_bytes()
+        if data is None:
+            return False
+        with open(path, 'wb') as f:
+            f.write(data)
+        return True
+
+
+def frame_inventory(namespace, max_depth=4):
+    """
+    Bir namespace'te (ör. st.session_state) tutulan DataFrame'lerin boyutları
+
+    DataFrame'ler doğrudan veya nesne özellikleri / dict / liste içinde
+    (ör. analytics.df, pipeline._stages['load'][1].df) tutulabilir; aynı
+    DataFrame birden fazla yerden tutuluyorsa boyutu bir kez sayılır.
+
+    Args:
+        namespace: Ad -> değer eşlemesi
+        max_depth: Değerlerin içine en fazla kaç seviye inileceği
+
+    Returns:
+        pd.DataFrame: name, rows, columns, mb, shared_with (aynı DataFrame'in ilk adı)
+    """
+    owners = {}
+    visited = set()
+    rows = []
+
+    def walk(name, value, depth):
+        if isinstance(value, pd.DataFrame):
+            owner = owners.setdefault(id(value), name)
+            rows.append({
+                'name': name,
+                'rows': len(value),
+                'columns': value.shape[1],
+                'mb': memory_usage_bytes(value) / 1024 ** 2 if owner == name else 0.0,
+                'shared_with': None if owner == name else owner
+            })
+            return
+        if depth >= max_depth or id(value) in visited:
+            return
+        visited.add(id(value))
+
+        if isinstance(value, (dict, list, tuple)) and len(value) > _INVENTORY_MAX_ITEMS:
+            return
+        if isinstance(value, dict):
+            children = ((f"{name}[{key!r}]", child) for key, child in value.items())
+        elif isinstance(value, (list, tuple)):
+            children = ((f"{name}[{i}]", child) for i, child in enumerate(value))
+        elif hasattr(value, '__dict__') and not isinstance(value, type):
+            children = ((f"{name}.{attr}", child) for attr, child in vars(value).items())
+        else:
+            return
+
+        for child_name, child in children:
+            walk(child_name, child, depth + 1)
+
+    for key in sorted(namespace.keys(), key=str):
+        walk(str(key), namespace[key], 0)
+
+    return pd.DataFrame(rows, columns=['name', 'rows', 'columns', 'mb', 'shared_with'])
@@ -0,0 +1,145 @@
+"""
+Streamlit Arayüz Yardımcıları
+Mesaj, metric kartı ve tablo gösterimleri (kütüphane kodu bunları kullanmaz)
+"""
+import streamlit as st
+from modules.filter_engine import FilterEngine, FilterView
+from utils.constants import TABLE_PAGE_SIZE, TABLE_PAGE_SIZES
+from utils.helpers import format_number
+
+
+def create_metric_card(title, value, delta=None, help_text=None):
+    """Streamlit metric kartı oluştur"""
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        if delta:
+            st.metric(label=title, value=value, delta=delta, help=help_text)
+        else:
+            st.metric(label=title, value=value, help=help_text)
+
+def create_download_button(data, filename, label="📥 İndir"):
+    """Download butonu oluştur"""
+    st.download_button(
+        label=label,
+        data=data,
+        file_name=filename,
+        mime='text/csv'
+    )
+
+def show_success(message):
+    """Başarı mesajı göster"""
+    st.success(f"✅ {message}")
+
+def show_error(message):
+    """Hata mesajı göster"""
+    st.error(f"❌ {message}")
+
+def show_warning(message):
+    """Uyarı mesajı göster"""
+    st.warning(f"⚠️ {message}")
+
+def show_info(message):
+    """Bilgi mesajı göster"""
+    st.info(f"ℹ️ {message}")
+
+def styled_dataframe(df, height=400):
+    """Styled dataframe göster"""
+    st.dataframe(
+        df,
+        use_container_width=True,
+        height=height,
+        hide_index=True
+    )
+
+def paginated_table(data, key, columns=None, formats=None, transform=None, height=400):
+    """
+    Sunucu tarafında sıralanan ve sayfalanan tablo
+
+    Tarayıcıya sadece görünen sayfa gönderilir: sıralama satır pozisyonları
+    üzerinde yapılır, DataFrame yalnızca sayfa satırları için oluşturulur ve
+    sayı formatları Styler yerine kolon ayarlarıyla (st.column_config)
+    uygulanır. Sıralama, sayfa boyutu ve sayfa no session'da `key`
+    önekli anahtarlarla tutulur; sıralama, sayfa boyutu veya satır sayısı
+    (filtre) değişince ilk sayfaya dönülür.
+
+    Args:
+        data: pd.DataFrame veya FilterView
+        key: Widget / session anahtar öneki (sayfada benzersiz)
+        columns: Gösterilecek kolonlar (None = hepsi)
+        formats: Kolon -> printf formatı (ör. '%.1f'; binlik ayraç yok, gerekirse
+            kolon transform içinde metne çevrilir)
+        transform: Sayfa DataFrame'ini gösterimden önce düzenleyen fonksiyon
+        height: Tablo yüksekliği
+    """
+    view = data if isinstance(data, FilterView) else FilterEngine(data).view()
+    columns = [col for col in (columns or view.df.columns) if col in view.df.columns]
+    total = len(view)
+
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+
+    with col1:
+        sort_column = st.selectbox(
+            "Sırala:",
+            [None] + columns,
+            format_func=lambda col: '(varsayılan sıra)' if col is None else col,
+            key=f'{key}_sort_column'
+        )
+
+    with col2:
+        st.write("")  # Spacing
+        descending = st.checkbox("Azalan", key=f'{key}_sort_desc')
+
+    with col3:
+        page_size = st.selectbox(
+            "Sayfa boyutu:",
+            TABLE_PAGE_SIZES,
+            index=TABLE_PAGE_SIZES.index(TABLE_PAGE_SIZE),
+            key=f'{key}_page_size'
+        )
+
+    pages = max(1, -(-total // page_size))
+    page_key = f'{key}_page'
+    state = (sort_column, descending, page_size, total)
+    if st.session_state.get(f'{key}_state') != state or st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = 1
+        st.session_state[f'{key}_state'] = state
+
+    with col4:
+        page = st.number_input("Sayfa:", min_value=1, max_value=pages, step=1, key=page_key)
+
+    if sort_column is not None:
+        view = view.sort_values(sort_column, ascending=not descending)
+
+    start = (page - 1) * page_size
+    page_df = view.slice(start, start + page_size).materialize(columns)
+    if transform is not None:
+        page_df = transform(page_df)
+
+    st.dataframe(
+        page_df,
+        use_container_width=True,
+        hide_index=True,
+        height=height,
+        column_config={
+            col: st.column_config.NumberColumn(format=fmt)
+            for col, fmt in (formats or {}).items() if col in page_df.columns
+        }
+    )
+
+    shown = f"{format_number(start + 1)}–{format_number(start + len(page_df))}" if total else "0"
+    st.caption(f"{shown} / {format_number(total)} satır (sayfa {page}/{pages})")
+
+def create_expander_section(title, expanded=False):
+    """Genişletilebilir section oluştur"""
+    return st.expander(title, expanded=expanded)
+
+def show_messages(messages):
+    """Kütüphane kodunun biriktirdiği (seviye, mesaj) çiftlerini göster"""
+    show = {
+        'success': show_success,
+        'error': show_error,
+        'warning': show_warning,
+        'info': show_info
+    }
+    for level, message in messages:
+        show[level](message)